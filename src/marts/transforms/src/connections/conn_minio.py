@@ -0,0 +1,68 @@
+"""
+Connection wrapper for MinIO object storage.
+
+Features:
+- Secrets fetched securely from Vault
+- Returns the worker's shared MinIO client and Arrow S3 filesystem for the endpoint
+- Returns the endpoint credentials for readers with their own S3 client (DuckDB httpfs)
+- Used by marts that read the staged Parquet datasets instead of the staging database
+"""
+
+import os
+import traceback
+import inspect
+from loguru import logger
+
+from utilities.connection_mgr import ConnectionRegistry
+
+
+class ConnMinio:
+    """
+    MinIO connection utility using secrets from Vault.
+    """
+
+    def __init__(self, config: dict, vault) -> None:
+        self.__secrets = vault.read_secret(
+            mount_point=config["mount_point"],
+            path=config["path"]
+        )
+
+    def conn_to_minio(self) -> dict:
+        """
+        Returns the MinIO client and Arrow filesystem for the configured endpoint.
+
+        Returns:
+            dict: Contains the MinIO client, Arrow filesystem, credentials and connection metadata
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            credentials = {
+                "url": self.__secrets["url"],
+                "access_key": self.__secrets["accessKey"],
+                "secret_key": self.__secrets["secretKey"],
+                "cafile": os.environ.get('SSL_CERT_FILE', '/prefect/ca.crt'),
+            }
+            registry = ConnectionRegistry()
+
+            return {
+                "client": registry.get_minio_client(**credentials),
+                "filesystem": registry.get_arrow_filesystem(**credentials),
+                "credentials": credentials,
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 200,
+                }
+            }
+
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            return {
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 500,
+                    "message": t,
+                }
+            }
@@ -5,15 +5,17 @@ Features:
 - Secrets fetched securely from Vault
 - Dynamically constructs connection URI from secret config
 - Returns engine + metadata for use in ETL pipelines
+- Engines are pooled per database and reused by every task in the worker process
 """
 
 import os
-from sqlalchemy import create_engine
 import hvac
 import traceback
 import inspect
 from loguru import logger
 
+from utilities.connection_mgr import ConnectionRegistry
+
 
 class ConnPostgresql:
     """
@@ -49,7 +51,8 @@ class ConnPostgresql:
             port = self.__secrets["POSTGRES_PORT"]
 
             db_uri = f'postgresql://{user}:{password}@{uri}:{port}/{database}'
-            engine = create_engine(db_uri, echo=True)
+            # read and write tasks share the pooled engine for each database instead of a new one per call
+            engine = ConnectionRegistry().get_engine(db_uri)
 
             return {
                 "engine": engine,
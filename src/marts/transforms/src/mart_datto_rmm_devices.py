@@ -2,18 +2,27 @@
 Datto RMM Device Mart ETL Flow
 
 This intermediate data mart flow:
-1. Extracts normalized device records from staging schema (PostgreSQL)
+1. Extracts normalized device records from staging schema (PostgreSQL), or with
+   engine="duckdb" runs the same SQL in-process over the staged Parquet datasets (MinIO)
 2. Loads curated records into the 'marts' schema for analytics and reporting
+
+With engine="server" both steps run inside Postgres (see utilities/materialize_mgr.py).
 """
 
 from prefect import flow, task
 from prefect.artifacts import *
 
 from connections.conn_postgresql import *
+from connections.conn_minio import *
 
 from utilities.setup_logger import *
 from utilities.task_prep import *
 from utilities.vault_mgr import *
+from utilities.staging_mgr import StagingReader
+from utilities.object_cache_mgr import ObjectCache
+from utilities.duckdb_mgr import DuckDBMart
+from utilities.materialize_mgr import MartMaterializer
+from utilities.partition_read_mgr import PartitionedReader
 
 import sys
 import os
@@ -45,7 +54,19 @@ def read_postgres(conn_configs: dict, vault: VaultManager) -> pl.DataFrame:
         with open(f'{Path(__file__).parent.resolve()}/sql/mart_datto_rmm_devices.sql', 'r') as s:
             query = s.read()
 
-        df = pl.read_database(connection=conn, query=query, infer_schema_length=None)
+        reads = conn_configs['PARTITIONED_READS']
+        if reads['partitions'] > 1:
+            # id ranges read concurrently over separate connections
+            reader = PartitionedReader(engine=conn, partitions=reads['partitions'], driver=reads['driver'])
+            data = reader.read(query=query, partition_on='id', output="polars")
+
+            result = data['result']
+            result['operation'] = 'read'
+            results_list.append(result)
+
+            df = data.get('data')
+        else:
+            df = pl.read_database(connection=conn, query=query, infer_schema_length=None)
         return df
 
     except Exception as e:
@@ -58,6 +79,88 @@ def read_postgres(conn_configs: dict, vault: VaultManager) -> pl.DataFrame:
         results_list.append(result)
 
 
+@task(tags=["extract", "get", "duckdb", "minio"])
+def read_duckdb(conn_configs: dict, vault: VaultManager) -> pl.DataFrame:
+    """
+    Runs the device mart SQL with DuckDB over the staged Parquet datasets.
+    Returns a Polars DataFrame.
+    """
+    try:
+        minio = ConnMinio(config=conn_configs['minio_linapi'], vault=vault).conn_to_minio()
+
+        result = minio['result']
+        result['operation'] = 'connect'
+        results_list.append(result)
+
+        staging = conn_configs['STAGING']
+        cache = ObjectCache(staging['cache_dir'], staging['cache_max_bytes']) if staging.get('cache_dir') else None
+        reader = StagingReader(filesystem=minio['filesystem'], bucket=staging['bucket'], cache=cache,
+                               client=minio['client'])
+
+        duckdb_config = conn_configs['DUCKDB']
+        mart = DuckDBMart(reader=reader, views=duckdb_config['VIEWS'], settings=duckdb_config,
+                          s3=minio['credentials'])
+
+        with open(f'{Path(__file__).parent.resolve()}/sql/mart_datto_rmm_devices.sql', 'r') as s:
+            query = s.read()
+
+        data = mart.run(query=query, output="polars")
+
+        result = data['result']
+        result['operation'] = 'read'
+        results_list.append(result)
+
+        return data.get('data')
+
+    except Exception as e:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+        results_list.append(result)
+
+
+@task(tags=["transform", "put", "database", "postgresql"])
+def materialize_postgres(conn_configs: dict, vault: VaultManager) -> None:
+    """
+    Builds the device mart inside Postgres from the SQL file, no rows pass through the flow.
+    """
+    try:
+        server = conn_configs['SERVER']
+        schema = 'public'
+        table = 'mart_datto_rmm_devices'
+
+        postgres = ConnPostgresql(config=conn_configs['postgres_linapi'], vault=vault)
+        data = postgres.conn_to_postgres(database=server['database'])
+        conn = data['engine']
+
+        result = data['result']
+        result['operation'] = 'connect'
+        results_list.append(result)
+
+        with open(f'{Path(__file__).parent.resolve()}/sql/mart_datto_rmm_devices.sql', 'r') as s:
+            query = s.read()
+
+        mart = MartMaterializer(engine=conn, schema=schema, table=table, query=query, key_columns=['id'],
+                                settings=server)
+        data = mart.materialize()
+
+        result = data['result']
+        result['operation'] = 'materialize'
+        results_list.append(result)
+
+    except Exception as e:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+        results_list.append(result)
+
+
 @task(tags=["load", "put", "database", "postgresql"])
 def write_postgres(df: pl.DataFrame, conn_configs: dict, vault: VaultManager) -> None:
     """
@@ -94,10 +197,14 @@ def write_postgres(df: pl.DataFrame, conn_configs: dict, vault: VaultManager) ->
 
 
 @flow
-def mart_datto_rmm_devices() -> None:
+def mart_datto_rmm_devices(engine: str = "postgres") -> None:
     """
     Main orchestration flow for populating the Datto RMM device mart.
     Extracts from staging and writes to the marts schema.
+
+    Args:
+        engine (str): ["postgres", "duckdb", "server"] where the mart SQL runs, server builds the mart
+            in Postgres without reading it into the flow.
     """
     print(f"The script is being run from: {os.getcwd()}")
     conn_configs = read_config(config_dir=f"{Path(__file__).parent.resolve()}/config/main/config.yaml")['data']
@@ -105,8 +212,14 @@ def mart_datto_rmm_devices() -> None:
 
     print(conn_configs)
 
-    df = read_postgres(conn_configs=conn_configs, vault=vault)
-    write_postgres(df=df, conn_configs=conn_configs, vault=vault)
+    if engine == "server":
+        materialize_postgres(conn_configs=conn_configs, vault=vault)
+    else:
+        if engine == "duckdb":
+            df = read_duckdb(conn_configs=conn_configs, vault=vault)
+        else:
+            df = read_postgres(conn_configs=conn_configs, vault=vault)
+        write_postgres(df=df, conn_configs=conn_configs, vault=vault)
 
     print("#" * 75)
     print("\n        FINAL RESULTS\n")
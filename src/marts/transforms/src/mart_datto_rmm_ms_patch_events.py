@@ -2,10 +2,15 @@ from prefect import flow, task
 from prefect.artifacts import *
 
 from connections.conn_postgresql import *
+from connections.conn_minio import *
 
 from utilities.setup_logger import *
 from utilities.task_prep import *
 from utilities.vault_mgr import *
+from utilities.staging_mgr import StagingReader
+from utilities.object_cache_mgr import ObjectCache
+from utilities.duckdb_mgr import DuckDBMart
+from utilities.materialize_mgr import MartMaterializer
 
 import sys
 import inspect
@@ -19,11 +24,11 @@ results_list = []
 
 # Postgres [EXTRACT]
 @task(tags=["extract", "get", "database", "postgresql"])
-def read_postgres(conn_configs: dict) -> dict:
+def read_postgres(conn_configs: dict, vault: VaultManager) -> dict:
     try:
         database = 'staging'
 
-        postgres = ConnPostgresql(config=conn_configs['postgres_linapi'])
+        postgres = ConnPostgresql(config=conn_configs['postgres_linapi'], vault=vault)
         data = postgres.conn_to_postgres(database=database)
         conn = data['engine']
 
@@ -34,6 +39,8 @@ def read_postgres(conn_configs: dict) -> dict:
         with open(f'{Path(__file__).parent.resolve()}/sql/mart_datto_rmm_ms_patch_events.sql', 'r') as s:
             query = s.read()
 
+        # not a PARTITIONED_READS mart: every column comes out of the ROW_NUMBER() CTE, a range filter on
+        # any of them runs above the window, so each partition would rank the full join again
         df = pl.read_database(connection=conn, query=query, infer_schema_length=None)
 
         return df
@@ -49,15 +56,94 @@ def read_postgres(conn_configs: dict) -> dict:
         results_list.append(result)
 
 
+# DuckDB [EXTRACT]
+@task(tags=["extract", "get", "duckdb", "minio"])
+def read_duckdb(conn_configs: dict, vault: VaultManager) -> dict:
+    try:
+        minio = ConnMinio(config=conn_configs['minio_linapi'], vault=vault).conn_to_minio()
+
+        result = minio['result']
+        result['operation'] = 'connect'
+        results_list.append(result)
+
+        staging = conn_configs['STAGING']
+        cache = ObjectCache(staging['cache_dir'], staging['cache_max_bytes']) if staging.get('cache_dir') else None
+        reader = StagingReader(filesystem=minio['filesystem'], bucket=staging['bucket'], cache=cache,
+                               client=minio['client'])
+
+        duckdb_config = conn_configs['DUCKDB']
+        mart = DuckDBMart(reader=reader, views=duckdb_config['VIEWS'], settings=duckdb_config,
+                          s3=minio['credentials'])
+
+        with open(f'{Path(__file__).parent.resolve()}/sql/mart_datto_rmm_ms_patch_events.sql', 'r') as s:
+            query = s.read()
+
+        data = mart.run(query=query, output="polars")
+
+        result = data['result']
+        result['operation'] = 'read'
+        results_list.append(result)
+
+        return data.get('data')
+
+    except Exception as e:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+
+        results_list.append(result)
+
+
+# Postgres [MATERIALIZE]
+@task(tags=["transform", "put", "database", "postgresql"])
+def materialize_postgres(conn_configs: dict, vault: VaultManager) -> None:
+    try:
+        server = conn_configs['SERVER']
+        schema = 'public'
+        table = 'mart_datto_rmm_ms_patch_events'
+
+        postgres = ConnPostgresql(config=conn_configs['postgres_linapi'], vault=vault)
+        data = postgres.conn_to_postgres(database=server['database'])
+        conn = data['engine']
+
+        result = data['result']
+        result['operation'] = 'connect'
+        results_list.append(result)
+
+        with open(f'{Path(__file__).parent.resolve()}/sql/mart_datto_rmm_ms_patch_events.sql', 'r') as s:
+            query = s.read()
+
+        mart = MartMaterializer(engine=conn, schema=schema, table=table, query=query, key_columns=['id'],
+                                settings=server)
+        data = mart.materialize()
+
+        result = data['result']
+        result['operation'] = 'materialize'
+        results_list.append(result)
+
+    except Exception as e:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+
+        results_list.append(result)
+
+
 # Postgres [LOAD]
 @task(tags=["load", "put", "database", "postgresql"])
-def write_postgres(df, conn_configs: dict) -> None:
+def write_postgres(df, conn_configs: dict, vault: VaultManager) -> None:
     try:
         database = 'marts'
         schema = 'public'
         table = f'{schema}.mart_datto_rmm_ms_patch_events'
 
-        postgres = ConnPostgresql(config=conn_configs['postgres_linapi'])
+        postgres = ConnPostgresql(config=conn_configs['postgres_linapi'], vault=vault)
         data = postgres.conn_to_postgres(database=database)
         conn = data['engine']
 
@@ -86,14 +172,22 @@ def write_postgres(df, conn_configs: dict) -> None:
 
 # RUN FLOW
 @flow
-def mart_datto_rmm_ms_patch_events() -> None:
+def mart_datto_rmm_ms_patch_events(engine: str = "postgres") -> None:
     print(f"The script is being run from: {os.getcwd()}")
     conn_configs = read_config(config_dir=f"{Path(__file__).parent.resolve()}/config/main/config.yaml")["data"]
+    vault = VaultManager()
 
     print(conn_configs)
 
-    df = read_postgres(conn_configs=conn_configs)
-    write_postgres(df=df, conn_configs=conn_configs)
+    # engine: ["postgres", "duckdb", "server"] where the mart SQL runs, server builds the mart in Postgres
+    if engine == "server":
+        materialize_postgres(conn_configs=conn_configs, vault=vault)
+    else:
+        if engine == "duckdb":
+            df = read_duckdb(conn_configs=conn_configs, vault=vault)
+        else:
+            df = read_postgres(conn_configs=conn_configs, vault=vault)
+        write_postgres(df=df, conn_configs=conn_configs, vault=vault)
 
     print("#" * 75)
     print("\n        FINAL RESULTS\n")
@@ -0,0 +1,216 @@
+"""
+DuckDBMart: runs the mart SQL in-process with DuckDB over the staged Parquet datasets.
+
+The Postgres mart path queries the staging database and pulls every result row back through
+the driver. With DuckDB the same `sql/*.sql` files run against the staged Parquet directly, so the
+staging tables the SQL references are mapped to views over the dataset files:
+
+    views:
+      staging.datto_rmm.api_devices:      {product: datto_rmm, subject: devices, source_method: api}
+      staging.datto_rmm.api_activity_logs_patch:
+        {product: datto_rmm, subject: activity_logs_patch, source_method: api, mode: history, key_columns: [id]}
+
+    mart = DuckDBMart(reader=StagingReader(...), views=views, settings={"threads": 4})
+    data = mart.run(query, output="polars")
+
+- files are picked from the dataset manifest by the `StagingReader` (latest snapshot, or every run
+  for `history` views, where the latest row per key wins like the staging merge load)
+- cached readers hand DuckDB the local copies, otherwise it reads `s3://` objects through httpfs
+  with the MinIO credentials
+- only the views a query references are created, DuckDB then reads just the referenced columns
+  and skips row groups on their Parquet statistics
+"""
+
+import inspect
+import traceback
+
+import polars as pl
+
+OUTPUTS = ["arrow", "polars", "pandas"]
+MODES = ["snapshot", "history"]
+
+# DuckDB connection settings accepted from the config
+SETTINGS = ["threads", "memory_limit", "temp_directory"]
+
+# history views read every run extracted since this time
+HISTORY_START = "1970-01-01 00:00:00"
+
+
+def quote_identifier(identifier: str) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def quote_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def view_statements(name: str, paths: list, mode: str = "snapshot", key_columns: list = None) -> list:
+    """
+    SQL creating the view `name` ("catalog.schema.view", "schema.view" or "view") over Parquet files.
+
+    Args:
+        name (str): View name as referenced by the mart SQL.
+        paths (list): Parquet files in load order.
+        mode (str): ["snapshot", "history"] history keeps the row of the latest file per `key_columns`.
+        key_columns (list): Columns identifying a row, required for history views.
+
+    Returns:
+        list: Statements to execute in order.
+    """
+    if mode not in MODES:
+        raise ValueError(f'Unsupported view mode "{mode}", expected one of {MODES}')
+    if mode == "history" and not key_columns:
+        raise ValueError(f"History view {name} needs key_columns")
+
+    parts = name.split(".")
+    if len(parts) > 3:
+        raise ValueError(f"Invalid view name {name}")
+
+    statements = []
+    if len(parts) == 3:
+        statements.append(f"ATTACH IF NOT EXISTS ':memory:' AS {quote_identifier(parts[0])}")
+    if len(parts) >= 2:
+        statements.append(f"CREATE SCHEMA IF NOT EXISTS {'.'.join(quote_identifier(p) for p in parts[:-1])}")
+
+    files = "[" + ", ".join(quote_literal(path) for path in paths) + "]"
+    # cached copies have no hive directories, so partition columns are never derived from paths
+    source = f"read_parquet({files}, union_by_name = true, hive_partitioning = false"
+
+    if mode == "history":
+        keys = ", ".join(quote_identifier(column) for column in key_columns)
+        select = (
+            f"SELECT * EXCLUDE (filename) FROM {source}, filename = true) "
+            f"QUALIFY row_number() OVER (PARTITION BY {keys} ORDER BY list_position({files}, filename) DESC) = 1"
+        )
+    else:
+        select = f"SELECT * FROM {source})"
+
+    statements.append(f"CREATE OR REPLACE VIEW {'.'.join(quote_identifier(p) for p in parts)} AS {select}")
+    return statements
+
+
+class DuckDBMart:
+
+    def __init__(self, reader, views: dict, settings: dict = None, s3: dict = None) -> None:
+        """
+        Args:
+            reader (StagingReader): Resolves the dataset files behind each view.
+            views (dict): View name -> {product, subject, source_method, mode, key_columns}.
+            settings (dict): DuckDB settings (threads, memory_limit, temp_directory).
+            s3 (dict): MinIO {url, access_key, secret_key, cafile}, needed when the reader is not cached.
+        """
+        self.__reader = reader
+        self.__views = views
+        self.__settings = {key: value for key, value in (settings or {}).items() if key in SETTINGS and value}
+        self.__s3 = s3
+        if not reader.cached and not s3:
+            raise ValueError("An uncached DuckDBMart needs the MinIO credentials to read s3:// objects")
+
+    def referenced_views(self, query: str) -> list:
+        """
+        Configured views the query mentions.
+        """
+        lowered = query.lower()
+        return [name for name in self.__views if name.lower() in lowered]
+
+    def connect(self, views: list):
+        """
+        Opens an in-memory DuckDB connection with the given views created.
+        """
+        import duckdb
+
+        conn = duckdb.connect(database=":memory:", config=self.__settings)
+
+        if not self.__reader.cached:
+            conn.execute("INSTALL httpfs")
+            conn.execute("LOAD httpfs")
+            if self.__s3.get("cafile"):
+                conn.execute(f"SET ca_cert_file = {quote_literal(self.__s3['cafile'])}")
+            endpoint = self.__s3["url"].split("://")[-1]
+            conn.execute(
+                "CREATE OR REPLACE SECRET staging_minio ("
+                f"TYPE s3, KEY_ID {quote_literal(self.__s3['access_key'])}, "
+                f"SECRET {quote_literal(self.__s3['secret_key'])}, ENDPOINT {quote_literal(endpoint)}, "
+                "URL_STYLE 'path', USE_SSL true)"
+            )
+
+        try:
+            for name in views:
+                view = self.__views[name]
+                entries = self.__reader.resolve(
+                    view["product"],
+                    view["subject"],
+                    start=HISTORY_START if view.get("mode") == "history" else None,
+                    source_method=view.get("source_method")
+                )
+                if not entries:
+                    raise ValueError(f'No staged files of {view["product"]}/{view["subject"]} for view {name}')
+
+                entries = sorted(entries, key=lambda entry: entry["extracted_at"])
+                if self.__reader.cached:
+                    paths, _ = self.__reader.locate(entries)
+                else:
+                    paths = [f's3://{self.__reader.bucket}/{entry["path"]}' for entry in entries]
+
+                for statement in view_statements(name, paths, view.get("mode", "snapshot"), view.get("key_columns")):
+                    conn.execute(statement)
+        except Exception:
+            conn.close()
+            raise
+
+        return conn
+
+    def run(self, query: str, output: str = "polars") -> dict:
+        """
+        Runs a mart query over the staged datasets.
+
+        Args:
+            query (str): Mart SQL referencing the configured views.
+            output (str): ["arrow", "polars", "pandas"]
+
+        Returns:
+            dict: {"data": table / DataFrame, "result": {...views and rows}}
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        views = self.referenced_views(query)
+        try:
+            if output not in OUTPUTS:
+                raise ValueError(f'Unsupported output "{output}", expected one of {OUTPUTS}')
+
+            conn = self.connect(views)
+            try:
+                table = conn.execute(query).to_arrow_table()
+            finally:
+                conn.close()
+
+            if output == "polars":
+                data = pl.from_arrow(table)
+            elif output == "pandas":
+                data = table.to_pandas(split_blocks=True, self_destruct=True)
+            else:
+                data = table
+
+            return {
+                "data": data,
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 200,
+                    "engine": "duckdb",
+                    "views": views,
+                    "cached": self.__reader.cached,
+                    "rows": len(data),
+                }
+            }
+
+        except Exception:
+            t = traceback.format_exc()
+            return {
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 500,
+                    "engine": "duckdb",
+                    "views": views,
+                    "message": t,
+                }
+            }
@@ -0,0 +1,270 @@
+"""
+MartMaterializer: builds a mart inside Postgres from its SQL file, rows never leave the server.
+
+The read/write mart path pulls the whole result from `staging` into polars and writes it back to
+`marts`, so every row crosses the network twice. Here the mart SQL runs in the database that holds
+the mart, and Python only sends the statements:
+
+- the `staging.<schema>.<table>` names of the SQL are rewritten to local schemas of that database,
+  either `postgres_fdw` foreign schemas of the staging database or, when the marts share the
+  staging database, left as they are (`schemas` empty)
+- `materialize` selects how the result is stored:
+    - table: `CREATE TABLE AS` into an unlogged shadow, indexed, then rename-swapped with the live table
+    - insert: `DELETE` + `INSERT ... SELECT` into the existing table in one transaction (readers keep
+      the old rows until it commits, grants and dependent views are kept)
+    - matview: a materialized view refreshed with `REFRESH MATERIALIZED VIEW CONCURRENTLY`
+      (needs `key_columns`, indexed unique)
+- the mart SQL hash is kept as the relation comment, an edited SQL file (or another materialization)
+  rebuilds the relation through the shadow swap instead of refreshing it; a rebuild is refused while
+  views depend on the live relation (they would be renamed with it), use `insert` for such marts
+
+One-time FDW setup in the marts database (as a superuser):
+
+    CREATE EXTENSION postgres_fdw;
+    CREATE SERVER staging FOREIGN DATA WRAPPER postgres_fdw OPTIONS (dbname 'staging');
+    CREATE USER MAPPING FOR prefect_io SERVER staging OPTIONS (user '...', password '...');
+    CREATE SCHEMA staging_datto_rmm;
+    IMPORT FOREIGN SCHEMA datto_rmm FROM SERVER staging INTO staging_datto_rmm;
+"""
+
+import re
+import inspect
+import hashlib
+import traceback
+
+from loguru import logger
+
+MATERIALIZATIONS = ["table", "insert", "matview"]
+
+# pg_class.relkind -> keyword for DROP / COMMENT
+RELATION_KINDS = {"r": "TABLE", "m": "MATERIALIZED VIEW", "v": "VIEW"}
+
+COMMENT_PREFIX = "mart_sql_sha256="
+
+# views whose rewrite rule references a relation, they follow it through a rename
+DEPENDENT_VIEWS = (
+    "SELECT DISTINCT n.nspname, c.relname FROM pg_depend d "
+    "JOIN pg_rewrite r ON r.oid = d.objid "
+    "JOIN pg_class c ON c.oid = r.ev_class "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "WHERE d.classid = 'pg_rewrite'::regclass AND d.refobjid = to_regclass(%s) AND c.oid <> d.refobjid "
+    "ORDER BY 1, 2"
+)
+
+
+def quote(identifier: str) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def rewrite_query(query: str, schemas: dict = None) -> str:
+    """
+    Prepares mart SQL to be embedded in a statement: qualified staging names are mapped to local
+    schemas ({"staging.datto_rmm": "staging_datto_rmm"}) and the trailing semicolon is dropped.
+    """
+    for source, target in (schemas or {}).items():
+        query = re.sub(rf"\b{re.escape(source)}\.", f"{quote(target)}.", query, flags=re.IGNORECASE)
+    return query.strip().rstrip(";").strip()
+
+
+class MartMaterializer:
+
+    def __init__(self, engine, schema: str, table: str, query: str, key_columns: list = None,
+                 indexes: list = None, settings: dict = None) -> None:
+        """
+        Args:
+            engine: SQLAlchemy engine of the database holding the mart.
+            schema (str): Mart schema.
+            table (str): Mart table / materialized view name.
+            query (str): Mart SQL as stored in sql/*.sql.
+            key_columns (list): Columns identifying a row (unique index, required for concurrent refreshes).
+            indexes (list): Extra indexes, one list of columns each.
+            settings (dict): {materialize, schemas, lock_timeout}
+        """
+        settings = settings or {}
+        self.__engine = engine
+        self.__schema = schema
+        self.__table = table
+        self.__key_columns = key_columns or []
+        self.__materialize = settings.get("materialize", "table")
+        self.__lock_timeout = settings.get("lock_timeout", "30s")
+        self.__query = rewrite_query(query, settings.get("schemas"))
+        # the hash covers the materialization so switching it rebuilds the relation
+        self.__hash = hashlib.sha256(f"{self.__materialize}\n{self.__query}".encode()).hexdigest()
+
+        if self.__materialize not in MATERIALIZATIONS:
+            raise ValueError(f'Unsupported materialization "{self.__materialize}", expected one of {MATERIALIZATIONS}')
+        if self.__materialize == "matview" and not self.__key_columns:
+            raise ValueError("A concurrently refreshed materialized view needs key_columns")
+
+        self.__indexes = {}
+        if self.__key_columns:
+            self.__indexes[f"{table}_key"] = ("UNIQUE ", self.__key_columns)
+        for columns in indexes or []:
+            self.__indexes[f"{table}_{'_'.join(columns)}_idx"] = ("", columns)
+
+    def materialize(self) -> dict:
+        """
+        Refreshes the mart on the server.
+
+        Returns:
+            dict: {"data": {...action and rows}, "result": {...}}
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        target = f"{self.__schema}.{self.__table}"
+        try:
+            connection = self.__engine.raw_connection()
+            try:
+                kind, comment = self.__describe(connection, self.__table)
+                current = kind is not None and comment == f"{COMMENT_PREFIX}{self.__hash}"
+
+                if current and self.__materialize == "matview":
+                    action = self.__refresh(connection)
+                elif current and self.__materialize == "insert":
+                    action = self.__insert(connection)
+                else:
+                    action = self.__rebuild(connection, kind)
+
+                rows = self.__count(connection)
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                connection.close()
+
+            logger.info(f"Materialized {target} ({action}, {rows} rows)")
+            return {
+                "data": {"action": action, "rows": rows},
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 200,
+                    "table": target,
+                    "materialize": self.__materialize,
+                    "action": action,
+                    "rows": rows,
+                }
+            }
+
+        except Exception:
+            t = traceback.format_exc()
+            return {
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 500,
+                    "table": target,
+                    "materialize": self.__materialize,
+                    "message": t,
+                }
+            }
+
+    def __describe(self, connection, name: str) -> tuple:
+        """
+        relkind and comment of a relation in the mart schema, (None, None) when it does not exist.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relkind, obj_description(c.oid, 'pg_class') FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace WHERE n.nspname = %s AND c.relname = %s",
+                (self.__schema, name)
+            )
+            row = cursor.fetchone()
+        connection.commit()
+        return (row[0], row[1]) if row else (None, None)
+
+    def __qualified(self, name: str) -> str:
+        return f"{quote(self.__schema)}.{quote(name)}"
+
+    def __refresh(self, connection) -> str:
+        with connection.cursor() as cursor:
+            # readers keep querying the old contents while the new ones are computed and diffed in
+            cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.__qualified(self.__table)}")
+        connection.commit()
+        return "refresh"
+
+    def __insert(self, connection) -> str:
+        qualified = self.__qualified(self.__table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {qualified}")
+            cursor.execute(f"INSERT INTO {qualified} {self.__query}")
+        connection.commit()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {qualified}")
+        connection.commit()
+        return "insert"
+
+    def __rebuild(self, connection, kind: str) -> str:
+        """
+        Builds the mart as a shadow relation with its indexes, then rename-swaps it with the live one
+        in a short transaction and drops the previous copy (a failed drop is only logged).
+        """
+        shadow_name, old_name = f"{self.__table}__shadow", f"{self.__table}__old"
+        shadow, qualified = self.__qualified(shadow_name), self.__qualified(self.__table)
+        shadow_kind = "m" if self.__materialize == "matview" else "r"
+
+        if kind:
+            with connection.cursor() as cursor:
+                cursor.execute(DEPENDENT_VIEWS, (qualified,))
+                views = [f"{row[0]}.{row[1]}" for row in cursor.fetchall()]
+            connection.commit()
+            if views:
+                raise ValueError(f"Cannot rebuild {self.__schema}.{self.__table}, views depend on it: "
+                                 f"{', '.join(views)}. Use materialize insert or drop the views.")
+
+        stale, _ = self.__describe(connection, shadow_name)
+        with connection.cursor() as cursor:
+            if stale:
+                cursor.execute(f"DROP {RELATION_KINDS[stale]} {shadow}")
+
+            if shadow_kind == "m":
+                cursor.execute(f"CREATE MATERIALIZED VIEW {shadow} AS {self.__query} WITH DATA")
+            else:
+                cursor.execute(f"CREATE UNLOGGED TABLE {shadow} AS {self.__query}")
+
+            for name, (unique, columns) in self.__indexes.items():
+                cursor.execute(f"CREATE {unique}INDEX {quote(f'{name}__shadow')} ON {shadow} "
+                               f"({', '.join(quote(c) for c in columns)})")
+
+            cursor.execute(f"ANALYZE {shadow}")
+            if shadow_kind == "r":
+                # written to WAL once, in bulk, while no reader uses the table
+                cursor.execute(f"ALTER TABLE {shadow} SET LOGGED")
+            cursor.execute(f"COMMENT ON {RELATION_KINDS[shadow_kind]} {shadow} IS '{COMMENT_PREFIX}{self.__hash}'")
+        connection.commit()
+
+        old_kind, _ = self.__describe(connection, old_name)
+        with connection.cursor() as cursor:
+            # renames need a brief exclusive lock on the live relation, give up rather than queue behind long reads
+            cursor.execute(f"SET LOCAL lock_timeout = '{self.__lock_timeout}'")
+            if old_kind:
+                cursor.execute(f"DROP {RELATION_KINDS[old_kind]} {self.__qualified(old_name)}")
+            if kind:
+                cursor.execute(f"ALTER {RELATION_KINDS[kind]} {qualified} RENAME TO {quote(old_name)}")
+                for name in self.__indexes:
+                    cursor.execute(f"ALTER INDEX IF EXISTS {quote(self.__schema)}.{quote(name)} "
+                                   f"RENAME TO {quote(f'{name}__old')}")
+            cursor.execute(f"ALTER {RELATION_KINDS[shadow_kind]} {shadow} RENAME TO {quote(self.__table)}")
+            for name in self.__indexes:
+                cursor.execute(f"ALTER INDEX {quote(self.__schema)}.{quote(f'{name}__shadow')} "
+                               f"RENAME TO {quote(name)}")
+        connection.commit()
+
+        if kind:
+            # the swap is committed, a leftover copy is dropped by the next rebuild
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP {RELATION_KINDS[kind]} {self.__qualified(old_name)}")
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                logger.warning(f"Rebuilt {self.__schema}.{self.__table} but could not drop {old_name}:\n"
+                               f"{traceback.format_exc()}")
+
+        return "rebuild"
+
+    def __count(self, connection) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {self.__qualified(self.__table)}")
+            rows = cursor.fetchone()[0]
+        connection.commit()
+        return rows
@@ -0,0 +1,163 @@
+"""
+ObjectCache: content-addressed local disk cache for object storage reads.
+
+Staged run files are immutable, so a copy fetched once can serve every later read on the worker.
+Entries are keyed by bucket, object name and ETag (a rewritten object gets a new key) and stored
+as `<cache_dir>/<hash[:2]>/<hash>`:
+
+- fills are safe across processes: a per-entry `fcntl` lock makes one process download while the
+  others wait, and the file appears under its final name only after an atomic rename
+- hits refresh the file's mtime, eviction removes least recently used files once the cache grows
+  past `max_bytes` (down to LOW_WATERMARK of it); a read filling several entries defers eviction
+  (`evict=False`) and then evicts with its own paths kept, so none is unlinked before it is opened
+- cached files are read through memory maps (`pa.memory_map` / `LocalFileSystem(use_mmap=True)`)
+"""
+
+import os
+import time
+import fcntl
+import hashlib
+import tempfile
+from pathlib import Path
+
+import pyarrow as pa
+from loguru import logger
+
+# eviction trims the cache to this share of max_bytes so it does not run on every fill
+LOW_WATERMARK = 0.9
+
+
+class ObjectCache:
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.__cache_dir = Path(cache_dir)
+        self.__max_bytes = max_bytes
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, bucket: str, name: str, etag: str) -> Path:
+        digest = hashlib.sha256(f"{bucket}/{name}@{etag}".encode()).hexdigest()
+        return self.__cache_dir / digest[:2] / digest
+
+    def get(self, bucket: str, name: str, etag: str, fetch, evict: bool = True) -> str:
+        """
+        Returns the local path of a cached object, filling the cache on a miss.
+
+        Args:
+            bucket (str): Bucket of the object.
+            name (str): Object name.
+            etag (str): Current ETag of the object.
+            fetch (callable): Writes the object's bytes into the binary file object it is given.
+            evict (bool): Evict after a fill, callers reading several entries evict once they hold them all.
+
+        Returns:
+            str: Path of the cached copy.
+        """
+        path = self.path_for(bucket, name, etag)
+        if self.__touch(path):
+            return str(path)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{path}.lock", "w") as lock:
+            # one process fills the entry, the others block here and then find it in place
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if not self.__touch(path):
+                    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                    try:
+                        with os.fdopen(fd, "wb") as target:
+                            fetch(target)
+                            target.flush()
+                            os.fsync(target.fileno())
+                        os.replace(temp_path, path)
+                    except BaseException:
+                        if os.path.exists(temp_path):
+                            os.remove(temp_path)
+                        raise
+                    filled = True
+                else:
+                    filled = False
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        if filled and evict:
+            self.evict(keep=[path])
+        return str(path)
+
+    def open(self, bucket: str, name: str, etag: str, fetch) -> pa.MemoryMappedFile:
+        """
+        Memory-maps the cached copy of an object (filled on a miss).
+        """
+        return pa.memory_map(self.get(bucket, name, etag, fetch), "r")
+
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self.__entries())
+
+    def evict(self, keep: list = None) -> int:
+        """
+        Removes least recently used entries while the cache is above `max_bytes`.
+        Runs in one process at a time, a process finding the eviction lock taken skips it.
+
+        Args:
+            keep (list): Paths of entries in use by the caller, never removed.
+
+        Returns:
+            int: Bytes freed.
+        """
+        with open(self.__cache_dir / ".evict.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+
+            try:
+                entries = []
+                for path in self.__entries():
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+                total = sum(size for _, size, _ in entries)
+                if total <= self.__max_bytes:
+                    return 0
+
+                freed = 0
+                target = total - self.__max_bytes * LOW_WATERMARK
+                # files still mapped by a reader stay readable after unlink (POSIX)
+                kept = {str(path) for path in keep or []}
+                for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                    if freed >= target:
+                        break
+                    if str(path) in kept:
+                        continue
+                    try:
+                        path.unlink()
+                        freed += size
+                    except FileNotFoundError:
+                        continue
+                    # a fill racing this unlink just locks a fresh file, fills are idempotent
+                    Path(f"{path}.lock").unlink(missing_ok=True)
+
+                logger.info(f"Evicted {freed} bytes from {self.__cache_dir}")
+                return freed
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __entries(self) -> list:
+        return [
+            path for path in self.__cache_dir.glob("*/*")
+            if path.is_file() and path.suffix not in (".lock", ".tmp")
+        ]
+
+    @staticmethod
+    def __touch(path: Path) -> bool:
+        """
+        Marks a cached entry as recently used, False when it is not cached.
+        """
+        try:
+            now = time.time()
+            os.utime(path, (now, now))
+            return True
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,234 @@
+"""
+StagingReader: reads the staged Parquet datasets back out of object storage.
+
+Staging loads write each product/subject as a hive-layout dataset with a `_manifest.json`
+(see `dataset_mgr`). The reader resolves which files to read from the manifest alone, then reads
+them through an Arrow filesystem (the MinIO S3 endpoint, or a local directory in tests):
+
+    reader = StagingReader(filesystem=minio["filesystem"], bucket="staging")
+    data = reader.read("datto_rmm", "devices", columns=["uid", "hostname", "site_uid"],
+                       filters=[("site_uid", "in", sites)], output="polars")
+
+- latest snapshot (default): the newest run's file(s), or the newest at or before `as_of`
+- range: every file extracted between `start` and `end` (append-style subjects such as activity logs)
+- files whose manifest min/max cannot match `filters` are skipped without being opened
+- only the requested columns are read, and row groups are pruned on their Parquet statistics
+- with an `ObjectCache`, files are read from memory-mapped local copies keyed on the ETag the
+  manifest records for each file, fetched in full on first use (entries written before the manifest
+  carried ETags are looked up with the optional MinIO client)
+"""
+
+import json
+import shutil
+import inspect
+import traceback
+import concurrent.futures
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from .dataset_mgr import manifest_path, json_value
+
+OUTPUTS = ["arrow", "polars", "pandas"]
+
+# concurrent object downloads when filling the local cache
+FETCH_WORKERS = 8
+
+
+class StagingReader:
+
+    def __init__(self, filesystem, bucket: str = "staging", cache=None, client=None) -> None:
+        self.__filesystem = filesystem
+        self.__bucket = bucket
+        self.__cache = cache
+        self.__client = client
+
+    @property
+    def bucket(self) -> str:
+        return self.__bucket
+
+    @property
+    def cached(self) -> bool:
+        return self.__cache is not None
+
+    def manifest(self, product: str, subject: str) -> dict:
+        """
+        Loads the dataset manifest of a product/subject.
+        """
+        with self.__filesystem.open_input_stream(f"{self.__bucket}/{manifest_path(product, subject)}") as stream:
+            return json.loads(stream.read())
+
+    def resolve(self, product: str, subject: str, as_of: str = None, start: str = None, end: str = None,
+                source_method: str = None, filters=None) -> list:
+        """
+        Selects the manifest entries to read.
+
+        Args:
+            product (str): Dataset product.
+            subject (str): Dataset subject.
+            as_of (str): Latest snapshot at or before this UTC time ("YYYY-MM-DD HH:MM:SS"), default now.
+            start (str): Range read lower bound on extraction time (inclusive), replaces snapshot selection.
+            end (str): Range read upper bound on extraction time (inclusive).
+            source_method (str): Only files of this source method.
+            filters: DNF filters, files whose manifest stats exclude them are dropped.
+
+        Returns:
+            list: Manifest entries.
+        """
+        files = self.manifest(product, subject)["files"]
+        if source_method:
+            files = [entry for entry in files if entry["partition"].get("source_method") == source_method]
+
+        if start or end:
+            files = [
+                entry for entry in files
+                if (not start or entry["extracted_at"] >= start) and (not end or entry["extracted_at"] <= end)
+            ]
+        else:
+            if as_of:
+                files = [entry for entry in files if entry["extracted_at"] <= as_of]
+            latest = max((entry["extracted_at"] for entry in files), default=None)
+            files = [entry for entry in files if entry["extracted_at"] == latest]
+
+        return [entry for entry in files if self.may_match(entry, filters)]
+
+    @staticmethod
+    def may_match(entry: dict, filters) -> bool:
+        """
+        False only when the entry's min/max stats prove no row can satisfy the DNF filters
+        ([(col, op, value), ...] or a list of such conjunctions).
+        """
+        if not filters:
+            return True
+
+        conjunctions = filters if isinstance(filters[0], list) else [filters]
+        stats = entry.get("stats") or {}
+
+        def term_may_match(column, op, value) -> bool:
+            if column not in stats or stats[column]["min"] is None:
+                return True
+            low, high = stats[column]["min"], stats[column]["max"]
+            try:
+                if op == "in":
+                    return any(low <= json_value(v) <= high for v in value)
+                value = json_value(value)
+                return {
+                    "=": low <= value <= high,
+                    "==": low <= value <= high,
+                    "<": low < value,
+                    "<=": low <= value,
+                    ">": high > value,
+                    ">=": high >= value,
+                }.get(op, True)
+            except TypeError:
+                return True
+
+        return any(all(term_may_match(*term) for term in conjunction) for conjunction in conjunctions)
+
+    def read(self, product: str, subject: str, columns: list = None, filters=None, output: str = "arrow",
+             as_of: str = None, start: str = None, end: str = None, source_method: str = None) -> dict:
+        """
+        Reads a snapshot or range of a staged dataset.
+
+        Args:
+            product (str): Dataset product.
+            subject (str): Dataset subject.
+            columns (list): Columns to read, default all.
+            filters: DNF filters [(col, op, value), ...] or a pyarrow.compute Expression.
+            output (str): ["arrow", "polars", "pandas"]
+            as_of, start, end, source_method: File selection, see `resolve`.
+
+        Returns:
+            dict: {"data": table / DataFrame, "result": {...files and rows read}}
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            if output not in OUTPUTS:
+                raise ValueError(f'Unsupported output "{output}", expected one of {OUTPUTS}')
+
+            dnf = filters if isinstance(filters, list) else None
+            entries = self.resolve(product, subject, as_of=as_of, start=start, end=end,
+                                   source_method=source_method, filters=dnf)
+            if not entries:
+                raise ValueError(f"No staged files of {product}/{subject} match the selection")
+
+            paths, filesystem = self.locate(entries)
+            dataset = ds.dataset(paths, filesystem=filesystem, format="parquet")
+            if len({entry["schema_hash"] for entry in entries}) > 1:
+                # files from before and after a schema change: read them all against the merged schema
+                schema = pa.unify_schemas([fragment.physical_schema for fragment in dataset.get_fragments()],
+                                          promote_options="permissive")
+                dataset = ds.dataset(paths, filesystem=filesystem, format="parquet", schema=schema)
+            expression = pq.filters_to_expression(filters) if dnf else filters
+            table = dataset.to_table(columns=columns, filter=expression)
+
+            if output == "polars":
+                data = pl.from_arrow(table)
+            elif output == "pandas":
+                data = table.to_pandas(split_blocks=True, self_destruct=True)
+            else:
+                data = table
+
+            return {
+                "data": data,
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 200,
+                    "product": product,
+                    "subject": subject,
+                    "files": len(entries),
+                    "cached": self.__cache is not None,
+                    "rows": len(data),
+                    "extracted_at": max(entry["extracted_at"] for entry in entries),
+                }
+            }
+
+        except Exception:
+            t = traceback.format_exc()
+            return {
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 500,
+                    "product": product,
+                    "subject": subject,
+                    "message": t,
+                }
+            }
+
+    def locate(self, entries: list) -> tuple:
+        """
+        Paths of the entries and the Arrow filesystem to open them with: memory-mapped local copies
+        when cached (fetched as needed), otherwise `<bucket>/<path>` on the reader's filesystem.
+        """
+        if self.__cache is not None:
+            return self.__cached_paths(entries), fs.LocalFileSystem(use_mmap=True)
+        return [f'{self.__bucket}/{entry["path"]}' for entry in entries], self.__filesystem
+
+    def __cached_paths(self, entries: list) -> list:
+        """
+        Local cache paths of the entries, downloading the missing ones concurrently. Eviction runs once
+        all of them are in place and keeps them, a fill never unlinks a file this read is about to open.
+        """
+        def cached(entry: dict) -> str:
+            name = entry["path"]
+            etag = entry.get("etag")
+            if etag is None:
+                if self.__client is None:
+                    raise ValueError(f"Manifest entry {name} has no ETag and the reader has no MinIO client")
+                etag = self.__client.stat_object(self.__bucket, name).etag
+
+            def fetch(target) -> None:
+                with self.__filesystem.open_input_stream(f"{self.__bucket}/{name}") as source:
+                    shutil.copyfileobj(source, target, 8 * 1024 * 1024)
+
+            return self.__cache.get(self.__bucket, name, etag, fetch, evict=False)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            paths = list(executor.map(cached, entries))
+
+        self.__cache.evict(keep=paths)
+        return paths
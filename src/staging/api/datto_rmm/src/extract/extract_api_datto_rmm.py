@@ -1,5 +1,6 @@
 import datetime
 import pandas as pd
+import pyarrow as pa
 import datetime as dt
 import re
 import requests
@@ -121,6 +122,27 @@ class ExtractApiDattoRMM:
                 }
             }
 
+    def __build_frame(self, rows: list):
+        """
+        Builds the extract output from modeled row dicts.
+
+        DATA.destination "arrow" returns a `pyarrow.Table` built column by column (NaN / NaT become
+        null, columns mixing JSON strings and decoded dicts are normalized to JSON strings);
+        anything else returns a pandas DataFrame.
+        """
+        if self.__data.get("destination") != "arrow":
+            return pd.DataFrame(rows)
+
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        arrays = []
+        for column in columns:
+            values = [row.get(column) for row in rows]
+            if any(isinstance(v, dict) for v in values) and any(isinstance(v, str) for v in values):
+                values = [json.dumps(v) if isinstance(v, dict) else v for v in values]
+            arrays.append(pa.array(values, from_pandas=True))
+
+        return pa.Table.from_arrays(arrays, names=columns)
+
     def create_account_dataframe(self) -> dict:
         """
         Extracts account-level metadata and flattens the JSON response
@@ -562,17 +584,18 @@ class ExtractApiDattoRMM:
             data = self.__api_pagination(request_url, params=params)
             c_dict = data["data"]
 
-            df = pd.DataFrame([model(entry) for entry in c_dict.get("activities", [])])
+            rows = [model(entry) for entry in c_dict.get("activities", [])]
             next_page = c_dict.get('pageDetails', {}).get('nextPageUrl')
 
             while next_page:
                 logger.info(f"Fetching next page: {next_page}")
                 data = self.__api_pagination(next_page)
                 c_dict = data["data"]
-                df_page = pd.DataFrame([model(entry) for entry in c_dict.get("activities", [])])
-                df = pd.concat([df, df_page], ignore_index=True)
+                rows.extend(model(entry) for entry in c_dict.get("activities", []))
                 next_page = c_dict.get('pageDetails', {}).get('nextPageUrl')
 
+            # pages are accumulated as rows and framed once instead of concatenated per page
+            df = self.__build_frame(rows)
             logger.info(f"Final activity logs dataframe shape: {df.shape}")
             return {
                 "data": df,
@@ -691,16 +714,17 @@ class ExtractApiDattoRMM:
             c_dict = data["data"]
             next_page = c_dict.get('pageDetails', {}).get("nextPageUrl")
 
-            df = pd.DataFrame([model(row) for row in c_dict.get("devices", [])])
+            rows = [model(row) for row in c_dict.get("devices", [])]
 
             while next_page:
                 logger.info(f"Fetching device page: {next_page}")
                 data = self.__api_pagination(next_page)
                 c_dict = data["data"]
-                df_next = pd.DataFrame([model(row) for row in c_dict.get("devices", [])])
-                df = pd.concat([df, df_next], ignore_index=True)
+                rows.extend(model(row) for row in c_dict.get("devices", []))
                 next_page = c_dict.get('pageDetails', {}).get("nextPageUrl")
 
+            # pages are accumulated as rows and framed once instead of concatenated per page
+            df = self.__build_frame(rows)
             logger.info(f"Created devices dataframe with shape {df.shape}")
             return {
                 "data": df,
@@ -0,0 +1,218 @@
+########################################################
+#
+#     Title: Minio [COMPACT]
+#     Date: 2026/10/19
+#
+########################################################
+
+import os
+import traceback
+import inspect
+import datetime as dt
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from utilities.connection_mgr import ConnectionRegistry
+from utilities.parquet_mgr import parquet_settings, write_parquet
+from utilities.dataset_mgr import read_manifest, update_manifest, plan_compaction, keep_latest, file_entry, \
+    expired_tombstones
+
+# compaction.mode: append merges every run of a partition, snapshot keeps the partition's last run
+MODES = ["append", "snapshot"]
+
+
+class MinioCompaction:
+    """
+    MinioCompaction merges the small per-run Parquet files of a hive-layout staging dataset.
+
+    For every settled partition with enough small files it:
+    1. append subjects (each run adds rows): reads the files in load order, keeps the latest row per
+       natural key (if configured) and writes right-sized files sorted on the clustering key
+       snapshot subjects (each run is the full dataset): keeps only the partition's last run, merging
+       runs would turn one day into a single snapshot holding every run's rows
+    2. Swaps the new files for the old ones in the manifest with a single update, the old ones tombstoned
+    3. Deletes the objects of tombstones older than `delete_after_hours`, so readers that
+       resolved the previous manifest can still finish
+
+    Attributes:
+        config (dict): Task configuration from YAML
+        vault (VaultManager): Initialized Vault client to retrieve secrets
+    """
+
+    def __init__(self, config, vault):
+        self.__details = config["DETAILS"]
+        self.__data = config["DATA"]
+        self.__timestamps = config["TIMESTAMPS"]
+        self.__secrets = config["SECRETS"]
+        self.__secrets.update(
+            vault.read_secret(
+                mount_point=config["SECRETS"]["mount_point"],
+                path=config["SECRETS"]["path"]
+            )
+        )
+        self.__bucket = self.__data["destination"]["bucket"]
+        self.__compaction = self.__data["compaction"]
+        if self.__compaction.get("mode", "append") not in MODES:
+            raise ValueError(f'Unsupported compaction mode "{self.__compaction["mode"]}", expected one of {MODES}')
+        self.__parquet = parquet_settings(self.__data["destination"].get("parquet"))
+
+    def __create_minio_client__(self):
+        """
+        Returns the worker's shared MinIO client for the configured endpoint.
+        """
+        return ConnectionRegistry().get_minio_client(
+            url=self.__secrets["url"],
+            access_key=self.__secrets["accessKey"],
+            secret_key=self.__secrets["secretKey"],
+            cafile=os.environ.get('SSL_CERT_FILE', '/prefect/ca.crt')
+        )
+
+    def __read_group__(self, minio_client, group: list) -> pa.Table:
+        """
+        Reads a group of files into one table, rows in load order.
+        """
+        tables = []
+        for entry in group:
+            response = minio_client.get_object(self.__bucket, entry["path"])
+            try:
+                tables.append(pq.read_table(pa.BufferReader(response.read())))
+            finally:
+                response.close()
+                response.release_conn()
+
+        return pa.concat_tables(tables)
+
+    def __write_group__(self, minio_client, table: pa.Table, group: list) -> list:
+        """
+        Writes the merged rows as files of about `target_file_bytes` and returns their manifest entries.
+        """
+        input_rows = sum(entry["rows"] for entry in group)
+        input_bytes = sum(entry["bytes"] for entry in group)
+        # rows per output file estimated from the compressed size per row of the inputs
+        rows_per_file = max(1, int(self.__compaction["target_file_bytes"] * input_rows / max(input_bytes, 1)))
+
+        directory = group[0]["path"].rsplit("/", 1)[0]
+        extracted_at = group[-1]["extracted_at"]
+
+        # the whole group is sorted once so files are contiguous ranges of the clustering key
+        table = table.sort_by([(column, "ascending") for column in self.__parquet["sort_by"]]) \
+            if self.__parquet["sort_by"] else table
+
+        entries = []
+        for number, start in enumerate(range(0, max(table.num_rows, 1), rows_per_file)):
+            part = table.slice(start, rows_per_file)
+            path = f'{directory}/compacted_{self.__timestamps["_OUT_DATA_TIMESTAMP"]}_{number:04d}.parquet'
+
+            sink = pa.BufferOutputStream()
+            write_parquet(part, sink, self.__parquet)
+            buffer = sink.getvalue()
+
+            written = minio_client.put_object(
+                bucket_name=self.__bucket,
+                object_name=path,
+                data=pa.BufferReader(buffer),
+                length=buffer.size,
+                content_type="application/parquet"
+            )
+
+            entry = file_entry(
+                path=path,
+                data=part,
+                partition=group[0]["partition"],
+                size=buffer.size,
+                extracted_at=extracted_at,
+                stats_columns=self.__compaction.get("stats_columns") or self.__parquet["sort_by"],
+                etag=written.etag
+            )
+            entry["compacted_from"] = len(group)
+            entries.append(entry)
+
+        return entries
+
+    def compact_dataset(self) -> dict:
+        """
+        Compacts every eligible partition of the configured product/subject.
+
+        Returns:
+            dict: Per-run counts and result metadata
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        product = self.__details["product"]
+        subject = self.__details["subject"]
+        counts = {"partitions": 0, "files_in": 0, "files_out": 0, "rows_in": 0, "rows_out": 0, "deleted": 0}
+
+        try:
+            minio_client = self.__create_minio_client__()
+            manifest, _ = read_manifest(minio_client, self.__bucket, product, subject)
+
+            # objects replaced by earlier runs, past the window in which a reader could still open them
+            expired = expired_tombstones(manifest, self.__compaction.get("delete_after_hours", 24))
+            for path in expired:
+                try:
+                    minio_client.remove_object(self.__bucket, path)
+                except Exception as e:
+                    if getattr(e, "code", None) != "NoSuchKey":
+                        raise
+            if expired:
+                manifest = update_manifest(minio_client, self.__bucket, product, subject, purge=expired)
+                counts["deleted"] = len(expired)
+
+            groups = plan_compaction(
+                manifest=manifest,
+                small_file_bytes=self.__compaction["small_file_bytes"],
+                min_files=self.__compaction["min_files"],
+                min_age_days=self.__compaction["min_age_days"],
+                today=dt.date.fromisoformat(self.__timestamps["_IN_DATA_TIMESTAMP"][:10])
+            )
+
+            for group in groups:
+                if self.__compaction.get("mode", "append") == "snapshot":
+                    # the last run already is the partition's final snapshot, the earlier runs are retired
+                    entries = []
+                    replaced = [entry["path"] for entry in group[:-1]]
+                    rows_out = group[-1]["rows"]
+                else:
+                    table = keep_latest(self.__read_group__(minio_client, group),
+                                        self.__compaction.get("key_columns") or [])
+                    entries = self.__write_group__(minio_client, table, group)
+                    replaced = [entry["path"] for entry in group]
+                    rows_out = table.num_rows
+
+                # readers switch from the old files to the new ones in one manifest version
+                update_manifest(minio_client, self.__bucket, product, subject, add=entries, remove=replaced)
+
+                files_out = len(group) - len(replaced) + len(entries)
+                counts["partitions"] += 1
+                counts["files_in"] += len(group)
+                counts["files_out"] += files_out
+                counts["rows_in"] += sum(entry["rows"] for entry in group)
+                counts["rows_out"] += rows_out
+                logger.info(f'Compacted {len(group)} files into {files_out} under {group[0]["path"].rsplit("/", 1)[0]}')
+
+            return {
+                "data": counts,
+                "result": {
+                    "job_title": self.__details["task_title"],
+                    "status_code": 200,
+                    "product": product,
+                    "subject": subject,
+                    **counts,
+                    "message": "Dataset compacted" if counts["partitions"] or counts["deleted"] else "Nothing to compact",
+                }
+            }
+
+        except Exception:
+            t = traceback.format_exc()
+            return {
+                "data": counts,
+                "result": {
+                    "job_title": self.__details["task_title"],
+                    "status_code": 500,
+                    "product": product,
+                    "subject": subject,
+                    **counts,
+                    "message": t
+                }
+            }
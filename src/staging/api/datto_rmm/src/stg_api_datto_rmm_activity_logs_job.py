@@ -16,8 +16,12 @@ from load.load_postgres import *
 from utilities.setup_logger import *
 from utilities.task_prep import *
 from utilities.vault_mgr import *
+from utilities.partition_mgr import run_partitioned
+from utilities.arrow_mgr import append_constant_columns, table_to_pandas
 
 from transform.transform_api_datto_rmm_activity_logs_job import *
+from transform.transform_api_datto_rmm_activity_logs_job_polars import TransformApiDattoRMMPolars
+from transform.transform_json_details import load_field_map
 from extract.extract_api_datto_rmm import *
 
 import sys
@@ -53,10 +57,13 @@ def extract_api_datto_rmm_activity_logs(config: dict,
         result = data["result"]
         results_list.append(result)
 
-        df['_SOURCE_PRODUCT'] = config["DETAILS"]["product"]
-        df['_SOURCE_SUBJECT'] = config["DETAILS"]["subject"]
-        df['_SOURCE_ORIGIN'] = config["DATA"]["origin"]
-        df['_UTC_EXTRACTION_DATETIME'] = config["TIMESTAMPS"]["_IN_DATA_TIMESTAMP"]
+        # pandas DataFrame, or pyarrow.Table when DATA.destination is "arrow"
+        df = append_constant_columns(df, {
+            '_SOURCE_PRODUCT': config["DETAILS"]["product"],
+            '_SOURCE_SUBJECT': config["DETAILS"]["subject"],
+            '_SOURCE_ORIGIN': config["DATA"]["origin"],
+            '_UTC_EXTRACTION_DATETIME': config["TIMESTAMPS"]["_IN_DATA_TIMESTAMP"],
+        })
 
         return df
 
@@ -72,13 +79,27 @@ def extract_api_datto_rmm_activity_logs(config: dict,
 
 
 @task(tags=["transform"])
-def transform_dataframe(df, config: dict) -> pd.DataFrame:
+def transform_dataframe(df, config: dict, field_map_dir: str) -> pd.DataFrame:
     """
     Transforms Datto RMM activity log data using job-specific parsing logic.
     """
     try:
-        transform = TransformApiDattoRMM(df)
-        data = transform.transform_activity_logs_job_dataframe()
+        field_map = load_field_map(field_map_dir=field_map_dir)
+        if field_map["result"]["status_code"] != 200:
+            # an unreadable field map fails the flow with its own traceback, not a KeyError on "data"
+            results_list.append(field_map["result"])
+            print(field_map["result"]["status_message"])
+            sys.exit(1)
+        field_map = field_map["data"]
+        if config["DATA"].get("backend", "pandas") == "polars":
+            # polars runs the lazy plan multi-threaded itself, the process pool only serves the pandas backend
+            data = TransformApiDattoRMMPolars(
+                df, field_map=field_map, streaming=config["DATA"].get("streaming", False)
+            ).transform_activity_logs_job_dataframe()
+        else:
+            data = run_partitioned(TransformApiDattoRMM, table_to_pandas(df), "transform_activity_logs_job_dataframe",
+                                   partitions=config["DATA"].get("partitions", 1),
+                                   field_map=field_map)
         df = data["data"]
         result = data["result"]
         results_list.append(result)
@@ -151,13 +172,14 @@ def stg_api_datto_rmm_activity_logs_job() -> None:
     """
     print(f"[INFO] Working dir: {os.getcwd()}")
 
-    tasks = prepare_tasks(config_dir=f"{Path(__file__).parent.resolve()}/config/activity_logs_job/config.yaml")["data"]
+    config_dir = f"{Path(__file__).parent.resolve()}/config/activity_logs_job"
+    tasks = prepare_tasks(config_dir=f"{config_dir}/config.yaml")["data"]
     vault = VaultManager()
 
     df = extract_api_datto_rmm_activity_logs(days=45,
                                              categories=["job"],
                                              config=tasks[0])
-    df = transform_dataframe(df, tasks[1])
+    df = transform_dataframe(df, tasks[1], field_map_dir=f"{config_dir}/{tasks[1]['DATA']['field_map']}")
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
         future_minio = executor.submit(load_minio, df=df, config=tasks[2], vault=vault)
@@ -15,9 +15,13 @@ from load.load_postgres import PostgresLoad
 
 from utilities.task_prep import prepare_tasks
 from utilities.vault_mgr import VaultManager
+from utilities.partition_mgr import run_partitioned
+from utilities.arrow_mgr import append_constant_columns, table_to_pandas
+from utilities.dtype_mgr import load_dtype_schema, optimize_dtypes
 
 from extract.extract_api_datto_rmm import ExtractApiDattoRMM
 from transform.transform_api_datto_rmm_devices import TransformApiDattoRMM
+from transform.transform_api_datto_rmm_devices_polars import TransformApiDattoRMMPolars
 
 from loguru import logger
 import sys
@@ -46,11 +50,13 @@ def extract_api_datto_rmm_devices(config: dict, vault: VaultManager) -> pd.DataF
         result = data["result"]
         df = data["data"]
 
-        # Add metadata columns
-        df['_SOURCE_PRODUCT'] = config["DETAILS"]["product"]
-        df['_SOURCE_SUBJECT'] = config["DETAILS"]["subject"]
-        df['_SOURCE_ORIGIN'] = config["DATA"]["origin"]
-        df['_UTC_EXTRACTION_DATETIME'] = config["TIMESTAMPS"]["_IN_DATA_TIMESTAMP"]
+        # Add metadata columns (pandas DataFrame, or pyarrow.Table when DATA.destination is "arrow")
+        df = append_constant_columns(df, {
+            '_SOURCE_PRODUCT': config["DETAILS"]["product"],
+            '_SOURCE_SUBJECT': config["DETAILS"]["subject"],
+            '_SOURCE_ORIGIN': config["DATA"]["origin"],
+            '_UTC_EXTRACTION_DATETIME': config["TIMESTAMPS"]["_IN_DATA_TIMESTAMP"],
+        })
 
         results_list.append(result)
         return df
@@ -75,8 +81,14 @@ def transform_dataframe(df: pd.DataFrame, config: dict) -> pd.DataFrame:
     Transforms the raw extracted Datto RMM device data.
     """
     try:
-        transform = TransformApiDattoRMM(df)
-        data = transform.transform_devices_dataframe()
+        if config["DATA"].get("backend", "pandas") == "polars":
+            # polars runs the lazy plan multi-threaded itself, the process pool only serves the pandas backend
+            data = TransformApiDattoRMMPolars(
+                df, streaming=config["DATA"].get("streaming", False)
+            ).transform_devices_dataframe()
+        else:
+            data = run_partitioned(TransformApiDattoRMM, table_to_pandas(df), "transform_devices_dataframe",
+                                   partitions=config["DATA"].get("partitions", 1))
         result = data["result"]
         df = data["data"]
 
@@ -95,6 +107,38 @@ def transform_dataframe(df: pd.DataFrame, config: dict) -> pd.DataFrame:
         sys.exit(1)
 
 
+@task(tags=["transform", "dtypes"])
+def optimize_dataframe(df: pd.DataFrame, dtypes_dir: str) -> pd.DataFrame:
+    """
+    Converts the modeled device frame to the compact dtypes declared in the table's dtype schema
+    and records memory before/after.
+    """
+    try:
+        schema = load_dtype_schema(schema_dir=dtypes_dir)
+        if schema["result"]["status_code"] != 200:
+            # an unreadable schema fails the flow with its own traceback, not a KeyError on "data"
+            results_list.append(schema["result"])
+            print(schema["result"]["status_message"])
+            sys.exit(1)
+        data = optimize_dtypes(df, schema["data"])
+        result = data["result"]
+        df = data["data"]
+
+        results_list.append(result)
+        return df
+
+    except Exception:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t,
+        }
+        results_list.append(result)
+        logger.error(t)
+        return df
+
+
 # ----------------------------
 # LOAD: MinIO
 # ----------------------------
@@ -157,13 +201,15 @@ def stg_api_datto_rmm_devices() -> None:
     print(f"[INFO] Current working directory: {os.getcwd()}")
 
     # Load the configuration YAML (split into task steps)
-    tasks = prepare_tasks(config_dir=f"{Path(__file__).parent.resolve()}/config/devices/config.yaml")["data"]
+    config_dir = f"{Path(__file__).parent.resolve()}/config/devices"
+    tasks = prepare_tasks(config_dir=f"{config_dir}/config.yaml")["data"]
 
     vault = VaultManager()
 
     # Task inputs: [0]=extract, [1]=transform, [2]=minio, [3]=postgres
     df = extract_api_datto_rmm_devices(config=tasks[0], vault=vault)
     df = transform_dataframe(df, tasks[1])
+    df = optimize_dataframe(df, dtypes_dir=f"{config_dir}/{tasks[1]['DATA']['dtypes']}")
 
     # Run MinIO and Postgres loading in parallel using threading
     with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
@@ -15,6 +15,7 @@ from load.load_postgres import PostgresLoad
 
 from utilities.task_prep import prepare_tasks
 from utilities.vault_mgr import VaultManager
+from utilities.partition_mgr import run_partitioned
 
 from extract.extract_api_datto_rmm import ExtractApiDattoRMM
 from transform.transform_api_datto_rmm_devices import TransformApiDattoRMM
@@ -68,8 +69,8 @@ def transform_dataframe(df: pd.DataFrame, config: dict) -> pd.DataFrame:
     Transforms the raw extracted Datto RMM device data.
     """
     try:
-        transform = TransformApiDattoRMM(df)
-        data = transform.transform_devices_dataframe()
+        data = run_partitioned(TransformApiDattoRMM, df, "transform_devices_dataframe",
+                               partitions=config["DATA"].get("partitions", 1))
         result = data["result"]
         df = data["data"]
 
@@ -0,0 +1,88 @@
+"""
+Staging Lake Compaction Flow
+
+Hourly staging runs (Datto RMM, End of Life, Scalepad) leave one small Parquet file per run in
+each hive partition. This flow, for every configured product/subject:
+1. Deletes the objects replaced by earlier runs once their retention window has passed
+2. Picks settled partitions holding enough small files from the dataset manifest
+3. Merges them into right-sized, sorted files (latest row per natural key where configured), or for
+   snapshot subjects keeps only each partition's last run
+4. Swaps the manifest to the new files, tombstoning the replaced ones
+"""
+
+from prefect import flow, task
+from prefect.artifacts import *
+
+from load.compact_minio import MinioCompaction
+
+from utilities.task_prep import prepare_tasks
+from utilities.vault_mgr import VaultManager
+
+import sys
+import os
+import inspect
+import traceback
+import concurrent.futures
+from pathlib import Path
+import json
+
+# Collect results from each task for CLI feedback
+results_list = []
+
+
+# ----------------------------
+# COMPACT: MinIO
+# ----------------------------
+@task(tags=["compact", "get", "put", "object_storage", "minio"])
+def compact_minio(config: dict, vault: VaultManager) -> None:
+    """
+    Compacts the small files of one staging dataset.
+    """
+    try:
+        compaction = MinioCompaction(config=config, vault=vault)
+        data = compaction.compact_dataset()
+        result = data["result"]
+        results_list.append(result)
+
+    except Exception:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+        results_list.append(result)
+
+
+# ----------------------------
+# FLOW ENTRYPOINT
+# ----------------------------
+@flow
+def stg_minio_compaction(max_workers: int = 3) -> None:
+    """
+    Main flow to compact every configured staging dataset, a few datasets at a time.
+    """
+    print(f"[INFO] Current working directory: {os.getcwd()}")
+
+    config_dir = f"{Path(__file__).parent.resolve()}/config/compaction"
+    tasks = prepare_tasks(config_dir=f"{config_dir}/config.yaml")["data"]
+
+    vault = VaultManager()
+
+    # datasets are independent (one manifest each), so they are compacted concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(compact_minio, config=config, vault=vault) for config in tasks]
+        concurrent.futures.wait(futures)
+
+    # Final output print block for CLI review
+    print("#" * 75)
+    print("\n        FINAL RESULTS\n")
+    print("--------------------------------")
+    for result in results_list:
+        print("\n" + json.dumps(result, indent=4))
+        print("---------")
+    print("\n" + "#" * 75)
+
+
+if __name__ == "__main__":
+    stg_minio_compaction()
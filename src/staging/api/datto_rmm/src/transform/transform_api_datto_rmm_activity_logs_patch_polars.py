@@ -0,0 +1,48 @@
+import traceback
+import inspect
+import sys
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+from .transform_json_details_polars import TransformJsonDetailsPolars
+from .transform_polars_frame import collect_to_pandas, collect_like
+
+
+class TransformApiDattoRMMPolars:
+    def __init__(self, df: pd.DataFrame | pa.Table, field_map: dict, streaming: bool = False) -> None:
+        """Builds the lazy patch log plan; nothing is executed until the dataframe is requested."""
+        self.__df = df
+        self.__field_map = field_map
+        self.__streaming = streaming
+        self.__lf = None
+        self.transform_explode_patch_details()
+
+    @property
+    def lf(self) -> pl.LazyFrame:
+        return self.__lf
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return collect_to_pandas(self.__lf, streaming=self.__streaming)
+
+    def transform_activity_logs_patch_dataframe(self) -> dict:
+        """Collects the patch plan (to pandas, or Arrow for Arrow input) and returns it with status metadata."""
+        return {
+            "data": collect_like(self.__lf, self.__df, streaming=self.__streaming),
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 200,
+                "message": "DataFrame created successfully"
+            }
+        }
+
+    def transform_explode_patch_details(self) -> None:
+        """Explodes the nested patch log JSON details into the columns declared by the patch field map."""
+        print(f"\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n")
+
+        try:
+            self.__lf = TransformJsonDetailsPolars(self.__df, self.__field_map).lf
+        except Exception:
+            sys.exit(traceback.format_exc())
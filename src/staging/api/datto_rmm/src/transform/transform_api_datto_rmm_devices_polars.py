@@ -0,0 +1,164 @@
+"""
+Polars LazyFrame backend for the Datto RMM device transform.
+
+Mirrors `transform_api_datto_rmm_devices.TransformApiDattoRMM` step for step:
+- Patch status calculations
+- Audit and reboot duration flags
+- OS version and type parsing
+- Cloud provider tagging (e.g., AWS Workspaces)
+
+Each step adds expressions to one lazy plan which is optimized and executed on collect, and
+`.transform_devices_dataframe()` returns the same output contract as the pandas backend
+(an Arrow table instead when the extractor produced one).
+"""
+
+import datetime as dt
+import traceback
+import inspect
+import sys
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+from .transform_polars_frame import to_lazy, collect_to_pandas, collect_like
+
+
+class TransformApiDattoRMMPolars:
+    """
+    Applies the Datto RMM devices transformation logic as a polars lazy query.
+    """
+
+    def __init__(self, df: pd.DataFrame | pa.Table, streaming: bool = False) -> None:
+        self.__source = df
+        self.__lf = to_lazy(df)
+        self.__streaming = streaming
+
+        self.append_patch_percentage_column()
+        self.append_calculated_columns()
+        self.replace_undefined_values()
+        self.parse_os_ver_info()
+        self.transform_cloud_category_cols()
+
+    @property
+    def lf(self) -> pl.LazyFrame:
+        return self.__lf
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return collect_to_pandas(self.__lf, streaming=self.__streaming)
+
+    def transform_devices_dataframe(self) -> dict:
+        """
+        Collects the plan (to pandas, or Arrow for Arrow input) and wraps the transformed
+        dataframe in a structured format.
+        """
+        return {
+            "data": collect_like(self.__lf, self.__source, streaming=self.__streaming),
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 200,
+                "message": "DataFrame created successfully"
+            }
+        }
+
+    def append_patch_percentage_column(self) -> None:
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            installed = pl.col('patches_installed')
+            total = pl.col('patches_approved_pending') + installed
+
+            self.__lf = self.__lf.with_columns(
+                pl.when(total == 0)
+                .then(pl.lit(0.0))
+                .otherwise((installed / total * 100).round(2))
+                .alias('patch_status_percentage')
+            )
+        except Exception:
+            t = traceback.format_exc()
+            sys.exit(t)
+
+    def append_calculated_columns(self) -> None:
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            cutoff = dt.datetime.now() - dt.timedelta(days=30)
+
+            self.__lf = self.__lf.with_columns([
+                (pl.col(source) < cutoff).fill_null(False).cast(pl.Int64).alias(target)
+                for source, target in [
+                    ('last_audit_date', 'no_audit_last_30_days'),
+                    ('adjusted_last_seen', 'offline_last_30_days'),
+                    ('last_reboot', 'no_reboot_last_30_days'),
+                ]
+            ])
+        except Exception:
+            t = traceback.format_exc()
+            sys.exit(t)
+
+    def replace_undefined_values(self) -> None:
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            strings = pl.col(pl.String)
+            self.__lf = self.__lf.with_columns(
+                pl.when(strings.is_in(['null', ''])).then(None).otherwise(strings).name.keep()
+            )
+        except Exception:
+            t = traceback.format_exc()
+            sys.exit(t)
+
+    def parse_os_ver_info(self) -> None:
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            os_string = pl.col('operating_system').fill_null('')
+            os_lower = os_string.str.to_lowercase()
+
+            os_type = (
+                pl.when(os_lower.str.contains('windows', literal=True)).then(pl.lit('Microsoft'))
+                .when(os_lower.str.contains('linux', literal=True)).then(pl.lit('Linux'))
+                .when(os_lower.str.contains('mac', literal=True)).then(pl.lit('MacOS'))
+                .otherwise(pl.lit('Unknown'))
+            )
+
+            # Edition parsing (Windows only, other os types stay null)
+            is_workstation = pl.any_horizontal([
+                os_lower.str.contains(term, literal=True) for term in [' pro', ' home', ' workstations', ' business']
+            ])
+            os_release_edition = (
+                pl.when(os_type != 'Microsoft').then(None)
+                .when(is_workstation).then(pl.lit('Workstation'))
+                .when(os_lower.str.contains('enterprise', literal=True)).then(pl.lit('Enterprise'))
+                .when(os_lower.str.contains('iot', literal=True)).then(pl.lit('IoT'))
+                .otherwise(pl.lit('Standard'))
+            )
+
+            self.__lf = self.__lf.with_columns(
+                os_string.str.extract(r'.*\s(\d+\.\d+\.\d+).*', 1).alias('os_build'),
+                os_string.str.extract(r'(.*)\s(\d+\.\d+\.\d+).*', 1).alias('os_name'),
+                os_type.alias('os_type'),
+                os_release_edition.alias('os_release_edition'),
+                os_lower.str.contains(' lts', literal=True).alias('os_is_lts'),
+                # Optional: release info field (e.g., "20H2", "2016")
+                os_string.str.extract(r'^(\w{5,}\s)+([\dA-Z\.]{1,4}\s?(R2)?).*', 2)
+                .str.strip_chars().alias('release_info'),
+            )
+        except Exception:
+            t = traceback.format_exc()
+            sys.exit(t)
+
+    def transform_cloud_category_cols(self) -> None:
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            # Identify AWS Workspace patterns in hostname
+            is_aws = pl.col('hostname').str.contains(r'^(\bEC2AMAZ\b|\bWSAMZN\b|\bIP-\b).*').fill_null(False)
+
+            self.__lf = self.__lf.with_columns(
+                pl.when(is_aws).then(pl.lit('AWS')).otherwise(None).alias('cloud_category'),
+                pl.when(is_aws).then(pl.lit('Workspace')).otherwise(None).alias('cloud_type'),
+            )
+        except Exception:
+            t = traceback.format_exc()
+            sys.exit(t)
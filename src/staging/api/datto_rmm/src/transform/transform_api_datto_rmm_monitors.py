@@ -43,35 +43,31 @@ class TransformApiDattoRMM:
         logger.info(f"[START] - {inspect.currentframe().f_code.co_name}")
 
         try:
-            def split_to_cols_ra_list(row):
-                default_action = [{
-                    "action_time": 0,
-                    "action_type": None,
-                    "description": None,
-                    "action_reference": None,
-                    "action_reference_int": None
-                }]
-                self.__df.loc[row.index, 'response_actions'] = json.dumps(
-                    row['response_actions'] if row.get('response_actions') is not None else default_action
-                )
-
-            self.__df.apply(lambda row: split_to_cols_ra_list(row), axis=1)
+            default_action = [{
+                "action_time": 0,
+                "action_type": None,
+                "description": None,
+                "action_reference": None,
+                "action_reference_int": None
+            }]
+            self.__df['response_actions'] = [
+                json.dumps(actions if actions is not None else default_action)
+                for actions in self.__df['response_actions']
+            ]
 
         except Exception:
             logger.exception("Error during response_actions transformation")
             sys.exit(traceback.format_exc())
 
     def transform_timestamps(self):
-        """Converts 'timestamp' from Unix timestamp to pandas datetime."""
+        """Converts 'timestamp' from a Unix timestamp (ms) to pandas datetime."""
         logger.info(f"[START] - {inspect.currentframe().f_code.co_name}")
 
         try:
-            def fix_timestamp(row):
-                self.__df.loc[row.index, 'timestamp'] = (
-                    pd.NaT if row.get('timestamp') is None else dt.datetime.fromtimestamp(row['timestamp'])
-                )
-
-            self.__df.apply(lambda row: fix_timestamp(row), axis=1)
+            # open alerts carry epoch milliseconds, resolved alerts are already converted by the extractor
+            if not pd.api.types.is_datetime64_any_dtype(self.__df['timestamp']):
+                self.__df['timestamp'] = pd.to_datetime(
+                    pd.to_numeric(self.__df['timestamp'], errors='coerce'), unit='ms', errors='coerce')
 
         except Exception:
             logger.exception("Error during timestamp transformation")
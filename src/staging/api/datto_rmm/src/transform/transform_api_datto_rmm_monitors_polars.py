@@ -0,0 +1,134 @@
+import traceback
+import inspect
+import sys
+import pandas as pd
+import polars as pl
+import json
+import re
+from loguru import logger
+
+from .transform_polars_frame import to_lazy, collect_to_pandas
+
+
+class TransformApiDattoRMMPolars:
+    """
+    Polars LazyFrame backend for the Datto RMM monitor (alert) transform; same output contract as
+    `transform_api_datto_rmm_monitors.TransformApiDattoRMM`.
+    """
+
+    def __init__(self, df: pd.DataFrame, streaming: bool = False) -> None:
+        """Initialize and build the lazy plan for all transformation steps."""
+        self.__df = df
+        self.__streaming = streaming
+
+        # nested list/dict columns are flattened in python before the frame goes lazy
+        self.__lf = to_lazy(df.drop(columns=['response_actions', 'alert_context']))
+
+        self.transform_response_actions()
+        self.transform_timestamps()
+        self.transform_alert_context()
+        self.transform_replace_nan_with_none()
+
+    @property
+    def lf(self) -> pl.LazyFrame:
+        return self.__lf
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Collects and returns the transformed DataFrame."""
+        return collect_to_pandas(self.__lf, streaming=self.__streaming)
+
+    def transform_monitors_dataframe(self) -> dict:
+        """Wraps the DataFrame in a response-style dictionary for downstream usage."""
+        return {
+            "data": self.df,
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 200,
+                "message": "DataFrame created successfully"
+            }
+        }
+
+    @staticmethod
+    def context_column_name(key: str) -> str:
+        """Maps an alertContext key to its snake_case `alert_context_*` column name."""
+        if key == '@class':
+            return 'alert_context_class'
+        name = re.sub(r'(?<![A-Z])(?=[A-Z]){3,}', '_', f'alert_context_{key[0].capitalize()}{key[1:]}')
+        return re.sub(r'_{2,}', '_', name).lower()
+
+    def transform_response_actions(self):
+        """Converts 'responseActions' column from list/dict format to a JSON string, ensuring a consistent structure."""
+        logger.info(f"[START] - {inspect.currentframe().f_code.co_name}")
+
+        try:
+            default_action = [{
+                "action_time": 0,
+                "action_type": None,
+                "description": None,
+                "action_reference": None,
+                "action_reference_int": None
+            }]
+            self.__lf = self.__lf.with_columns(pl.Series('response_actions', [
+                json.dumps(actions if actions is not None else default_action)
+                for actions in self.__df['response_actions']
+            ], dtype=pl.String))
+
+        except Exception:
+            logger.exception("Error during response_actions transformation")
+            sys.exit(traceback.format_exc())
+
+    def transform_timestamps(self):
+        """Converts 'timestamp' from a Unix timestamp (ms) to datetime."""
+        logger.info(f"[START] - {inspect.currentframe().f_code.co_name}")
+
+        try:
+            timestamp = pl.col('timestamp')
+            if self.__lf.collect_schema()['timestamp'] != pl.Datetime:
+                timestamp = pl.from_epoch(timestamp.cast(pl.Float64, strict=False).cast(pl.Int64), time_unit='ms')
+
+            self.__lf = self.__lf.with_columns(timestamp.alias('timestamp'))
+
+        except Exception:
+            logger.exception("Error during timestamp transformation")
+            sys.exit(traceback.format_exc())
+
+    def transform_alert_context(self):
+        """
+        Flattens the 'alert_context' dicts into `alert_context_*` columns in one pass
+        and normalizes field names into snake_case.
+        """
+        logger.info(f"[START] - {inspect.currentframe().f_code.co_name}")
+
+        try:
+            contexts = [c if isinstance(c, dict) else {} for c in self.__df['alert_context']]
+            context_df = pl.from_dicts(contexts, infer_schema_length=None, strict=False) if contexts else pl.DataFrame()
+            if context_df.width == 0:
+                context_df = pl.DataFrame({'@class': [None] * len(contexts)}, schema={'@class': pl.String})
+
+            context_df = context_df.select(
+                pl.col('@class').alias('alert_class') if '@class' in context_df.columns
+                else pl.lit(None, pl.String).alias('alert_class'),
+                *[pl.col(key).alias(self.context_column_name(key)) for key in context_df.columns],
+            )
+
+            if 'alert_context_last_triggered' in context_df.columns:
+                context_df = context_df.with_columns(
+                    pl.from_epoch(pl.col('alert_context_last_triggered').cast(pl.Int64, strict=False), time_unit='ms')
+                )
+
+            self.__lf = pl.concat([self.__lf, context_df.lazy()], how='horizontal')
+
+        except Exception:
+            logger.exception("Error during alert_context transformation")
+            sys.exit(traceback.format_exc())
+
+    def transform_replace_nan_with_none(self):
+        """Replaces string 'nan' with null for SQL compatibility."""
+        logger.info(f"[START] - {inspect.currentframe().f_code.co_name}")
+        try:
+            strings = pl.col(pl.String)
+            self.__lf = self.__lf.with_columns(pl.when(strings == 'nan').then(None).otherwise(strings).name.keep())
+        except Exception:
+            logger.exception("Error replacing 'nan' with None")
+            sys.exit(traceback.format_exc())
@@ -0,0 +1,172 @@
+"""
+Declarative JSON detail explosion for Datto RMM activity log records.
+
+Activity log rows carry a `details` column holding a flat JSON object keyed by dotted names
+(e.g. `patch_activity.run_date`). Rather than hand-mapping keys per row, each category ships a
+YAML field map that declares:
+
+- key: dotted key inside the JSON document
+- column: output column name
+- type: raw | str | upper | datetime_ms | datetime_s | lines
+- regex: optional pattern applied to the key's value (first group, or `group`)
+
+The whole column is parsed in one pass and every conversion / regex is applied column-wise with
+patterns compiled once per field map.
+"""
+
+import traceback
+import inspect
+import sys
+import json
+import re
+import yaml
+import pandas as pd
+
+
+FIELD_TYPES = ("raw", "str", "upper", "datetime_ms", "datetime_s", "lines")
+
+
+def load_field_map(field_map_dir: str = "./field_map.yaml") -> dict:
+    """
+    Loads a field map YAML and precompiles its regex patterns.
+
+    Args:
+        field_map_dir (str): Full or relative path to the field map YAML file.
+
+    Returns:
+        dict: {"data": {"SOURCE_COLUMN": ..., "DROP_SOURCE": ..., "FIELDS": [...]}, "result": {...}}
+    """
+    try:
+        with open(field_map_dir, "r") as stream:
+            field_map = yaml.safe_load(stream)
+
+        field_map["FIELDS"] = TransformJsonDetails.compile_fields(field_map["FIELDS"])
+
+        return {
+            "data": field_map,
+            "result": {
+                "task_name": inspect.currentframe().f_code.co_name,
+                "status_message": "Success",
+                "status_code": 200,
+            }
+        }
+
+    except Exception:
+        return {
+            "result": {
+                "task_name": inspect.currentframe().f_code.co_name,
+                "status_message": traceback.format_exc(),
+                "status_code": 500,
+            }
+        }
+
+
+class TransformJsonDetails:
+    """
+    Explodes a JSON string column into typed columns as declared by a field map.
+    """
+
+    def __init__(self, df: pd.DataFrame, field_map: dict) -> None:
+        self.__df = df
+        self.__source_column = field_map.get("SOURCE_COLUMN", "details")
+        self.__drop_source = field_map.get("DROP_SOURCE", True)
+        self.__fields = self.compile_fields(field_map["FIELDS"])
+
+        self.transform_explode_json_details()
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.__df
+
+    def transform_json_details_dataframe(self) -> dict:
+        """Returns exploded dataframe with status metadata."""
+        return {
+            "data": self.__df,
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 200,
+                "message": "DataFrame created successfully"
+            }
+        }
+
+    @staticmethod
+    def compile_fields(fields: list) -> list:
+        """
+        Validates field definitions and compiles any regex once. Already compiled maps pass through.
+        """
+        compiled = []
+        for field in fields:
+            field = dict(field)
+            field.setdefault("type", "raw")
+            field.setdefault("group", 1)
+
+            if field["type"] not in FIELD_TYPES:
+                raise ValueError(f'Unsupported field type "{field["type"]}" for column "{field["column"]}"')
+
+            if isinstance(field.get("regex"), str):
+                field["regex"] = re.compile(field["regex"])
+
+            compiled.append(field)
+
+        return compiled
+
+    def parse_details_column(self) -> pd.DataFrame:
+        """
+        Parses the source column in bulk and returns one column per referenced dotted key.
+        """
+        values = self.__df[self.__source_column].tolist()
+
+        if all(v is None or isinstance(v, str) for v in values):
+            # single decoder call over the whole column instead of one json.loads per row
+            docs = json.loads("[" + ",".join(v if v else "null" for v in values) + "]")
+        else:
+            docs = [json.loads(v) if isinstance(v, str) and v else v for v in values]
+
+        docs = [d if isinstance(d, dict) else {} for d in docs]
+        keys = list(dict.fromkeys(field["key"] for field in self.__fields))
+
+        return pd.DataFrame(docs, columns=keys, index=self.__df.index)
+
+    @staticmethod
+    def convert_column(values: pd.Series, field: dict) -> pd.Series:
+        """
+        Applies a field's regex extract and type conversion to an entire column.
+        """
+        if field.get("regex") is not None:
+            strings = values.where(values.map(lambda v: isinstance(v, str)), "").astype(object)
+            values = strings.str.extract(field["regex"], expand=True).iloc[:, field["group"] - 1]
+
+        match field["type"]:
+            case "upper":
+                values = values.astype(object).str.upper().replace({"": None})
+            case "datetime_ms":
+                return pd.to_datetime(pd.to_numeric(values, errors="coerce"), unit="ms", errors="coerce")
+            case "datetime_s":
+                return pd.to_datetime(pd.to_numeric(values, errors="coerce"), unit="s", errors="coerce")
+            case "lines":
+                return pd.Series([v.split("\n") if isinstance(v, str) and v else [] for v in values],
+                                 index=values.index, dtype=object)
+            case "str":
+                values = values.astype(object)
+
+        # keys absent from every document come back as float NaN, keep them as None like .get() would
+        if pd.api.types.is_string_dtype(values.dtype) or values.isna().all():
+            values = values.astype(object).where(values.notna(), None)
+
+        return values
+
+    def transform_explode_json_details(self) -> None:
+        """Explodes the JSON detail column into the declared output columns."""
+        print(f"\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n")
+
+        try:
+            details_df = self.parse_details_column()
+
+            for field in self.__fields:
+                self.__df[field["column"]] = self.convert_column(details_df[field["key"]], field)
+
+            if self.__drop_source:
+                self.__df.drop([self.__source_column], axis=1, inplace=True)
+
+        except Exception:
+            sys.exit(traceback.format_exc())
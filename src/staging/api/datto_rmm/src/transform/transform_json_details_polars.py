@@ -0,0 +1,125 @@
+"""
+Polars implementation of the declarative JSON detail explosion (see `transform_json_details`).
+
+The detail column is decoded once by polars' native NDJSON reader, then every field of the field
+map becomes a column expression on a LazyFrame so the conversions are planned and executed together.
+"""
+
+import traceback
+import inspect
+import sys
+import json
+import io
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+from .transform_json_details import TransformJsonDetails
+from .transform_polars_frame import to_lazy
+
+
+class TransformJsonDetailsPolars:
+    """
+    Explodes a JSON string column into typed columns as declared by a field map, on a LazyFrame.
+    """
+
+    def __init__(self, df: pd.DataFrame | pa.Table, field_map: dict) -> None:
+        self.__df = df
+        self.__source_column = field_map.get("SOURCE_COLUMN", "details")
+        self.__drop_source = field_map.get("DROP_SOURCE", True)
+        self.__fields = TransformJsonDetails.compile_fields(field_map["FIELDS"])
+        self.__lf = None
+
+        self.transform_explode_json_details()
+
+    @property
+    def lf(self) -> pl.LazyFrame:
+        return self.__lf
+
+    def parse_details_column(self) -> pl.DataFrame:
+        """
+        Decodes the source column in one native call and returns one column per referenced key,
+        named `__detail_<n>` in field-map key order.
+        """
+        if isinstance(self.__df, pa.Table):
+            values = self.__df.column(self.__source_column).to_pylist()
+        else:
+            values = self.__df[self.__source_column].tolist()
+        lines = [
+            json.dumps(v) if isinstance(v, dict) else v if isinstance(v, str) and v else "{}"
+            for v in values
+        ]
+        keys = list(dict.fromkeys(field["key"] for field in self.__fields))
+
+        decoded = (
+            pl.read_ndjson(io.BytesIO("\n".join(lines).encode("utf-8")), infer_schema_length=None)
+            if lines else pl.DataFrame()
+        )
+
+        # keys absent from every document still need a (null) column
+        return pl.DataFrame([
+            decoded[key] if key in decoded.columns else pl.Series(key, [None] * len(lines))
+            for key in keys
+        ]).rename({key: f"__detail_{i}" for i, key in enumerate(keys)})
+
+    @staticmethod
+    def convert_expr(column: str, dtype: pl.DataType, field: dict) -> pl.Expr:
+        """
+        Builds the regex extract and type conversion for one field as a single expression.
+        """
+        expr = pl.col(column)
+        is_string = dtype == pl.String
+
+        if field.get("regex") is not None:
+            # non-string values never match, like the pandas engine
+            expr = expr.str.extract(field["regex"].pattern, field["group"]) if is_string else pl.lit(None, pl.String)
+            is_string = True
+
+        match field["type"]:
+            case "upper":
+                if not is_string:
+                    return pl.lit(None, pl.String)
+                expr = expr.str.to_uppercase()
+                return pl.when(expr == "").then(None).otherwise(expr)
+            case "datetime_ms":
+                return pl.from_epoch(expr.cast(pl.Float64, strict=False).cast(pl.Int64), time_unit="ms")
+            case "datetime_s":
+                return pl.from_epoch((expr.cast(pl.Float64, strict=False) * 1_000_000).cast(pl.Int64), time_unit="us")
+            case "lines":
+                if not is_string:
+                    return pl.lit([], pl.List(pl.String))
+                return (pl.when(expr.is_null() | (expr == ""))
+                        .then(pl.lit([], pl.List(pl.String)))
+                        .otherwise(expr.str.split("\n")))
+
+        return expr
+
+    def transform_explode_json_details(self) -> None:
+        """Builds the lazy plan that explodes the JSON detail column into the declared output columns."""
+        print(f"\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n")
+
+        try:
+            details = self.parse_details_column()
+            keys = list(dict.fromkeys(field["key"] for field in self.__fields))
+            columns = {key: f"__detail_{i}" for i, key in enumerate(keys)}
+
+            if not self.__drop_source:
+                base = to_lazy(self.__df)
+            elif isinstance(self.__df, pa.Table):
+                base = to_lazy(self.__df.drop_columns([self.__source_column]))
+            else:
+                base = to_lazy(self.__df.drop(columns=[self.__source_column]))
+
+            self.__lf = (
+                pl.concat([base, details.lazy()], how="horizontal")
+                .with_columns([
+                    self.convert_expr(columns[field["key"]], details.schema[columns[field["key"]]], field)
+                    .alias(field["column"])
+                    for field in self.__fields
+                ])
+                .drop(list(columns.values()))
+            )
+
+        except Exception:
+            sys.exit(traceback.format_exc())
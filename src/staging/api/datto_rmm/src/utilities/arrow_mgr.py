@@ -0,0 +1,53 @@
+"""
+Arrow Frame Utility
+
+Helpers for the Arrow data path, where a task's frame travels as a `pyarrow.Table` from the
+extractor through the polars transform into both loaders:
+- Appends the `_SOURCE_*` metadata columns to either a pandas DataFrame or an Arrow table
+- Converts a table to the pandas shape the pandas transforms and loaders expect
+
+Select it per extract task with `DATA.destination: arrow` in config.yaml (default: dataframe).
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+
+def append_constant_columns(data, columns: dict):
+    """
+    Appends constant-valued columns to a pandas DataFrame or Arrow table.
+
+    Args:
+        data (pd.DataFrame | pa.Table): Frame to extend.
+        columns (dict): Column name -> value.
+
+    Returns:
+        pd.DataFrame | pa.Table: Same container type as `data`.
+    """
+    if isinstance(data, pa.Table):
+        for name, value in columns.items():
+            data = data.append_column(name, pa.array([value] * data.num_rows))
+        return data
+
+    for name, value in columns.items():
+        data[name] = value
+    return data
+
+
+def table_to_pandas(data) -> pd.DataFrame:
+    """
+    Converts an Arrow table to pandas with list columns as Python lists and string columns as
+    object dtype holding None. pandas input passes through untouched.
+    """
+    if not isinstance(data, pa.Table):
+        return data
+
+    df = data.to_pandas(split_blocks=True)
+
+    for field in data.schema:
+        if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+            df[field.name] = df[field.name].map(lambda v: list(v) if v is not None else v)
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            df[field.name] = df[field.name].astype(object).where(df[field.name].notna(), None)
+
+    return df
@@ -0,0 +1,332 @@
+"""
+Staging Dataset Utility
+
+Hive-style object layout and a manifest per product/subject for the staging bucket, so readers
+can find the latest file or a date range without LIST calls over the whole prefix:
+
+    <product>/<subject>/source_method=<method>/year=YYYY/month=MM/day=DD/<file>
+    <product>/<subject>/_manifest.json
+
+The manifest is one JSON document:
+
+    {
+      "product": "datto_rmm", "subject": "devices", "version": 42, "updated_at": "...",
+      "schema_hash": "<hash of the newest file's schema>",
+      "files": [
+        {"path": "...", "partition": {"source_method": "api", "year": "2024", ...},
+         "rows": 1234, "bytes": 56789, "etag": "...", "extracted_at": "2024-01-01 00:00:00",
+         "schema_hash": "...", "stats": {"site_uid": {"min": "...", "max": "..."}}}
+      ],
+      "tombstones": [{"path": "...", "removed_at": "..."}]
+    }
+
+Removed files are only tombstoned: their objects stay readable until a later cleanup deletes
+them past a retention window, so readers still holding the previous manifest can finish.
+
+Each load replaces the manifest with a single PUT (readers see the old or the new document,
+never a partial one). The PUT is conditional on the ETag that was read (`If-Match`, or
+`If-None-Match: *` for a new dataset), so when two writers race exactly one of them succeeds
+and the other rebuilds its update from the newer version.
+
+Compaction helpers (`plan_compaction`, `keep_latest`, `expired_tombstones`) pick the small files
+of settled partitions, merge them keeping the latest row per natural key, and find the replaced
+objects that are old enough to delete.
+"""
+
+import datetime as dt
+import functools
+import hashlib
+import inspect
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+MANIFEST_NAME = "_manifest.json"
+
+# manifest rebuilds after a concurrent writer replaced it under us
+MANIFEST_RETRIES = 5
+
+# error codes of a conditional PUT whose precondition no longer holds
+PRECONDITION_CODES = ("PreconditionFailed", "ConditionalRequestConflict", "NoSuchKey")
+
+# leading parameters of the private `Minio._put_object` the conditional PUT goes through
+# (requirements.txt pins the minio release it was written against)
+PUT_OBJECT_PARAMETERS = ["bucket_name", "object_name", "data", "headers"]
+
+
+def dataset_root(product: str, subject: str) -> str:
+    return f"{product}/{subject}"
+
+
+def manifest_path(product: str, subject: str) -> str:
+    return f"{dataset_root(product, subject)}/{MANIFEST_NAME}"
+
+
+def partition_values(source_method: str, timestamps: dict) -> dict:
+    """
+    Partition columns of a run, in path order.
+    """
+    return {
+        "source_method": source_method,
+        "year": timestamps["_YEAR_DATA_TIMESTAMP"],
+        "month": timestamps["_MONTH_DATA_TIMESTAMP"],
+        "day": timestamps["_DAY_DATA_TIMESTAMP"],
+    }
+
+
+def partition_path(product: str, subject: str, partition: dict, filename: str) -> str:
+    """
+    "datto_rmm/devices/source_method=api/year=2024/month=01/day=31/<filename>"
+    """
+    keys = "/".join(f"{key}={value}" for key, value in partition.items())
+    return f"{dataset_root(product, subject)}/{keys}/{filename}"
+
+
+def schema_hash(data) -> str:
+    """
+    Short hash of column names and Arrow types (pandas metadata excluded).
+    """
+    schema = data.schema if isinstance(data, pa.Table) else pa.Schema.from_pandas(data, preserve_index=False)
+    return hashlib.sha256(schema.remove_metadata().to_string().encode()).hexdigest()[:16]
+
+
+def json_value(value):
+    """
+    Converts numpy / pandas / Arrow scalars to JSON-safe values (timestamps as ISO strings).
+    """
+    if isinstance(value, pa.Scalar):
+        value = value.as_py()
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (pd.Timestamp, dt.datetime, dt.date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def column_stats(data, columns: list) -> dict:
+    """
+    Min / max of the given columns, skipping missing columns and types without an order.
+    """
+    names = data.column_names if isinstance(data, pa.Table) else data.columns
+    stats = {}
+    for column in columns or []:
+        if column not in names:
+            continue
+        try:
+            if isinstance(data, pa.Table):
+                result = pc.min_max(data[column])
+                low, high = result["min"], result["max"]
+            else:
+                values = data[column].dropna()
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    values = values.astype(values.cat.categories.dtype)
+                low, high = (values.min(), values.max()) if len(values) else (None, None)
+        except (TypeError, ValueError, pa.ArrowNotImplementedError):
+            continue
+        stats[column] = {"min": json_value(low), "max": json_value(high)}
+    return stats
+
+
+def read_manifest(client, bucket: str, product: str, subject: str) -> tuple:
+    """
+    Returns (manifest, etag). A dataset without a manifest yet gives an empty one and etag None.
+    """
+    response = None
+    try:
+        response = client.get_object(bucket, manifest_path(product, subject))
+        # quotes stripped like `stat_object(...).etag`, write_manifest quotes it again for If-Match
+        return json.loads(response.read()), response.headers.get("ETag", "").replace('"', "")
+    except Exception as e:
+        if getattr(e, "code", None) != "NoSuchKey":
+            raise
+        return {"product": product, "subject": subject, "version": 0, "schema_hash": None, "files": [],
+                "tombstones": []}, None
+    finally:
+        if response is not None:
+            response.close()
+            response.release_conn()
+
+
+def conditional_put(client):
+    """
+    The plain PutObject call of the client, which sends the If-Match / If-None-Match headers as they are.
+
+    Raises:
+        RuntimeError: The installed minio has no `_put_object` with the expected parameters.
+    """
+    put_object = getattr(client, "_put_object", None)
+    parameters = list(inspect.signature(put_object).parameters)[:len(PUT_OBJECT_PARAMETERS)] \
+        if callable(put_object) else None
+    if parameters != PUT_OBJECT_PARAMETERS:
+        raise RuntimeError(f"{type(client).__name__}._put_object({', '.join(PUT_OBJECT_PARAMETERS)}) is not "
+                           f"available (found {parameters}), install the minio version pinned in requirements.txt")
+    return put_object
+
+
+def write_manifest(client, bucket: str, manifest: dict, etag: str = None) -> bool:
+    """
+    Writes the manifest only if the stored one is still the version that was read.
+
+    Args:
+        etag (str): ETag of the manifest that was read, None when there was none.
+
+    Returns:
+        bool: False when another writer replaced (or created) the manifest first.
+
+    Raises:
+        RuntimeError: The client cannot send a conditional PUT (see `conditional_put`).
+    """
+    put_object = conditional_put(client)
+    body = json.dumps(manifest, indent=1).encode()
+    headers = {"Content-Type": "application/json"}
+    if etag:
+        headers["If-Match"] = f'"{etag}"'
+    else:
+        headers["If-None-Match"] = "*"
+
+    try:
+        # put_object sends unknown headers as user metadata, the conditions need the plain PutObject call
+        put_object(bucket_name=bucket, object_name=manifest_path(manifest["product"], manifest["subject"]),
+                   data=body, headers=headers)
+        return True
+    except Exception as e:
+        if getattr(e, "code", None) not in PRECONDITION_CODES:
+            raise
+        return False
+
+
+def update_manifest(client, bucket: str, product: str, subject: str, add: list = None, remove: list = None,
+                    purge: list = None) -> dict:
+    """
+    Adds and/or removes file entries and writes the next manifest version.
+
+    Args:
+        client (minio.Minio): Storage client.
+        bucket (str): Bucket holding the dataset.
+        product (str): Dataset product.
+        subject (str): Dataset subject.
+        add (list): File entries to add (an entry with an existing path replaces it).
+        remove (list): Paths to drop, tombstoned until their objects are deleted.
+        purge (list): Tombstoned paths whose objects were deleted.
+
+    Returns:
+        dict: The manifest that was written.
+    """
+    add = add or []
+    remove = set(remove or [])
+    purge = set(purge or [])
+
+    for _ in range(MANIFEST_RETRIES):
+        manifest, etag = read_manifest(client, bucket, product, subject)
+
+        replaced = remove | {entry["path"] for entry in add}
+        files = [entry for entry in manifest["files"] if entry["path"] not in replaced] + add
+        files.sort(key=lambda entry: (entry.get("extracted_at") or "", entry["path"]))
+
+        now = dt.datetime.now(dt.timezone.utc).isoformat()
+        tombstones = [
+            tombstone for tombstone in manifest.get("tombstones", [])
+            if tombstone["path"] not in purge
+        ] + [{"path": entry["path"], "removed_at": now} for entry in manifest["files"] if entry["path"] in remove]
+
+        manifest = {
+            **manifest,
+            "version": manifest["version"] + 1,
+            "updated_at": now,
+            "schema_hash": files[-1]["schema_hash"] if files else None,
+            "files": files,
+            "tombstones": tombstones,
+        }
+
+        # the store checks the ETag and writes in one step, a lost race rebuilds on top of the newer version
+        if write_manifest(client, bucket, manifest, etag):
+            return manifest
+
+    raise RuntimeError(f"Manifest for {product}/{subject} changed during {MANIFEST_RETRIES} update attempts")
+
+
+def file_entry(path: str, data, partition: dict, size: int, extracted_at: str, stats_columns: list = None,
+               etag: str = None) -> dict:
+    """
+    Builds the manifest entry for one uploaded file. `etag` is the upload's ETag, readers key their
+    local copies on it without asking the store.
+    """
+    return {
+        "path": path,
+        "partition": partition,
+        "rows": len(data) if not isinstance(data, pa.Table) else data.num_rows,
+        "bytes": size,
+        "etag": etag,
+        "extracted_at": extracted_at,
+        "schema_hash": schema_hash(data),
+        "stats": column_stats(data, stats_columns),
+    }
+
+
+def partition_date(partition: dict):
+    """
+    Date of a year/month/day partition, None for partitions without one.
+    """
+    try:
+        return dt.date(int(partition["year"]), int(partition["month"]), int(partition["day"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def plan_compaction(manifest: dict, small_file_bytes: int, min_files: int, min_age_days: int, today=None) -> list:
+    """
+    Groups the small files of settled partitions for compaction.
+
+    Files are grouped by partition and schema hash (a schema change starts a new group) and a
+    group is returned once it holds `min_files` files under `small_file_bytes`. Partitions newer
+    than `min_age_days` still receive runs and are left alone.
+
+    Returns:
+        list: Groups of manifest entries, each ordered by extraction time.
+    """
+    today = today or dt.datetime.now(dt.timezone.utc).date()
+    groups = {}
+    for entry in manifest["files"]:
+        day = partition_date(entry["partition"])
+        if entry["bytes"] >= small_file_bytes or day is None or (today - day).days < min_age_days:
+            continue
+        key = (json.dumps(entry["partition"], sort_keys=True), entry["schema_hash"])
+        groups.setdefault(key, []).append(entry)
+
+    return [
+        sorted(entries, key=lambda entry: (entry.get("extracted_at") or "", entry["path"]))
+        for entries in groups.values() if len(entries) >= min_files
+    ]
+
+
+def keep_latest(table: pa.Table, key_columns: list) -> pa.Table:
+    """
+    Keeps the last row per natural key of a table whose rows are in load order.
+    Rows with a missing key are all kept.
+    """
+    if not key_columns or table.num_rows == 0:
+        return table
+
+    row_number = "__row_number"
+    table = table.append_column(row_number, pa.array(np.arange(table.num_rows)))
+
+    has_key = functools.reduce(pc.and_, [pc.is_valid(table[column]) for column in key_columns])
+    keyed = table.filter(has_key)
+
+    latest = keyed.group_by(key_columns, use_threads=False).aggregate([(row_number, "max")])[f"{row_number}_max"]
+    keep = pc.or_(pc.invert(has_key), pc.is_in(table[row_number], value_set=latest))
+    return table.filter(keep).drop_columns([row_number])
+
+
+def expired_tombstones(manifest: dict, retention_hours: float, now=None) -> list:
+    """
+    Paths tombstoned more than `retention_hours` ago, whose objects no reader needs anymore.
+    """
+    now = now or dt.datetime.now(dt.timezone.utc)
+    cutoff = (now - dt.timedelta(hours=retention_hours)).isoformat()
+    return [tombstone["path"] for tombstone in manifest.get("tombstones", []) if tombstone["removed_at"] <= cutoff]
@@ -0,0 +1,199 @@
+"""
+Upload Stream Utility
+
+Serializes a DataFrame (or Arrow table) chunk by chunk into a bounded in-memory pipe that an
+object storage client reads from as an upload stream of unknown length:
+
+    stream_upload(df, "parquet", upload=lambda stream: client.put_object(..., data=stream, length=-1, part_size=...))
+
+- parquet: one row group per chunk, laid out by `parquet_mgr`
+- csv: header once, then one CSV block per chunk
+- json: a single records array, written one chunk of records at a time
+
+The serializer runs in a background thread, so encoding overlaps the multipart upload and
+memory stays bounded by the pipe depth plus the client's part buffer instead of two full
+copies of the file.
+"""
+
+import queue
+import threading
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from .parquet_mgr import parquet_settings, write_parquet
+
+# rows serialized per chunk (parquet row group / csv block / json records slice)
+CHUNK_ROWS = 100_000
+
+# serialized chunks buffered between the writer thread and the upload
+PIPE_DEPTH = 8
+
+
+class UploadStream:
+    """
+    Bounded, thread-safe pipe: the writer side is a file-like sink for the serializers and the
+    reader side is the `data` object handed to the upload client (`read(size)`).
+    """
+
+    __EOF = object()
+
+    def __init__(self, depth: int = PIPE_DEPTH) -> None:
+        self.__queue = queue.Queue(maxsize=depth)
+        self.__buffer = bytearray()
+        self.__eof = False
+        self.__cancelled = threading.Event()
+        self.__error = None
+        self.closed = False
+        self.bytes_written = 0
+
+    # ---- writer side -------------------------------------------------
+
+    def write(self, data) -> int:
+        if self.__cancelled.is_set():
+            raise IOError("Upload stream cancelled by the reader")
+
+        chunk = bytes(data)
+        if chunk:
+            self.__put(chunk)
+            self.bytes_written += len(chunk)
+        return len(chunk)
+
+    def flush(self) -> None:
+        pass
+
+    def writable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.__put(self.__EOF)
+
+    def fail(self, error: BaseException) -> None:
+        """
+        Ends the stream with an error, raised to the reader instead of a truncated EOF.
+        """
+        self.__error = error
+        self.close()
+
+    # ---- reader side -------------------------------------------------
+
+    def read(self, size: int = -1) -> bytes:
+        while not self.__eof and (size < 0 or len(self.__buffer) < size):
+            chunk = self.__queue.get()
+            if chunk is self.__EOF:
+                self.__eof = True
+                if self.__error is not None:
+                    raise IOError("Upload stream serialization failed") from self.__error
+            else:
+                self.__buffer += chunk
+
+        size = len(self.__buffer) if size < 0 else min(size, len(self.__buffer))
+        data = bytes(self.__buffer[:size])
+        del self.__buffer[:size]
+        return data
+
+    def cancel(self) -> None:
+        """
+        Stops the writer (its next write raises) and drains the pipe so it is not left blocked.
+        """
+        self.__cancelled.set()
+        try:
+            while True:
+                self.__queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def __put(self, item) -> None:
+        while not self.__cancelled.is_set():
+            try:
+                self.__queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+def write_chunks(data, sink, file_type: str, chunk_rows: int = CHUNK_ROWS, parquet: dict = None) -> int:
+    """
+    Serializes `data` into `sink` chunk by chunk.
+
+    Args:
+        data (pd.DataFrame | pa.Table): Rows to serialize.
+        sink: Writable file-like object.
+        file_type (str): "parquet", "csv" or "json".
+        chunk_rows (int): Rows per chunk.
+        parquet (dict): Parquet settings from `parquet_settings` (row_group_size overrides chunk_rows).
+
+    Returns:
+        int: Number of chunks written.
+    """
+    is_table = isinstance(data, pa.Table)
+    starts = range(0, max(len(data), 1), chunk_rows)
+
+    def chunk(start: int):
+        return data.slice(start, chunk_rows) if is_table else data.iloc[start:start + chunk_rows]
+
+    if file_type == "parquet":
+        return write_parquet(data, sink, parquet or parquet_settings(), chunk_rows)
+
+    elif file_type == "csv":
+        if is_table:
+            with pa_csv.CSVWriter(sink, data.schema) as writer:
+                for start in starts:
+                    writer.write_table(chunk(start))
+        else:
+            for start in starts:
+                sink.write(chunk(start).to_csv(index=False, header=start == 0).encode())
+
+    elif file_type == "json":
+        # no native Arrow JSON writer, records go through pandas like the buffered path
+        sink.write(b"[")
+        first = True
+        for start in starts:
+            part = chunk(start)
+            records = (part.to_pandas() if is_table else part).to_json(orient="records")[1:-1]
+            if records:
+                sink.write((records if first else "," + records).encode())
+                first = False
+        sink.write(b"]")
+
+    else:
+        raise ValueError("Unsupported file type for MinIO upload")
+
+    return len(starts)
+
+
+def stream_upload(data, file_type: str, upload, chunk_rows: int = CHUNK_ROWS, parquet: dict = None) -> dict:
+    """
+    Serializes `data` in a background thread while `upload(stream)` consumes it.
+
+    Args:
+        data (pd.DataFrame | pa.Table): Rows to upload.
+        file_type (str): "parquet", "csv" or "json".
+        upload (callable): Receives the readable stream, e.g. a `put_object` call with `length=-1`.
+        chunk_rows (int): Rows per serialized chunk.
+        parquet (dict): Parquet settings from `parquet_settings`.
+
+    Returns:
+        dict: {"bytes": serialized size, "chunks": chunks written}
+    """
+    stream = UploadStream()
+    outcome = {}
+
+    def serialize() -> None:
+        try:
+            outcome["chunks"] = write_chunks(data, stream, file_type, chunk_rows, parquet)
+            stream.close()
+        except BaseException as e:
+            stream.fail(e)
+
+    writer = threading.Thread(target=serialize, name="upload-stream-writer", daemon=True)
+    writer.start()
+    try:
+        upload(stream)
+    finally:
+        stream.cancel()
+        writer.join()
+
+    return {"bytes": stream.bytes_written, "chunks": outcome.get("chunks", 0)}
@@ -5,6 +5,8 @@ Handles:
 - Secure secret injection from Vault
 - API pagination for raw product data
 - Normalized extraction of Windows and Windows Server EOL records
+- Concurrent extraction of a configured product set (or all products) into one lifecycle table,
+  revalidated against a local TTL cache with ETag / If-Modified-Since
 
 Returns structured pandas DataFrames with lifecycle metadata.
 """
@@ -19,8 +21,19 @@ import hvac
 import inspect
 import traceback
 import sys
+import concurrent.futures
 from loguru import logger
 
+from .response_cache import ResponseCache
+
+# endoflife.date fields holding either a date or a boolean
+LIFECYCLE_DATE_FIELDS = {
+    'support': 'support_date',
+    'eol': 'eol_date',
+    'extendedSupport': 'extended_support_date',
+    'discontinued': 'discontinued_date',
+}
+
 
 class ExtractApiEndOfLifeDate:
     """
@@ -211,3 +224,144 @@ class ExtractApiEndOfLifeDate:
                     "message": t
                 }
             }
+
+    @staticmethod
+    def __conditional_get(url: str, key: str, cache: ResponseCache) -> dict:
+        """
+        GET wrapper backed by the on-disk response cache.
+        Serves fresh entries from disk, revalidates stale ones and stores new bodies.
+
+        Returns:
+            dict: {"data": parsed JSON, "changed": bool, "source": "cache" | "not_modified" | "download"}
+        """
+        entry = cache.load(key)
+        if entry and cache.is_fresh(entry["meta"]):
+            return {"data": json.loads(entry["body"]), "changed": False, "source": "cache"}
+
+        headers = {"Content-Type": "application/json"}
+        if entry:
+            headers.update(cache.conditional_headers(entry["meta"]))
+
+        logger.info(f"Requesting URL: {url}")
+        resp = requests.get(url, headers=headers, timeout=30)
+
+        if resp.status_code == 304 and entry:
+            cache.refresh(key, entry["meta"])
+            return {"data": json.loads(entry["body"]), "changed": False, "source": "not_modified"}
+
+        resp.raise_for_status()
+        cache.store(key, resp.content, etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"))
+        return {"data": json.loads(resp.content.decode('utf-8')), "changed": True, "source": "download"}
+
+    @staticmethod
+    def __lifecycle_frame(product: str, records: list) -> pd.DataFrame:
+        """
+        Normalizes one product's release cycles into the shared lifecycle schema.
+        Date-or-boolean fields are split into a date column plus the boolean where no date is given.
+        """
+        df = pd.DataFrame({
+            'product': product,
+            'cycle': [str(r.get('cycle')) for r in records],
+            'release_label': [r.get('releaseLabel') for r in records],
+            'codename': [r.get('codename') for r in records],
+            'release_date': [r.get('releaseDate') for r in records],
+            'latest': [None if r.get('latest') is None else str(r.get('latest')) for r in records],
+            'latest_release_date': [r.get('latestReleaseDate') for r in records],
+            'is_lts': [bool(r.get('lts', False)) for r in records],
+            'link': [r.get('link') for r in records],
+        }, dtype=object)
+
+        for column in ['release_date', 'latest_release_date']:
+            df[column] = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce')
+
+        for field, column in LIFECYCLE_DATE_FIELDS.items():
+            values = pd.Series([r.get(field) for r in records], dtype=object)
+            is_flag = values.map(lambda v: isinstance(v, bool))
+            df[column] = pd.to_datetime(values.where(~is_flag, None), format='%Y-%m-%d', errors='coerce')
+
+            if field == 'eol':
+                # the boolean eol flag, rows with an eol date get theirs from eol_status
+                df['is_eol'] = values.where(is_flag, False).astype(bool)
+
+        return ExtractApiEndOfLifeDate.eol_status(df)
+
+    @staticmethod
+    def eol_status(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Derives is_eol for today: a cycle with an eol date is end of life once that date has passed,
+        one without keeps its boolean eol flag. Runs on every frame served from the cache as well,
+        so a cached cycle turns end of life when its date passes, not when its body changes.
+        """
+        today = pd.Timestamp(dt.date.today())
+        eol_date = pd.to_datetime(df['eol_date'])
+        df['is_eol'] = (eol_date.isna() & df['is_eol'].astype(bool)) | (eol_date <= today)
+        return df
+
+    def create_products_dataframe(self) -> dict:
+        """
+        Fetches the configured products (DATA.products, a list of endoflife.date product names or
+        "all") concurrently and combines them into one normalized lifecycle table.
+        Products unchanged since the last run are served from the local cache without re-normalizing.
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            cache = ResponseCache(cache_dir=self.__data.get("cache_dir", "/tmp/end_of_life_date"),
+                                  ttl_seconds=self.__data.get("cache_ttl", 3600))
+            base_url = f'{self.__secrets["base_uri"]}/api'
+
+            products = self.__data.get("products", "all")
+            if products == "all":
+                products = self.__conditional_get(f'{base_url}/all.json', "all", cache)["data"]
+
+            def fetch(product: str) -> tuple:
+                response = self.__conditional_get(f'{base_url}/{product}.json', product, cache)
+                if not response["changed"]:
+                    df = cache.load_frame(product)
+                    if df is not None:
+                        return response["source"], self.eol_status(df)
+
+                df = self.__lifecycle_frame(product, response["data"])
+                cache.store_frame(product, df)
+                return response["source"], df
+
+            frames, sources, failed = [], {}, []
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.__data.get("max_workers", 8)) as executor:
+                futures = {executor.submit(fetch, product): product for product in products}
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        source, df = future.result()
+                        sources[source] = sources.get(source, 0) + 1
+                        frames.append(df)
+                    except Exception:
+                        failed.append(futures[future])
+                        logger.error(f'{futures[future]}: {traceback.format_exc()}')
+
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            if not df.empty:
+                df = df.sort_values(['product', 'release_date'], ascending=[True, False], ignore_index=True)
+
+            return {
+                "data": df,
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 200 if not failed else 207,
+                    "products": len(products),
+                    "products_downloaded": sources.get("download", 0),
+                    "products_cached": sources.get("cache", 0) + sources.get("not_modified", 0),
+                    "products_failed": failed,
+                    "message": "DataFrame created successfully"
+                }
+            }
+
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            return {
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 500,
+                    "message": t
+                }
+            }
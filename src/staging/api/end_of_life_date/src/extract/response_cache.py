@@ -0,0 +1,99 @@
+"""
+On-disk HTTP response cache for the endoflife.date extractor.
+
+Each cached endpoint keeps three files under `cache_dir`, keyed by product:
+- `<key>.json`       raw response body
+- `<key>.meta.json`  ETag, Last-Modified and the time the body was last confirmed current
+- `<key>.parquet`    normalized lifecycle rows built from that body
+
+Within `ttl_seconds` of the last confirmation a product is served from disk without a request.
+After that the extractor revalidates with If-None-Match / If-Modified-Since, and a 304 only
+refreshes the timestamp, so unchanged products skip both the download and the re-normalization.
+Files are written to a temp file and renamed into place so concurrent workers never read a partial file.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+
+import pandas as pd
+
+
+class ResponseCache:
+    """
+    TTL cache of API response bodies and their normalized frames, stored on local disk.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: int = 3600) -> None:
+        self.__cache_dir = cache_dir
+        self.__ttl_seconds = ttl_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def __path(self, key: str, extension: str) -> str:
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]', '_', key)
+        return os.path.join(self.__cache_dir, f"{safe_key}.{extension}")
+
+    def __write_atomic(self, path: str, payload: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.__cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                stream.write(payload)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, key: str) -> dict | None:
+        """Returns {"meta": {...}, "body": bytes} for a cached key, or None."""
+        try:
+            with open(self.__path(key, "meta.json"), "r") as stream:
+                meta = json.load(stream)
+            with open(self.__path(key, "json"), "rb") as stream:
+                body = stream.read()
+            return {"meta": meta, "body": body}
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, meta: dict) -> bool:
+        """True while the body was confirmed current less than `ttl_seconds` ago."""
+        return time.time() - meta.get("fetched_at", 0) < self.__ttl_seconds
+
+    @staticmethod
+    def conditional_headers(meta: dict) -> dict:
+        """Builds the revalidation headers for a cached response."""
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(self, key: str, body: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+        """Saves a downloaded body and its validators; any frame built from the old body is dropped."""
+        if os.path.exists(self.__path(key, "parquet")):
+            os.remove(self.__path(key, "parquet"))
+
+        self.__write_atomic(self.__path(key, "json"), body)
+        self.__write_atomic(self.__path(key, "meta.json"), json.dumps({
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }).encode("utf-8"))
+
+    def refresh(self, key: str, meta: dict) -> None:
+        """Marks a cached body as current again after a 304 Not Modified."""
+        self.__write_atomic(self.__path(key, "meta.json"), json.dumps({**meta, "fetched_at": time.time()}).encode("utf-8"))
+
+    def load_frame(self, key: str) -> pd.DataFrame | None:
+        """Returns the normalized frame cached for a key, or None."""
+        try:
+            return pd.read_parquet(self.__path(key, "parquet"))
+        except (OSError, ValueError):
+            return None
+
+    def store_frame(self, key: str, df: pd.DataFrame) -> None:
+        """Saves the normalized frame built from the current body."""
+        self.__write_atomic(self.__path(key, "parquet"), df.to_parquet(index=False))
@@ -7,14 +7,20 @@
 ########################################################
 
 import os
-from minio import Minio
 from io import BytesIO
-import re
 import traceback
 import hvac
-import ssl
 import inspect
-import urllib3
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from utilities.connection_mgr import ConnectionRegistry
+from utilities.upload_stream_mgr import stream_upload, CHUNK_ROWS
+from utilities.parquet_mgr import parquet_settings, write_parquet
+from utilities.dataset_mgr import partition_values, partition_path, file_entry, update_manifest
+
+# bytes per multipart part on streamed uploads (S3/MinIO minimum is 5 MiB)
+PART_SIZE = 16 * 1024 * 1024
 
 
 class MinioLoad:
@@ -22,7 +28,7 @@ class MinioLoad:
     MinioLoad handles secure file uploads to MinIO using configuration from Vault.
 
     Attributes:
-        df_input (pd.DataFrame): DataFrame to upload
+        df_input (pd.DataFrame | pa.Table): DataFrame (or Arrow table on the Arrow data path) to upload
         config (dict): Task configuration from YAML
         vault (VaultManager): Initialized Vault client to retrieve secrets
     """
@@ -49,14 +55,13 @@ class MinioLoad:
         """
         try:
             ca_cert_path = os.environ.get('SSL_CERT_FILE', '/prefect/ca.crt')
-            context = ssl.create_default_context(cafile=ca_cert_path)
 
-            minio_client = Minio(
-                endpoint=re.sub("https?://", "", self.__secrets["url"]),
-                secure=True,
+            # client, SSL context and connection pool are shared across tasks in the worker process
+            minio_client = ConnectionRegistry().get_minio_client(
+                url=self.__secrets["url"],
                 access_key=self.__secrets["accessKey"],
                 secret_key=self.__secrets["secretKey"],
-                http_client=urllib3.PoolManager(ssl_context=context)
+                cafile=ca_cert_path
             )
 
             return {
@@ -93,6 +98,10 @@ class MinioLoad:
 
         filename = ("_".join(filename_details)) + f'.{self.__data["destination"]["file_type"]}'
 
+        if self.__data["destination"].get("layout") == "hive":
+            partition = partition_values(self.__data["source_method"], self.__timestamps)
+            return partition_path(self.__details["product"], self.__details["subject"], partition, filename)
+
         bucket_location_details = [
             self.__details["product"],
             self.__details["subject"],
@@ -107,6 +116,25 @@ class MinioLoad:
 
         return bucket_location
 
+    def __serialize_table__(self, file_type: str):
+        """
+        Serializes an Arrow table straight from its buffers, without a pandas conversion.
+
+        Returns:
+            pa.Buffer: Encoded file contents.
+        """
+        sink = pa.BufferOutputStream()
+
+        if file_type == "csv":
+            pa_csv.write_csv(self.__df_input, sink)
+        elif file_type == "json":
+            # no native Arrow JSON writer, records go through pandas like the DataFrame path
+            sink.write(str.encode(self.__df_input.to_pandas().to_json(orient="records")))
+        else:
+            raise ValueError("Unsupported file type for MinIO upload")
+
+        return sink.getvalue()
+
     def upload_to_minio(self):
         """
         Uploads the DataFrame to MinIO as the configured file format (parquet, csv, or json).
@@ -120,30 +148,84 @@ class MinioLoad:
             data = self.__create_minio_client__()
             minio_client = data["data"]
             minio_object = self.__create_upload_details__()
-
-            if self.__data["destination"]["file_type"] == "parquet":
-                flat_file = self.__df_input.to_parquet(index=False)
-            elif self.__data["destination"]["file_type"] == "csv":
-                flat_file = self.__df_input.to_csv(index=False).encode()
-            elif self.__data["destination"]["file_type"] == "json":
-                flat_file = str.encode(self.__df_input.to_json(orient="records"))
+            destination = self.__data["destination"]
+            file_type = destination["file_type"]
+            parquet = parquet_settings(destination.get("parquet"))
+
+            # put_object result, its ETag goes into the manifest entry
+            written = {}
+            if destination.get("streaming", False):
+                # multipart upload of unknown length fed chunk by chunk while serialization runs
+                part_size = destination.get("part_size", PART_SIZE)
+                upload = stream_upload(
+                    data=self.__df_input,
+                    file_type=file_type,
+                    upload=lambda stream: written.update(object=minio_client.put_object(
+                        bucket_name=destination["bucket"],
+                        object_name=minio_object,
+                        data=stream,
+                        length=-1,
+                        part_size=part_size,
+                        content_type=f'application/{file_type}'
+                    )),
+                    chunk_rows=destination.get("chunk_rows", CHUNK_ROWS),
+                    parquet=parquet
+                )
             else:
-                raise ValueError("Unsupported file type for MinIO upload")
-
-            minio_client.put_object(
-                bucket_name=self.__data["destination"]["bucket"],
-                object_name=minio_object,
-                data=BytesIO(flat_file),
-                length=len(flat_file),
-                content_type=f'application/{self.__data["destination"]["file_type"]}'
-            )
+                chunks = 1
+                if file_type == "parquet":
+                    # DataFrames and Arrow tables are written with the configured layout
+                    sink = pa.BufferOutputStream()
+                    chunks = write_parquet(self.__df_input, sink, parquet)
+                    flat_file = sink.getvalue()
+                elif isinstance(self.__df_input, pa.Table):
+                    flat_file = self.__serialize_table__(file_type)
+                elif file_type == "csv":
+                    flat_file = self.__df_input.to_csv(index=False).encode()
+                elif file_type == "json":
+                    flat_file = str.encode(self.__df_input.to_json(orient="records"))
+                else:
+                    raise ValueError("Unsupported file type for MinIO upload")
+
+                length = flat_file.size if isinstance(flat_file, pa.Buffer) else len(flat_file)
+                written["object"] = minio_client.put_object(
+                    bucket_name=destination["bucket"],
+                    object_name=minio_object,
+                    data=pa.BufferReader(flat_file) if isinstance(flat_file, pa.Buffer) else BytesIO(flat_file),
+                    length=length,
+                    content_type=f'application/{file_type}'
+                )
+                upload = {"bytes": length, "chunks": chunks}
+
+            if destination.get("layout") == "hive":
+                # index the new file so readers can prune without listing the bucket
+                manifest = update_manifest(
+                    client=minio_client,
+                    bucket=destination["bucket"],
+                    product=self.__details["product"],
+                    subject=self.__details["subject"],
+                    add=[file_entry(
+                        path=minio_object,
+                        data=self.__df_input,
+                        partition=partition_values(self.__data["source_method"], self.__timestamps),
+                        size=upload["bytes"],
+                        extracted_at=self.__timestamps["_IN_DATA_TIMESTAMP"],
+                        stats_columns=destination.get("stats_columns") or parquet["sort_by"],
+                        etag=written["object"].etag
+                    )]
+                )
+                upload["manifest_version"] = manifest["version"]
 
             return {
                 "data": minio_object,
                 "result": {
                     "job_title": self.__details["task_title"],
                     "status_code": 200,
-                    "file_format": self.__data["destination"]["file_type"],
+                    "file_format": file_type,
+                    "layout": destination.get("layout", "date"),
+                    "streaming": destination.get("streaming", False),
+                    **upload,
+                    **({"parquet": parquet} if file_type == "parquet" else {}),
                     "message": "File uploaded to MinIO",
                 }
             }
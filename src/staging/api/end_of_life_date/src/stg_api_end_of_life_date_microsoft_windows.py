@@ -4,7 +4,7 @@ Microsoft Windows End of Life ETL Flow
 This flow:
 1. Extracts workstation and server EOL data via public API
 2. Transforms the combined data into a normalized schema
-3. Loads results into PostgreSQL
+3. Loads results into MinIO (hive dataset read by the DuckDB marts) and PostgreSQL
 """
 
 from prefect import flow, task
@@ -16,9 +16,11 @@ from load.load_postgres import *
 from utilities.setup_logger import *
 from utilities.task_prep import *
 from utilities.vault_mgr import *
+from utilities.partition_mgr import run_partitioned
 
 from extract.extract_api_end_of_life_date import *
 from transform.transform_api_end_of_life_date_microsoft_windows import *
+from transform.transform_api_end_of_life_date_microsoft_windows_polars import TransformApiEndOfLifeDatePolars
 
 import sys
 import os
@@ -104,8 +106,15 @@ def transform_dataframe(df_workstation, df_server, config: dict) -> pd.DataFrame
     """
     try:
         df = pd.concat([df_workstation, df_server], ignore_index=True)
-        transform = TransformApiEndOfLifeDate(df)
-        data = transform.transform_microsoft_windows_dataframe()
+        if config["DATA"].get("backend", "pandas") == "polars":
+            # polars runs the lazy plan multi-threaded itself, the process pool only serves the pandas backend
+            data = TransformApiEndOfLifeDatePolars(
+                df, streaming=config["DATA"].get("streaming", False), editions=config["DATA"].get("editions")
+            ).transform_microsoft_windows_dataframe()
+        else:
+            data = run_partitioned(TransformApiEndOfLifeDate, df, "transform_microsoft_windows_dataframe",
+                                   partitions=config["DATA"].get("partitions", 1),
+                                   editions=config["DATA"].get("editions"))
         result = data["result"]
         df = data["data"]
         results_list.append(result)
@@ -123,6 +132,28 @@ def transform_dataframe(df_workstation, df_server, config: dict) -> pd.DataFrame
         sys.exit(1)
 
 
+@task(tags=["load", "put", "object_storage", "minio"])
+def load_minio(df: pd.DataFrame, config: dict, vault: VaultManager) -> None:
+    """
+    Uploads the transformed EOL data to MinIO object storage.
+    """
+    try:
+        minio = MinioLoad(df_input=df, config=config, vault=vault)
+        data = minio.upload_to_minio()
+        result = data["result"]
+        results_list.append(result)
+
+    except Exception:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+        results_list.append(result)
+        print(t)
+
+
 @task(tags=["load", "put", "database", "postgresql"])
 def load_postgres(df: pd.DataFrame, config: dict, vault: VaultManager) -> None:
     """
@@ -152,7 +183,7 @@ def stg_api_end_of_life_date_microsoft_windows() -> None:
     Main flow to orchestrate EOL date processing:
     - Extract workstation and server data
     - Transform into normalized schema
-    - Load into PostgreSQL
+    - Load to MinIO and PostgreSQL
     """
     print(f"[INFO] Current working directory: {os.getcwd()}")
 
@@ -163,7 +194,8 @@ def stg_api_end_of_life_date_microsoft_windows() -> None:
     df_server = extract_api_end_of_life_date_microsoft_windows_server(config=tasks[1], vault=vault)
 
     df = transform_dataframe(df_workstation=df_workstation, df_server=df_server, config=tasks[2])
-    load_postgres(df=df, config=tasks[3], vault=vault)
+    load_minio(df=df, config=tasks[3], vault=vault)
+    load_postgres(df=df, config=tasks[4], vault=vault)
 
     print("#" * 75)
     print("\n        FINAL RESULTS\n")
@@ -0,0 +1,139 @@
+"""
+End of Life Products ETL Flow
+
+This flow:
+1. Extracts the configured endoflife.date products concurrently via public API
+   (unchanged products are served from the local response cache)
+2. Loads the combined lifecycle table into MinIO and PostgreSQL in parallel
+"""
+
+from prefect import flow, task
+from prefect.artifacts import *
+
+from load.load_minio import *
+from load.load_postgres import *
+
+from utilities.setup_logger import *
+from utilities.task_prep import *
+from utilities.vault_mgr import *
+
+from extract.extract_api_end_of_life_date import *
+
+import sys
+import os
+import inspect
+import traceback
+import concurrent.futures
+import pandas as pd
+from pathlib import Path
+import json
+
+results_list = []
+
+
+@task(tags=["extract", "get", "api", "batch"])
+def extract_api_end_of_life_date_products(config: dict, vault: VaultManager) -> pd.DataFrame:
+    """
+    Extracts lifecycle data for the configured product set from the public API.
+    Returns one DataFrame with extracted data and metadata columns.
+    """
+    try:
+        extract = ExtractApiEndOfLifeDate(config=config, vault=vault)
+        data = extract.create_products_dataframe()
+        result = data["result"]
+        df = data["data"]
+
+        df['_SOURCE_PRODUCT'] = config["DETAILS"]["product"]
+        df['_SOURCE_SUBJECT'] = config["DETAILS"]["subject"]
+        df['_SOURCE_ORIGIN'] = config["DATA"]["origin"]
+        df['_UTC_EXTRACTION_DATETIME'] = config["TIMESTAMPS"]["_IN_DATA_TIMESTAMP"]
+
+        results_list.append(result)
+        return df
+
+    except Exception:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+        results_list.append(result)
+        print(t)
+        sys.exit(1)
+
+
+@task(tags=["load", "put", "object_storage", "minio"])
+def load_minio(df: pd.DataFrame, config: dict, vault: VaultManager) -> None:
+    """
+    Uploads the lifecycle table to MinIO object storage.
+    """
+    try:
+        minio = MinioLoad(df_input=df, config=config, vault=vault)
+        data = minio.upload_to_minio()
+        result = data["result"]
+        results_list.append(result)
+
+    except Exception:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+        results_list.append(result)
+        print(t)
+
+
+@task(tags=["load", "put", "database", "postgresql"])
+def load_postgres(df: pd.DataFrame, config: dict, vault: VaultManager) -> None:
+    """
+    Inserts the lifecycle table into a PostgreSQL table.
+    """
+    try:
+        postgres = PostgresLoad(df_input=df, config=config, vault=vault)
+        data = postgres.load_to_postgres()
+        result = data["result"]
+        results_list.append(result)
+
+    except Exception:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": t
+        }
+        results_list.append(result)
+        print(t)
+
+
+@flow
+def stg_api_end_of_life_date_products() -> None:
+    """
+    Main flow to orchestrate multi-product EOL processing:
+    - Extract all configured products concurrently
+    - Load to MinIO and PostgreSQL
+    """
+    print(f"[INFO] Current working directory: {os.getcwd()}")
+
+    tasks = prepare_tasks(config_dir=f"{Path(__file__).parent.resolve()}/config/products/config.yaml")["data"]
+    vault = VaultManager()
+
+    df = extract_api_end_of_life_date_products(config=tasks[0], vault=vault)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        future_minio = executor.submit(load_minio, df=df, config=tasks[1], vault=vault)
+        future_postgres = executor.submit(load_postgres, df=df, config=tasks[2], vault=vault)
+        concurrent.futures.wait([future_minio, future_postgres])
+
+    print("#" * 75)
+    print("\n        FINAL RESULTS\n")
+    print("--------------------------------")
+    for result in results_list:
+        print("\n" + json.dumps(result, indent=4))
+        print("---------")
+    print("\n" + "#" * 75)
+
+
+if __name__ == "__main__":
+    stg_api_end_of_life_date_products()
@@ -2,8 +2,8 @@
 Transform logic for Microsoft Windows End-of-Life (EOL) API records.
 
 This class performs:
-- Parsing of 'release_label' and 'cycle' into normalized version info
-- Duplication of rows for standard editions into workstation and enterprise
+- Column-wise parsing of 'release_label' and 'cycle' into normalized version info
+- Fan-out of standard editions into the configured editions (workstation, enterprise, standard)
 - Duplication of server LTSC rows to account for dual classification
 - Cleanup of redundant release columns
 
@@ -15,17 +15,39 @@ import traceback
 import inspect
 import sys
 import re
+import numpy as np
 import pandas as pd
 from loguru import logger
 
+# release_label: "<model> ..." (the first pattern requires a literal backslash and is kept for parity)
+RELEASE_MODEL_PATTERNS = [
+    re.compile(r"^(\d+\.?\d+?)\\s?.*"),
+    re.compile(r'^(\S+)(\s?|-?)'),
+]
+
+# cycle: "22h2" style builds, "-R2-" releases, else the leading 4 characters (e.g. a year)
+CYCLE_BUILD_PATTERN = re.compile(r"^(\d{2}[A-Z]\d).*")
+CYCLE_R2_PATTERN = re.compile(r"^.*-(R2)-?.*")
+CYCLE_YEAR_PATTERN = re.compile(r"^(\w{4}).*")
+SERVICE_PACK_PATTERN = re.compile(r"^.*SP(\d+).*")
+RELEASE_INFO_R2_PATTERN = re.compile(r'^(\w{4})-?.*')
+
+# Standard rows fan out into one row per edition, `suffix` is appended to the cycle
+DEFAULT_EDITIONS = [
+    {"edition": "Workstation", "suffix": "-w"},
+    {"edition": "Enterprise", "suffix": "-e"},
+    {"edition": "Standard", "suffix": "-s"},
+]
+
 
 class TransformApiEndOfLifeDate:
     """
     Applies transformation logic to Microsoft Windows EOL dataset.
     """
 
-    def __init__(self, df: pd.DataFrame) -> None:
+    def __init__(self, df: pd.DataFrame, editions: list | None = None) -> None:
         self.__df = df
+        self.__editions = editions or DEFAULT_EDITIONS
 
         self.transform_cycle_column()
         self.duplicate_standard_rows()
@@ -51,142 +73,96 @@ class TransformApiEndOfLifeDate:
 
     def transform_cycle_column(self) -> None:
         """
-        Parses 'release_label' and 'cycle' columns to extract structured fields:
+        Parses 'release_label' and 'cycle' columns column-wise to extract structured fields:
         - release_model
         - release_version
         - os_release_edition
         - service_pack
         - release_info
+
+        Each field is a vectorized extract per precompiled pattern, with `np.select` picking the
+        first pattern that matched in precedence order.
         """
-        def model(data_dict: dict = dict()) -> dict:
-            try:
-                model_dict = data_dict
-                _release_label = " " if data_dict.get('release_label') is None else data_dict.get('release_label')
-
-                result_1 = re.match(r"^(\d+\.?\d+?)\\s?.*", _release_label)
-                result_2 = re.match(r'^(\S+)(\s?|-?)', _release_label)
-
-                if result_1:
-                    model_dict['release_model'] = str(result_1.group(1))
-                elif result_2:
-                    model_dict['release_model'] = str(result_2.group(1))
-                else:
-                    model_dict['release_model'] = None
-
-                result = re.match(r".*\\s(\w{4})\\s.*", _release_label)
-                model_dict['release_version'] = str(result.group(1)) if result else None
-
-                try:
-                    result = re.match(r".*\\(([EWLTSIo]{1,3})\\).*", _release_label)
-                    model_dict['os_release_edition'] = result.group(1)
-                except Exception:
-                    model_dict['os_release_edition'] = "S"
-
-                _cycle = " " if data_dict.get('cycle') is None else data_dict.get('cycle')
-
-                result = re.match(r"^(\d{4})-?.*", _cycle)
-                if result:
-                    model_dict['release_version'] = str(result.group(1))
-
-                result = re.match(r"^(\d{2}[A-Z]\d).*", _cycle)
-                if result:
-                    model_dict['release_version'] = str(result.group(1)).strip()
-                else:
-                    model_dict['release_version'] = None
-
-                if model_dict['release_version'] is None:
-                    result = re.match(r".*-(R2)-?.*", _cycle)
-                    if result:
-                        model_dict['release_version'] = str(result.group(1)).strip()
-
-                result = re.match(r".*SP(\d+).*", _cycle)
-                model_dict['service_pack'] = f"SP{result.group(1)}" if result else None
-
-                if model_dict['release_version'] is None:
-                    result = re.match(r"^(\w{4}).*", _cycle)
-                    model_dict['release_version'] = str(result.group(1)) if result else None
-
-                if 'iot' in _release_label.lower():
-                    model_dict['os_release_edition'] = "IoT"
-                elif '(e)' in _release_label.lower():
-                    model_dict['os_release_edition'] = "Enterprise"
-                elif '(w)' in _release_label.lower():
-                    model_dict['os_release_edition'] = "Workstation"
-                else:
-                    model_dict['os_release_edition'] = "Standard"
-
-                if model_dict['release_version'] is not None:
-                    model_dict['release_info'] = model_dict['release_version']
-                elif model_dict['release_model'] is not None:
-                    model_dict['release_info'] = model_dict['release_model']
-                else:
-                    model_dict['release_info'] = None
-
-                if model_dict['release_info'] and model_dict['release_info'].startswith('R2'):
-                    result = re.match(r'(\w{4})-?.*', model_dict['cycle'])
-                    if result:
-                        model_dict['release_info'] = f"{result.group(1)} R2"
-
-                return model_dict
-            except Exception:
-                t = traceback.format_exc()
-                print(t)
-                logger.error(t)
-                sys.exit(t)
-
-        self.__df = pd.DataFrame([model(data) for data in self.__df.to_dict(orient='records')])
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        def extract(values: pd.Series, pattern: re.Pattern) -> pd.Series:
+            return values.str.extract(pattern, expand=True).iloc[:, 0].astype(object)
+
+        def first_match(candidates: list, default=None) -> np.ndarray:
+            return np.select([c.notna().to_numpy() for c in candidates],
+                             [c.to_numpy(dtype=object) for c in candidates], default=default)
+
+        try:
+            label = self.__df['release_label'].where(self.__df['release_label'].notna(), " ").astype(object)
+            cycle = self.__df['cycle'].where(self.__df['cycle'].notna(), " ").astype(object)
+            label_lower = label.str.lower()
+
+            release_model = first_match([extract(label, pattern) for pattern in RELEASE_MODEL_PATTERNS])
+            release_version = first_match([
+                extract(cycle, CYCLE_BUILD_PATTERN).str.strip(),
+                extract(cycle, CYCLE_R2_PATTERN),
+                extract(cycle, CYCLE_YEAR_PATTERN),
+            ])
+            service_pack = extract(cycle, SERVICE_PACK_PATTERN)
+
+            self.__df['release_model'] = release_model
+            self.__df['release_version'] = release_version
+            self.__df['os_release_edition'] = np.select(
+                [label_lower.str.contains(term, regex=False).to_numpy() for term in ('iot', '(e)', '(w)')],
+                ["IoT", "Enterprise", "Workstation"],
+                default="Standard"
+            ).astype(object)
+            self.__df['service_pack'] = ("SP" + service_pack).where(service_pack.notna(), None)
+
+            release_info = pd.Series(first_match([self.__df['release_version'], self.__df['release_model']]),
+                                     index=self.__df.index, dtype=object)
+
+            # "R2" alone is not a release, prefix it with the year from the cycle (e.g. "2008 R2")
+            r2_year = extract(self.__df['cycle'].astype(object), RELEASE_INFO_R2_PATTERN)
+            is_r2 = release_info.str.startswith('R2', na=False) & r2_year.notna()
+            self.__df['release_info'] = release_info.where(~is_r2, r2_year + " R2")
+
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
 
     def duplicate_standard_rows(self):
         """
-        Duplicates Standard rows to include additional editions:
-        - Workstation
-        - Enterprise
-        - Keeps Standard with suffixes added to 'cycle'.
+        Fans Standard rows out into one row per configured edition (default: Workstation,
+        Enterprise, Standard) with the edition suffix added to 'cycle', followed by the
+        non-standard rows.
         """
-        standard_edition_df = self.__df[self.__df['os_release_edition'] == 'Standard']
-        _row_build_list = []
-
-        for index, row in standard_edition_df.iterrows():
-            _workstation = row.copy()
-            _workstation['os_release_edition'] = 'Workstation'
-            _workstation['cycle'] = _workstation['cycle'] + '-w'
-            _row_build_list.append(_workstation)
+        is_standard = (self.__df['os_release_edition'] == 'Standard').to_numpy()
+        standard_edition_df = self.__df[is_standard]
 
-            _enterprise = row.copy()
-            _enterprise['os_release_edition'] = 'Enterprise'
-            _enterprise['cycle'] = _enterprise['cycle'] + '-e'
-            _row_build_list.append(_enterprise)
+        # repeat each Standard row once per edition, editions stay grouped per source row
+        positions = np.repeat(np.arange(len(standard_edition_df)), len(self.__editions))
+        fanned_out_df = standard_edition_df.iloc[positions].reset_index(drop=True)
+        fanned_out_df['os_release_edition'] = np.tile(
+            [edition['edition'] for edition in self.__editions], len(standard_edition_df)).astype(object)
+        fanned_out_df['cycle'] = fanned_out_df['cycle'].astype(object) + np.tile(
+            [edition['suffix'] for edition in self.__editions], len(standard_edition_df)).astype(object)
 
-            _standard = row.copy()
-            _standard['os_release_edition'] = 'Standard'
-            _standard['cycle'] = _standard['cycle'] + '-s'
-            _row_build_list.append(_standard)
-
-        workstation_enterprise_dup_df = pd.DataFrame(_row_build_list)
-        non_standard_edition_df = self.__df[self.__df['os_release_edition'] != 'Standard']
-        self.__df = pd.concat([workstation_enterprise_dup_df, non_standard_edition_df], ignore_index=True)
+        self.__df = pd.concat([fanned_out_df, self.__df[~is_standard]], ignore_index=True)
 
     def duplicate_server_ltsc_rows(self):
         """
         Duplicates rows for Windows Server with LTSC edition so they also appear as Standard.
         """
-        server_ltsc_edition_df = self.__df[(self.__df['os_is_lts'] == True) & (self.__df['is_server'] == True)]
-        _row_build_list = []
-
-        for index, row in server_ltsc_edition_df.iterrows():
-            _ltsc = row.copy()
-            _ltsc['cycle'] = _ltsc['cycle'] + '-ltsc'
-            _ltsc['os_is_lts'] = True
-            _row_build_list.append(_ltsc)
+        is_server_ltsc = ((self.__df['os_is_lts'] == True) & (self.__df['is_server'] == True)).to_numpy()
+        server_ltsc_edition_df = self.__df[is_server_ltsc]
 
-            _standard = row.copy()
-            _standard['cycle'] = _standard['cycle']
-            _standard['os_is_lts'] = False
-            _row_build_list.append(_standard)
+        # each LTSC row is followed by its Standard copy
+        server_ltsc_dup_df = server_ltsc_edition_df.iloc[
+            np.repeat(np.arange(len(server_ltsc_edition_df)), 2)].reset_index(drop=True)
+        is_ltsc_copy = np.tile([True, False], len(server_ltsc_edition_df))
+        server_ltsc_dup_df['cycle'] = server_ltsc_dup_df['cycle'].astype(object).where(
+            ~is_ltsc_copy, server_ltsc_dup_df['cycle'].astype(object) + '-ltsc')
+        server_ltsc_dup_df['os_is_lts'] = is_ltsc_copy.astype(object)
 
-        server_ltsc_dup_df = pd.DataFrame(_row_build_list)
-        reverse_filter_df = self.__df[~((self.__df['os_is_lts'] == True) & (self.__df['is_server'] == True))]
-        self.__df = pd.concat([server_ltsc_dup_df, reverse_filter_df], ignore_index=True)
+        self.__df = pd.concat([server_ltsc_dup_df, self.__df[~is_server_ltsc]], ignore_index=True)
 
     def transform_drop_release_cols(self):
         """
@@ -197,7 +173,7 @@ class TransformApiEndOfLifeDate:
         """
         print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
         try:
-            self.__df.drop(columns=['release_model', 'release_version', 'release_label'], axis=1, inplace=True)
+            self.__df.drop(columns=['release_model', 'release_version', 'release_label'], inplace=True)
         except Exception:
             t = traceback.format_exc()
             print(t)
@@ -0,0 +1,168 @@
+"""
+Polars LazyFrame backend for the Microsoft Windows End-of-Life (EOL) transform.
+
+Mirrors `transform_api_end_of_life_date_microsoft_windows.TransformApiEndOfLifeDate`:
+- Parsing of 'release_label' and 'cycle' into normalized version info (column expressions)
+- Fan-out of standard editions into the configured editions (cross join)
+- Duplication of server LTSC rows to account for dual classification
+- Cleanup of redundant release columns
+
+The plan is collected once by `.transform_microsoft_windows_dataframe()`.
+"""
+
+import traceback
+import inspect
+import sys
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+from loguru import logger
+
+from .transform_polars_frame import to_lazy, collect_to_pandas, collect_like
+from .transform_api_end_of_life_date_microsoft_windows import DEFAULT_EDITIONS
+
+
+class TransformApiEndOfLifeDatePolars:
+    """
+    Applies the Microsoft Windows EOL transformation logic as a polars lazy query.
+    """
+
+    def __init__(self, df: pd.DataFrame | pa.Table, streaming: bool = False, editions: list | None = None) -> None:
+        self.__source = df
+        self.__editions = editions or DEFAULT_EDITIONS
+        self.__lf = to_lazy(df)
+        self.__streaming = streaming
+
+        self.transform_cycle_column()
+        self.duplicate_standard_rows()
+        self.duplicate_server_ltsc_rows()
+        self.transform_drop_release_cols()
+
+    @property
+    def lf(self) -> pl.LazyFrame:
+        return self.__lf
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return collect_to_pandas(self.__lf, streaming=self.__streaming)
+
+    def transform_microsoft_windows_dataframe(self) -> dict:
+        """
+        Collects the plan (to pandas, or Arrow for Arrow input) and returns the transformed
+        dataframe and status metadata.
+        """
+        return {
+            "data": collect_like(self.__lf, self.__source, streaming=self.__streaming),
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 200,
+                "message": "DataFrame created successfully"
+            }
+        }
+
+    def transform_cycle_column(self) -> None:
+        """
+        Parses 'release_label' and 'cycle' columns to extract structured fields:
+        - release_model
+        - release_version
+        - os_release_edition
+        - service_pack
+        - release_info
+        """
+        try:
+            label = pl.col('release_label').fill_null(' ')
+            label_lower = label.str.to_lowercase()
+            cycle = pl.col('cycle').fill_null(' ')
+
+            release_model = pl.coalesce(
+                label.str.extract(r"^(\d+\.?\d+?)\\s?.*", 1),
+                label.str.extract(r'^(\S+)(\s?|-?)', 1),
+            )
+            release_version = pl.coalesce(
+                cycle.str.extract(r"^(\d{2}[A-Z]\d).*", 1).str.strip_chars(),
+                cycle.str.extract(r".*-(R2)-?.*", 1),
+                cycle.str.extract(r"^(\w{4}).*", 1),
+            )
+            service_pack = pl.lit('SP') + cycle.str.extract(r".*SP(\d+).*", 1)
+
+            os_release_edition = (
+                pl.when(label_lower.str.contains('iot', literal=True)).then(pl.lit('IoT'))
+                .when(label_lower.str.contains('(e)', literal=True)).then(pl.lit('Enterprise'))
+                .when(label_lower.str.contains('(w)', literal=True)).then(pl.lit('Workstation'))
+                .otherwise(pl.lit('Standard'))
+            )
+
+            self.__lf = self.__lf.with_columns(
+                release_model.alias('release_model'),
+                release_version.alias('release_version'),
+                os_release_edition.alias('os_release_edition'),
+                service_pack.alias('service_pack'),
+            ).with_columns(
+                pl.coalesce('release_version', 'release_model').alias('release_info')
+            ).with_columns(
+                pl.when(pl.col('release_info').str.starts_with('R2'))
+                .then(pl.coalesce(cycle.str.extract(r'^(\w{4})-?.*', 1) + pl.lit(' R2'), pl.col('release_info')))
+                .otherwise(pl.col('release_info'))
+                .alias('release_info')
+            )
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
+
+    def duplicate_standard_rows(self):
+        """
+        Fans Standard rows out into one row per configured edition with the edition
+        suffix added to 'cycle', followed by the non-standard rows.
+        """
+        editions = pl.LazyFrame({
+            '__edition': [edition['edition'] for edition in self.__editions],
+            '__suffix': [edition['suffix'] for edition in self.__editions],
+        })
+        is_standard = pl.col('os_release_edition') == 'Standard'
+
+        fanned_out = (
+            self.__lf.filter(is_standard)
+            .join(editions, how='cross', maintain_order='left_right')
+            .with_columns(
+                pl.col('__edition').alias('os_release_edition'),
+                (pl.col('cycle') + pl.col('__suffix')).alias('cycle'),
+            )
+            .drop('__edition', '__suffix')
+        )
+        self.__lf = pl.concat([fanned_out, self.__lf.filter(~is_standard)], how='vertical_relaxed')
+
+    def duplicate_server_ltsc_rows(self):
+        """
+        Duplicates rows for Windows Server with LTSC edition so they also appear as Standard.
+        """
+        is_server_ltsc = ((pl.col('os_is_lts') == True) & (pl.col('is_server') == True)).fill_null(False)
+
+        ltsc = self.__lf.filter(is_server_ltsc).with_row_index('__row')
+        server_ltsc_dup = (
+            pl.concat([
+                ltsc.with_columns((pl.col('cycle') + '-ltsc').alias('cycle'), pl.lit(True).alias('os_is_lts'),
+                                  pl.lit(0).alias('__copy')),
+                ltsc.with_columns(pl.lit(False).alias('os_is_lts'), pl.lit(1).alias('__copy')),
+            ], how='vertical_relaxed')
+            .sort('__row', '__copy')
+            .drop('__row', '__copy')
+        )
+        self.__lf = pl.concat([server_ltsc_dup, self.__lf.filter(~is_server_ltsc)], how='vertical_relaxed')
+
+    def transform_drop_release_cols(self):
+        """
+        Drops columns that were parsed into normalized structure:
+        - release_model
+        - release_version
+        - release_label
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+        try:
+            self.__lf = self.__lf.drop('release_model', 'release_version', 'release_label')
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
@@ -0,0 +1,61 @@
+"""
+Shared pandas / Arrow <-> polars plumbing for the polars transform backend.
+
+The polars transforms accept the frame the extract tasks produce (a pandas DataFrame, or a
+`pyarrow.Table` on the Arrow data path) and hand the same container type back from their
+`transform_*_dataframe()` method, so loaders and flows are unaware of which backend ran.
+In between, every step is expressed on a `pl.LazyFrame` and only collected once.
+"""
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+
+def to_lazy(data) -> pl.LazyFrame:
+    """
+    Converts an extracted pandas DataFrame (NaN in float columns becomes null) or Arrow table
+    (zero-copy) into a LazyFrame.
+    """
+    if isinstance(data, pa.Table):
+        return pl.from_arrow(data).lazy()
+    return pl.from_pandas(data, nan_to_null=True).lazy()
+
+
+def collect_to_pandas(lf: pl.LazyFrame, streaming: bool = False) -> pd.DataFrame:
+    """
+    Collects a LazyFrame and converts it into the pandas shape the loaders expect.
+
+    Args:
+        lf (pl.LazyFrame): Query plan to execute.
+        streaming (bool): Run on the streaming engine (processes the plan in batches).
+
+    Returns:
+        pd.DataFrame: List columns as Python lists, string columns as object dtype holding None.
+    """
+    data = lf.collect(engine="streaming" if streaming else "auto")
+    df = data.to_pandas()
+
+    for name, dtype in data.schema.items():
+        if isinstance(dtype, pl.List):
+            df[name] = df[name].map(lambda v: list(v) if v is not None else v)
+        elif dtype in (pl.String, pl.Null):
+            df[name] = df[name].astype(object).where(df[name].notna(), None)
+
+    return df
+
+
+def collect_to_arrow(lf: pl.LazyFrame, streaming: bool = False) -> pa.Table:
+    """
+    Collects a LazyFrame into an Arrow table without a pandas round trip.
+    Uses the oldest compat level (large_string / large_list) which every Parquet and CSV writer accepts.
+    """
+    data = lf.collect(engine="streaming" if streaming else "auto")
+    return data.to_arrow(compat_level=pl.CompatLevel.oldest())
+
+
+def collect_like(lf: pl.LazyFrame, source, streaming: bool = False):
+    """Collects to an Arrow table if `source` was one, otherwise to pandas."""
+    if isinstance(source, pa.Table):
+        return collect_to_arrow(lf, streaming=streaming)
+    return collect_to_pandas(lf, streaming=streaming)
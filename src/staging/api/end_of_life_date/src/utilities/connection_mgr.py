@@ -0,0 +1,152 @@
+"""
+ConnectionRegistry: process-wide cache of database engines and object storage clients.
+
+Every load task used to build its own SQLAlchemy engine and MinIO client (with a fresh SSL
+context and urllib3 pool), so each run paid the TCP + TLS handshakes again and threw the
+pools away. The registry keeps one of each per destination for the life of the worker process:
+
+- SQLAlchemy engines keyed by DSN, pooled and pre-pinged so stale connections are replaced
+- SSL contexts keyed by CA bundle, loaded once
+- MinIO clients keyed by endpoint + credentials, sharing one urllib3 PoolManager per CA bundle
+
+Everything is disposed at interpreter exit.
+"""
+
+import atexit
+import hashlib
+import re
+import ssl
+import threading
+
+from loguru import logger
+
+# pool sizing shared by every engine; tasks in a flow run concurrently (MinIO + Postgres loads)
+POOL_SIZE = 5
+MAX_OVERFLOW = 5
+# seconds before a pooled connection is recycled, below typical server/proxy idle timeouts
+POOL_RECYCLE = 1800
+
+
+class ConnectionRegistry:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance.__initialized = False
+        return cls._instance
+
+    def __init__(self):
+        with self._lock:
+            if not self.__initialized:
+                self.__engines = {}
+                self.__ssl_contexts = {}
+                self.__pool_managers = {}
+                self.__minio_clients = {}
+                atexit.register(self.dispose)
+                self.__initialized = True
+
+    def get_engine(self, db_uri: str, **engine_kwargs):
+        """
+        Returns the pooled SQLAlchemy engine for a DSN, creating it on first use.
+
+        Args:
+            db_uri (str): Full connection URI (credentials and SSL query parameters included).
+            **engine_kwargs: Extra `create_engine` arguments, only applied on creation.
+
+        Returns:
+            sqlalchemy.engine.Engine: Shared engine for the DSN.
+        """
+        with self._lock:
+            engine = self.__engines.get(db_uri)
+            if engine is None:
+                from sqlalchemy import create_engine
+
+                engine = create_engine(
+                    db_uri,
+                    pool_pre_ping=True,
+                    pool_size=engine_kwargs.pop("pool_size", POOL_SIZE),
+                    max_overflow=engine_kwargs.pop("max_overflow", MAX_OVERFLOW),
+                    pool_recycle=engine_kwargs.pop("pool_recycle", POOL_RECYCLE),
+                    **engine_kwargs
+                )
+                self.__engines[db_uri] = engine
+                logger.info(f"Created engine for {engine.url.render_as_string(hide_password=True)}")
+
+            return engine
+
+    def get_ssl_context(self, cafile: str) -> ssl.SSLContext:
+        """
+        Returns the SSL context trusting `cafile`, loading the CA bundle once.
+        """
+        with self._lock:
+            return self.__get_ssl_context(cafile)
+
+    def get_minio_client(self, url: str, access_key: str, secret_key: str, cafile: str):
+        """
+        Returns the MinIO client for an endpoint and credential pair, creating it on first use.
+        Clients trusting the same CA bundle share one urllib3 PoolManager.
+
+        Args:
+            url (str): MinIO endpoint, with or without scheme.
+            access_key (str): Access key.
+            secret_key (str): Secret key.
+            cafile (str): CA bundle used to verify the endpoint.
+
+        Returns:
+            minio.Minio: Shared client.
+        """
+        endpoint = re.sub("https?://", "", url)
+        # the secret is hashed so it is not kept as a dictionary key in plain text
+        key = (endpoint, access_key, hashlib.sha256(secret_key.encode()).hexdigest(), cafile)
+
+        with self._lock:
+            client = self.__minio_clients.get(key)
+            if client is None:
+                import urllib3
+                from minio import Minio
+
+                pool_manager = self.__pool_managers.get(cafile)
+                if pool_manager is None:
+                    pool_manager = urllib3.PoolManager(
+                        ssl_context=self.__get_ssl_context(cafile),
+                        maxsize=POOL_SIZE + MAX_OVERFLOW,
+                        retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+                    )
+                    self.__pool_managers[cafile] = pool_manager
+
+                client = Minio(
+                    endpoint=endpoint,
+                    secure=True,
+                    access_key=access_key,
+                    secret_key=secret_key,
+                    http_client=pool_manager
+                )
+                self.__minio_clients[key] = client
+                logger.info(f"Created MinIO client for {endpoint}")
+
+            return client
+
+    def dispose(self) -> None:
+        """
+        Closes every pooled connection and forgets all cached engines and clients.
+        """
+        with self._lock:
+            for engine in self.__engines.values():
+                engine.dispose()
+            for pool_manager in self.__pool_managers.values():
+                pool_manager.clear()
+
+            self.__engines.clear()
+            self.__minio_clients.clear()
+            self.__pool_managers.clear()
+            self.__ssl_contexts.clear()
+
+    def __get_ssl_context(self, cafile: str) -> ssl.SSLContext:
+        context = self.__ssl_contexts.get(cafile)
+        if context is None:
+            context = ssl.create_default_context(cafile=cafile)
+            self.__ssl_contexts[cafile] = context
+        return context
@@ -0,0 +1,138 @@
+"""
+Partitioned Transform Utility
+
+Runs a transform class over row chunks of a DataFrame in a process pool:
+- Splits the input into contiguous row chunks (count set per task in config.yaml)
+- Ships each chunk to a worker as an Arrow IPC stream instead of pickled Python objects
+- Rebuilds the transform class inside the worker and calls its result method
+- Reassembles the chunk results in input order
+
+Columns holding dicts cannot round-trip through Arrow without gaining keys, so frames that contain
+them fall back to pickle transfer.
+"""
+
+import concurrent.futures
+import inspect
+import os
+import pickle
+import traceback
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+# chunks smaller than this cost more in process start-up and transfer than they save
+MIN_PARTITION_ROWS = 1000
+
+
+def _is_arrow_safe(df: pd.DataFrame) -> bool:
+    """Returns False if any object column holds dicts."""
+    for column in df.columns:
+        if df[column].dtype == object and df[column].map(lambda v: isinstance(v, dict)).any():
+            return False
+    return True
+
+
+def _to_payload(df: pd.DataFrame) -> tuple:
+    """Serializes a chunk as ("arrow", IPC stream bytes) or ("pickle", bytes)."""
+    if _is_arrow_safe(df):
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return "arrow", sink.getvalue().to_pybytes()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+    return "pickle", pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _from_payload(payload: tuple) -> pd.DataFrame:
+    """Rebuilds a chunk serialized by `_to_payload`."""
+    kind, body = payload
+    if kind == "pickle":
+        return pickle.loads(body)
+
+    table = pa.ipc.open_stream(body).read_all()
+    df = table.to_pandas()
+
+    # Arrow hands list columns back as numpy arrays and may map strings to a string dtype;
+    # transforms and loaders expect lists and object columns holding None
+    for field in table.schema:
+        if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+            df[field.name] = df[field.name].map(lambda v: list(v) if v is not None else v)
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            df[field.name] = df[field.name].astype(object).where(df[field.name].notna(), None)
+
+    return df
+
+
+def _run_chunk(transform_cls, payload: tuple, result_method: str, kwargs: dict) -> tuple:
+    """Worker entrypoint: transform a single chunk and serialize the result."""
+    df = _from_payload(payload)
+    data = getattr(transform_cls(df, **kwargs), result_method)()
+    return _to_payload(data["data"])
+
+
+def run_partitioned(transform_cls,
+                    df: pd.DataFrame,
+                    result_method: str,
+                    partitions: int = 1,
+                    **kwargs) -> dict:
+    """
+    Runs `transform_cls(df, **kwargs).<result_method>()` over row chunks in a process pool.
+
+    Args:
+        transform_cls: Transform class taking the DataFrame as its first argument.
+        df (pd.DataFrame): Input frame.
+        result_method (str): Name of the `transform_*_dataframe` method returning {"data", "result"}.
+        partitions (int): Requested chunk count. 1 (or a small frame) runs inline.
+        **kwargs: Extra keyword arguments passed to the transform class (must be picklable).
+
+    Returns:
+        dict: {"data": reassembled DataFrame, "result": {..., "partitions": chunks used}}
+    """
+    print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+    try:
+        partitions = max(1, min(int(partitions or 1), len(df) // MIN_PARTITION_ROWS))
+
+        if partitions == 1:
+            data = getattr(transform_cls(df, **kwargs), result_method)()
+            data["result"]["partitions"] = 1
+            return data
+
+        bounds = [round(i * len(df) / partitions) for i in range(partitions + 1)]
+        chunks = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        logger.info(f"Running {transform_cls.__name__}.{result_method} over {partitions} partitions")
+
+        max_workers = min(partitions, os.cpu_count() or 1)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_run_chunk, transform_cls, _to_payload(chunk), result_method, kwargs)
+                for chunk in chunks
+            ]
+            frames = [_from_payload(future.result()) for future in futures]
+
+        return {
+            "data": pd.concat(frames, ignore_index=True),
+            "result": {
+                "job_title": result_method,
+                "status_code": 200,
+                "partitions": partitions,
+                "message": "DataFrame created successfully"
+            }
+        }
+
+    except Exception:
+        t = traceback.format_exc()
+        logger.error(t)
+        return {
+            "result": {
+                "job_title": result_method,
+                "status_code": 500,
+                "partitions": partitions,
+                "message": t
+            }
+        }
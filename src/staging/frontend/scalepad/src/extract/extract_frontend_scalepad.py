@@ -16,8 +16,11 @@ import numpy as np
 import re
 
 import urllib.parse
+import threading
+import concurrent.futures
 
-from io import StringIO
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 
 class ExtractScalepad:
@@ -43,99 +46,198 @@ class ExtractScalepad:
         # Add Secrets to Config
         self.__secrets.update(vault_secrets)
 
-    def create_hardware_assets_dataframe(self) -> dict:
-        try:
-            # Base URL
-            base_uri = 'https://app.scalepad.com'
-            login_url = f"{self.__secrets['base_uri']}/signin"
+    def __signin(self, session: requests.Session) -> None:
+        """
+        Walks the multistep signin form (GET signin, then POST steps 1 to 2 with a fresh TOTP),
+        leaving the authenticated cookies on the session.
+        """
+        login_url = f"{self.__secrets['base_uri']}/signin"
 
-            # Create a session to maintain cookies
-            session = requests.Session()
+        # Fetch the login page (initial CSRF token)
+        resp = session.get(login_url)
 
-            # Fetch the login page (initial CSRF token)
-            resp = session.get(login_url)
+        form_step = 0
 
-            form_step = 0
+        # Print resp
+        print("Login Response:", resp)
+        print(f"Form Step: {form_step}")
 
-            # Print resp
-            print("Login Response:", resp)
-            print(f"Form Step: {form_step}")
+        # Extract cookies
+        cookies = session.cookies.get_dict()
+
+        # Regular expressions to extract FORM_FORM and FORM_STEP values
+        form_form_match = re.search(r'name="FORM_FORM"\s+value="([^"]+)"', resp.text)
+
+        # Store extracted values in variables
+        form_form = form_form_match.group(1) if form_form_match else None
 
-            # Extract cookies
+        # Iterate through 3 steps of username / password following gotoStep in response json then MFA
+        for step in np.arange(1, 3):
+
+            # Refresh cookies from the session before each request
             cookies = session.cookies.get_dict()
 
-            # Regular expressions to extract FORM_FORM and FORM_STEP values
-            form_form_match = re.search(r'name="FORM_FORM"\s+value="([^"]+)"', resp.text)
+            # Decode CSRF token dynamically
+            csrf_token = urllib.parse.unquote(cookies.get("WM_CSRF", ""))
 
-            # Store extracted values in variables
-            form_form = form_form_match.group(1) if form_form_match else None
+            print(f"Step {step} - CSRF Token:", csrf_token)
 
-            # Iterate through 3 steps of username / password following gotoStep in response json then MFA
-            for step in np.arange(1, 3):
+            # Define the login payload
+            payload = {
+                "form_version": "multistep-signin-v1",
+                "email": self.__secrets['username'],
+                "password": self.__secrets['password'],
+                "mfa_code": self.__otp_gen.generate_otp_from_secret(self.__secrets['totp']),
+                "FORM_FORM": form_form,
+                "FORM_STEP": step,  # Updated step dynamically
+                "nosubmit": "false"
+            }
 
-                # Refresh cookies from the session before each request
-                cookies = session.cookies.get_dict()
+            # Headers including the latest CSRF token
+            headers = {
+                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+                "X-Requested-With": "XMLHttpRequest",
+                "x-wm_csrf": csrf_token,  # Updated CSRF token dynamically
+            }
 
-                # Decode CSRF token dynamically
-                csrf_token = urllib.parse.unquote(cookies.get("WM_CSRF", ""))
+            # Perform the login request with updated session cookies
+            resp = session.post(login_url, data=payload, headers=headers, cookies=cookies)
+            try:
+                form_step = resp.json()['gotoStep']
+            except:
+                pass
 
-                print(f"Step {step} - CSRF Token:", csrf_token)
+            # Print resp
+            print("Login Response:", resp.json())
+            print(f"Form Step: {form_step}")
 
-                # Define the login payload
-                payload = {
-                    "form_version": "multistep-signin-v1",
-                    "email": self.__secrets['username'],
-                    "password": self.__secrets['password'],
-                    "mfa_code": self.__otp_gen.generate_otp_from_secret(self.__secrets['totp']),
-                    "FORM_FORM": form_form,
-                    "FORM_STEP": step,  # Updated step dynamically
-                    "nosubmit": "false"
-                }
+    def __probe_session(self, session: requests.Session) -> bool:
+        """
+        Checks whether the session cookies are still accepted: an authenticated page answers 200,
+        an expired session is redirected to signin or rejected with 401 / 403.
+        """
+        probe_url = f"{self.__secrets['base_uri']}{self.__data.get('session_probe', '/asset/hardware')}"
+        resp = session.get(probe_url, allow_redirects=False)
 
-                # Headers including the latest CSRF token
-                headers = {
-                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                    "X-Requested-With": "XMLHttpRequest",
-                    "x-wm_csrf": csrf_token,  # Updated CSRF token dynamically
-                }
+        return resp.status_code == 200 and "signin" not in resp.headers.get("Location", "")
 
-                # Perform the login request with updated session cookies
-                resp = session.post(login_url, data=payload, headers=headers, cookies=cookies)
-                try:
-                    form_step = resp.json()['gotoStep']
-                except:
-                    pass
+    def __load_session(self) -> requests.Session | None:
+        """
+        Restores the session cookies cached in Vault (SECRETS.session_path), or None when
+        no session path is configured or nothing has been cached yet.
+        """
+        if not self.__secrets.get("session_path"):
+            return None
 
-                # Print resp
-                print("Login Response:", resp.json())
-                print(f"Form Step: {form_step}")
+        try:
+            cached = self.__vault_mgr.read_secret(mount_point=self.__secrets["mount_point"],
+                                                  path=self.__secrets["session_path"])
+        except Exception:
+            print("No cached session found in Vault")
+            return None
+
+        session = requests.Session()
+        for cookie in json.loads(cached.get("cookies", "[]")):
+            session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+
+        return session
+
+    def __save_session(self, session: requests.Session) -> None:
+        """
+        Stores the authenticated session cookies in Vault so the next run can skip signin.
+        """
+        if not self.__secrets.get("session_path"):
+            return
+
+        cookies = [
+            {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+            for c in session.cookies
+        ]
+        self.__vault_mgr.write_secret(
+            mount_point=self.__secrets["mount_point"],
+            path=self.__secrets["session_path"],
+            secret={
+                "cookies": json.dumps(cookies),
+                "saved_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+            }
+        )
+
+    def __create_session(self, force_signin: bool = False) -> requests.Session:
+        """
+        Returns an authenticated session: the cached one when it still passes the probe,
+        otherwise a new signin whose cookies replace the cached ones.
+        """
+        if not force_signin:
+            session = self.__load_session()
+            if session is not None and self.__probe_session(session):
+                print("Reusing cached session")
+                return session
+
+        # Create a session to maintain cookies
+        session = requests.Session()
+        self.__signin(session)
+        self.__save_session(session)
+
+        return session
+
+    def __console_headers(self) -> dict:
+        """
+        Browser headers the asset console API expects.
+        """
+        # Headers (copied from the curl request)
+        return {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:135.0) Gecko/20100101 Firefox/135.0",
+            "Accept": "*/*",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Accept-Encoding": "gzip, deflate",  # encodings urllib3 decodes while streaming
+            "Referer": f"{self.__secrets['base_uri']}/asset/hardware?Columns=AssignedTo%2CExpires%2CHasInitiative%2CManufacturer%2CModel%2CPurchased%2CRenewalAvailable%2CType%2CUser",
+            "Content-Type": "application/json",
+            "Origin": f"{self.__secrets['base_uri']}",
+            "Connection": "keep-alive",
+            "Sec-Fetch-Dest": "empty",
+            "Sec-Fetch-Mode": "cors",
+            "Sec-Fetch-Site": "same-origin",
+            "Priority": "u=0",
+            "TE": "trailers",
+        }
+
+    @staticmethod
+    def __stream_spreadsheet(session: requests.Session, url: str, headers: dict, payload: dict,
+                             convert_options: pa_csv.ConvertOptions | None = None) -> dict:
+        """
+        Streams the spreadsheet export through the authenticated session straight into the
+        multi-threaded Arrow CSV reader, so the body is never buffered as bytes or str.
+
+        Returns:
+            dict: {"status_code": int, "data": pa.Table | None, "message": str}
+        """
+        with session.post(url, headers=headers, json=payload, stream=True) as response:
+            if response.status_code != 200:
+                return {"status_code": response.status_code, "data": None, "message": response.text}
+
+            # let urllib3 undo gzip / deflate while Arrow reads the socket in blocks
+            response.raw.decode_content = True
+            table = pa_csv.read_csv(
+                response.raw,
+                read_options=pa_csv.ReadOptions(use_threads=True, block_size=8 << 20),
+                convert_options=convert_options or pa_csv.ConvertOptions(strings_can_be_null=True),
+            )
 
-                # Update cookies and CSRF token after request
-                cookies = session.cookies.get_dict()
+            return {"status_code": 200, "data": table, "message": "Success"}
 
+    def create_hardware_assets_dataframe(self, convert_options: pa_csv.ConvertOptions | None = None) -> dict:
+        try:
+            # Base URL
+            base_uri = 'https://app.scalepad.com'
 
+            session = self.__create_session()
 
-            ### - Download CSV as StringIO into DataFrame - ###
+            ### - Stream CSV through the Arrow reader into DataFrame - ###
 
             # Define the API URL
             url = f"{base_uri}/api/AssetManagement/Asset/Console/Spreadsheet"
 
-            # Headers (copied from the curl request)
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:135.0) Gecko/20100101 Firefox/135.0",
-                "Accept": "*/*",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br, zstd",
-                "Referer": f"{self.__secrets['base_uri']}/asset/hardware?Columns=AssignedTo%2CExpires%2CHasInitiative%2CManufacturer%2CModel%2CPurchased%2CRenewalAvailable%2CType%2CUser",
-                "Content-Type": "application/json",
-                "Origin": f"{self.__secrets['base_uri']}",
-                "Connection": "keep-alive",
-                "Sec-Fetch-Dest": "empty",
-                "Sec-Fetch-Mode": "cors",
-                "Sec-Fetch-Site": "same-origin",
-                "Priority": "u=0",
-                "TE": "trailers",
-            }
+            headers = self.__console_headers()
 
             # JSON Payload (modified for clarity)
             payload = {
@@ -152,18 +254,21 @@ class ExtractScalepad:
             }
 
             # Send the POST request
-            response = requests.post(url, headers=headers, cookies=cookies, json=payload)
+            response = self.__stream_spreadsheet(session, url, headers, payload, convert_options)
+
+            # Cached cookies can be revoked between the probe and the download, sign in once more
+            if response["status_code"] in (401, 403):
+                session = self.__create_session(force_signin=True)
+                response = self.__stream_spreadsheet(session, url, headers, payload, convert_options)
 
             # Check if request was successful
-            if response.status_code == 200:
-                # # Save the spreadsheet as a CSV file
-                # with open("d:/exports/scalepad_assets.csv", "wb") as file:
-                #     file.write(response.content)
-                # Convert the response content into a DataFrame
-                csv_data = response.content.decode('utf-8')  # Decode bytes to string
-                df = pd.read_csv(StringIO(csv_data))  # Read CSV data into a DataFrame
+            if response["status_code"] == 200:
+                table = response["data"]
+                # self_destruct frees each Arrow column as it is converted, keeping about one copy in memory
+                df = table.to_pandas(split_blocks=True, self_destruct=True)
+                del table
 
-                print("Spreadsheet successfully downloaded as 'scalepad_assets.csv'")
+                print(f"Spreadsheet successfully streamed: {len(df)} rows, {len(df.columns)} columns")
 
                 return {
                     "data": df,
@@ -175,13 +280,13 @@ class ExtractScalepad:
                 }
 
             else:
-                print(f"Failed to download spreadsheet. Status code: {response.status_code}")
-                print("Response:", response.text)
+                print(f"Failed to download spreadsheet. Status code: {response['status_code']}")
+                print("Response:", response["message"])
 
                 return {
                     "result": {
                         "job_title": self.__details["task_title"],
-                        "status_code": response.status_code,
+                        "status_code": response["status_code"],
                         "message": "Failed to download spreadsheet"
                     }
                 }
@@ -195,3 +300,103 @@ class ExtractScalepad:
                     "message": t
                 }
             }
+
+    def create_hardware_assets_console_dataframe(self, scope: dict | None = None, asset_type: str | None = None) -> dict:
+        """
+        Alternate extraction mode that pages through the asset console API instead of exporting
+        the whole account. The first page returns the total count (a response without it fails the
+        extract), the remaining pages are fetched concurrently, each worker on its own session with
+        the authenticated cookies, and each page is flattened into a frame as it arrives.
+
+        Args:
+            scope (dict): Console scope, e.g. {"Type": "Client", "Id": "<client id>"} to refresh one
+                client (default: DATA.scope, else the whole account).
+            asset_type (str): Asset type to list, e.g. "Hardware" (default: DATA.asset_type).
+        """
+        try:
+            # Base URL
+            base_uri = 'https://app.scalepad.com'
+            console = self.__data.get("console", {})
+            url = f"{base_uri}{console.get('path', '/api/AssetManagement/Asset/Console')}"
+            items_key = console.get("items_key", "Items")
+            total_key = console.get("total_key", "TotalCount")
+            page_size = self.__data.get("page_size", 500)
+
+            scope = scope or self.__data.get("scope") or {"Type": "Account"}
+            asset_type = asset_type or self.__data.get("asset_type", "Hardware")
+
+            session = self.__create_session()
+            headers = self.__console_headers()
+
+            def post_page(page_session: requests.Session, page_number: int):
+                payload = {
+                    "Query": {
+                        "Parameters": {},
+                        "Pagination": {"PageNumber": page_number, "Size": page_size, "PageId": ""},
+                        "Sort": [],
+                    },
+                    "Scope": scope,
+                    "AssetType": asset_type,
+                }
+                return page_session.post(url, headers=headers, json=payload)
+
+            # Cached cookies can be revoked between the probe and the first page, sign in once more
+            resp = post_page(session, 0)
+            if resp.status_code in (401, 403):
+                session = self.__create_session(force_signin=True)
+                resp = post_page(session, 0)
+            resp.raise_for_status()
+
+            first_page = resp.json()
+            missing = [key for key in (items_key, total_key) if key not in first_page]
+            if missing:
+                # without the total only the first page would be read, reported as a full extract
+                raise KeyError(f"Console response has no {missing} (console.items_key / console.total_key), "
+                               f"got keys {sorted(first_page)}")
+            total = first_page[total_key]
+            page_count = max(1, -(-total // page_size))
+
+            # requests.Session is not thread-safe, every worker pages on its own copy of the cookies
+            local = threading.local()
+
+            def fetch_page(page_number: int) -> dict:
+                if not hasattr(local, "session"):
+                    local.session = requests.Session()
+                    local.session.cookies.update(session.cookies)
+                resp = post_page(local.session, page_number)
+                resp.raise_for_status()
+                return resp.json()
+
+            print(f"Console scope {scope} - {asset_type}: {total} assets in {page_count} pages of {page_size}")
+
+            frames = {0: pd.json_normalize(first_page[items_key])}
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.__data.get("max_workers", 4)) as executor:
+                futures = {executor.submit(fetch_page, page): page for page in range(1, page_count)}
+                for future in concurrent.futures.as_completed(futures):
+                    frames[futures[future]] = pd.json_normalize(future.result()[items_key])
+
+            # pages are concatenated once, in page order
+            df = pd.concat([frames[page] for page in sorted(frames)], ignore_index=True)
+
+            return {
+                "data": df,
+                "result": {
+                    "job_title": self.__details["task_title"],
+                    "status_code": 200,
+                    "pages": page_count,
+                    "rows": len(df),
+                    "scope": scope,
+                    "asset_type": asset_type,
+                    "message": "DataFrame created successfully"
+                }
+            }
+
+        except Exception as e:
+            t = traceback.format_exc()
+            return {
+                "result": {
+                    "job_title": self.__details["task_title"],
+                    "status_code": 500,
+                    "message": t
+                }
+            }
@@ -9,14 +9,18 @@
 
 
 import os
-from minio import Minio
 from io import BytesIO
-import re
 import traceback
 import hvac
-import ssl
 import inspect
-import urllib3
+
+from utilities.connection_mgr import ConnectionRegistry
+from utilities.upload_stream_mgr import stream_upload, CHUNK_ROWS
+from utilities.parquet_mgr import parquet_settings, write_parquet
+from utilities.dataset_mgr import partition_values, partition_path, file_entry, update_manifest
+
+# Bytes per multipart part on streamed uploads (S3/MinIO minimum is 5 MiB)
+PART_SIZE = 16 * 1024 * 1024
 
 
 class MinioLoad:
@@ -38,15 +42,13 @@ class MinioLoad:
         try:
             # Load custom CA certificate for SSL verification
             ca_cert_path = os.environ.get('SSL_CERT_FILE', '/prefect/ca.crt')  # Path to the custom CA certificate inside the container
-            context = ssl.create_default_context(cafile=ca_cert_path)  # Create an SSL context with the custom CA certificate
 
-            # Create the MinIO client with the custom SSL context
-            minio_client = Minio(
-                endpoint=re.sub("https?://", "", self.__secrets["url"]),
-                secure=True,
+            # Reuse the worker's MinIO client (SSL context and connection pool included) for this endpoint
+            minio_client = ConnectionRegistry().get_minio_client(
+                url=self.__secrets["url"],
                 access_key=self.__secrets["accessKey"],
                 secret_key=self.__secrets["secretKey"],
-                http_client=urllib3.PoolManager(ssl_context=context)  # Use the SSL context in the HTTP client
+                cafile=ca_cert_path
             )
 
             return {
@@ -77,6 +79,10 @@ class MinioLoad:
 
         filename = ("_".join(filename_details)) + f'.{self.__data["destination"]["file_type"]}'
 
+        if self.__data["destination"].get("layout") == "hive":
+            partition = partition_values(self.__data["source_method"], self.__timestamps)
+            return partition_path(self.__details["product"], self.__details["subject"], partition, filename)
+
         bucket_location_details = [
             self.__details["product"],
             self.__details["subject"],
@@ -100,27 +106,72 @@ class MinioLoad:
             minio_client = data["data"]
             minio_object = self.__create_upload_details__()
 
-            # Create buffer with dataframe
-            if self.__data["destination"]["file_type"] == "parquet":
-                flat_file = self.__df_input.to_parquet(index=False)
-            elif self.__data["destination"]["file_type"] == "csv":
-                flat_file = self.__df_input.to_csv(index=False)
-            elif self.__data["destination"]["file_type"] == "json":
-                flat_file = str.encode(self.__df_input.to_json(orient="records"))
-
-            minio_client.put_object(
-                bucket_name=self.__data["destination"]["bucket"],
-                object_name=minio_object,
-                data=BytesIO(flat_file),
-                length=len(flat_file),
-                content_type=f'application/{self.__data["destination"]["file_type"]}')
+            destination = self.__data["destination"]
+            file_type = destination["file_type"]
+            parquet = parquet_settings(destination.get("parquet"))  # Compression, row groups and sort key
+
+            written = {}  # put_object result, its ETag goes into the manifest entry
+            if destination.get("streaming", False):
+                # Stream chunks into a multipart upload of unknown length while they are serialized
+                upload = stream_upload(
+                    data=self.__df_input,
+                    file_type=file_type,
+                    upload=lambda stream: written.update(object=minio_client.put_object(
+                        bucket_name=destination["bucket"],
+                        object_name=minio_object,
+                        data=stream,
+                        length=-1,
+                        part_size=destination.get("part_size", PART_SIZE),
+                        content_type=f'application/{file_type}')),
+                    chunk_rows=destination.get("chunk_rows", CHUNK_ROWS),
+                    parquet=parquet)
+            else:
+                # Create buffer with dataframe
+                chunks = 1
+                if file_type == "parquet":
+                    buffer = BytesIO()
+                    chunks = write_parquet(self.__df_input, buffer, parquet)
+                    flat_file = buffer.getvalue()
+                elif file_type == "csv":
+                    flat_file = self.__df_input.to_csv(index=False).encode()
+                elif file_type == "json":
+                    flat_file = str.encode(self.__df_input.to_json(orient="records"))
+
+                written["object"] = minio_client.put_object(
+                    bucket_name=destination["bucket"],
+                    object_name=minio_object,
+                    data=BytesIO(flat_file),
+                    length=len(flat_file),
+                    content_type=f'application/{file_type}')
+                upload = {"bytes": len(flat_file), "chunks": chunks}
+
+            if destination.get("layout") == "hive":
+                # Add the new file to the product/subject manifest so readers can skip bucket listings
+                manifest = update_manifest(
+                    client=minio_client,
+                    bucket=destination["bucket"],
+                    product=self.__details["product"],
+                    subject=self.__details["subject"],
+                    add=[file_entry(
+                        path=minio_object,
+                        data=self.__df_input,
+                        partition=partition_values(self.__data["source_method"], self.__timestamps),
+                        size=upload["bytes"],
+                        extracted_at=self.__timestamps["_IN_DATA_TIMESTAMP"],
+                        stats_columns=destination.get("stats_columns") or parquet["sort_by"],
+                        etag=written["object"].etag)])
+                upload["manifest_version"] = manifest["version"]
 
             return {
                 "data": minio_object,
                 "result": {
                     "job_title": self.__details["task_title"],
                     "status_code": 200,
-                    "file_format": self.__data["destination"]["file_type"],
+                    "file_format": file_type,
+                    "layout": destination.get("layout", "date"),
+                    "streaming": destination.get("streaming", False),
+                    **upload,
+                    **({"parquet": parquet} if file_type == "parquet" else {}),
                     "message": "File uploaded to MinIO",
                 }
             }
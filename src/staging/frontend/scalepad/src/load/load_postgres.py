@@ -8,13 +8,74 @@
 
 
 import os
-from sqlalchemy import create_engine
+import io
+import json
 import hvac
 import traceback
 import inspect
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pc
+from loguru import logger
+
+from utilities.connection_mgr import ConnectionRegistry
+
+# pandas dtype kind -> Postgres column type for tables created by the COPY loader
+POSTGRES_TYPES = {
+    "b": "boolean",
+    "i": "bigint",
+    "u": "bigint",
+    "f": "double precision",
+    "m": "interval",
+}
+
+# nested values stored as jsonb (Arrow list columns arrive as numpy arrays)
+NESTED_TYPES = (list, dict, tuple, np.ndarray)
+
+# NULL marker written into the COPY stream (an empty string stays an empty string)
+COPY_NULL = "\\N"
+
+# columns of a unique index in index order, empty when it does not exist (or is not unique)
+UNIQUE_INDEX_COLUMNS = (
+    "SELECT a.attname FROM pg_index i "
+    "JOIN pg_class c ON c.oid = i.indexrelid "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, position) ON true "
+    "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum "
+    "WHERE n.nspname = %s AND c.relname = %s AND i.indisunique "
+    "ORDER BY k.position"
+)
+
+# views whose rewrite rule references a relation, they follow it through a rename
+DEPENDENT_VIEWS = (
+    "SELECT DISTINCT n.nspname, c.relname FROM pg_depend d "
+    "JOIN pg_rewrite r ON r.oid = d.objid "
+    "JOIN pg_class c ON c.oid = r.ev_class "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "WHERE d.classid = 'pg_rewrite'::regclass AND d.refobjid = to_regclass(%s) AND c.oid <> d.refobjid "
+    "ORDER BY 1, 2"
+)
 
 
 class PostgresLoad:
+    """
+    Handles loading a DataFrame to a PostgreSQL table with SSL verification using custom CA certificates.
+    Reads connection credentials securely from Vault.
+
+    `destination.method` selects the write path:
+    - to_sql: pandas row-batch INSERTs (default)
+    - copy: bulk load through `COPY ... FROM STDIN` in CSV form, `destination.chunk_size` rows per chunk
+      (a pyarrow.Table input is written to CSV by Arrow, without a pandas frame in between)
+
+    `destination.mode` selects how the table is refreshed:
+    - replace: drop and recreate the table (default)
+    - merge: upsert on `destination.key_columns` through a COPY-loaded temp table,
+      optionally deleting rows missing from the frame (`destination.delete_missing`)
+    - swap: load and index an unlogged shadow table, then rename-swap it with the live table
+      (refused while views depend on the live table, they would follow it to the dropped copy)
+    """
 
     def __init__(self, df_input, config: dict, vault) -> None:
         self.__df_input = df_input
@@ -29,31 +90,397 @@ class PostgresLoad:
             )
         )
 
+    @staticmethod
+    def postgres_type(values: pd.Series) -> str:
+        """
+        Maps a column to the Postgres type it is created with by the COPY loader.
+        List / dict columns (e.g. patch_activity_info) are stored as jsonb.
+        """
+        dtype = values.dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            return "timestamptz"
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return "timestamp"
+        if isinstance(dtype, pd.CategoricalDtype):
+            return PostgresLoad.postgres_type(pd.Series(dtype.categories)) if len(dtype.categories) else "text"
+        if pd.api.types.is_bool_dtype(dtype):
+            return "boolean"
+        if pd.api.types.is_numeric_dtype(dtype) and dtype.kind in POSTGRES_TYPES:
+            return POSTGRES_TYPES[dtype.kind]
+
+        sample = values.dropna()
+        if len(sample) and sample.map(lambda v: isinstance(v, NESTED_TYPES)).any():
+            return "jsonb"
+        return "text"
+
+    @staticmethod
+    def arrow_postgres_type(data_type: pa.DataType) -> str | None:
+        """
+        Maps an Arrow column type to the Postgres type it is created with by the COPY loader,
+        None when the Arrow CSV writer cannot encode it.
+        """
+        if pa.types.is_dictionary(data_type):
+            return PostgresLoad.arrow_postgres_type(data_type.value_type)
+        if pa.types.is_timestamp(data_type):
+            return "timestamptz" if data_type.tz else "timestamp"
+        if pa.types.is_boolean(data_type):
+            return "boolean"
+        if pa.types.is_integer(data_type):
+            return "bigint"
+        if pa.types.is_floating(data_type):
+            return "double precision"
+        if pa.types.is_date(data_type):
+            return "date"
+        if pa.types.is_nested(data_type):
+            return "jsonb"
+        if pa.types.is_string(data_type) or pa.types.is_large_string(data_type) or pa.types.is_null(data_type):
+            return "text"
+        return None
+
+    @staticmethod
+    def column_types(data) -> dict | None:
+        """
+        Column name -> Postgres type of a frame or Arrow table, None for a table with a column
+        the Arrow COPY path cannot write.
+        """
+        if isinstance(data, pa.Table):
+            types = {field.name: PostgresLoad.arrow_postgres_type(field.type) for field in data.schema}
+            return None if None in types.values() else types
+        return {column: PostgresLoad.postgres_type(data[column]) for column in data.columns}
+
+    @staticmethod
+    def copy_chunk_arrow(table: pa.Table, types: dict) -> io.BytesIO:
+        """
+        Serializes a table chunk as COPY CSV with the Arrow writer: nested values as JSON, timestamps
+        at microsecond precision (UTC with a Z suffix when zoned), missing values as the COPY NULL marker.
+        Every valid value is quoted, so a literal marker stays a string.
+        """
+        for index, (column, pg_type) in enumerate(types.items()):
+            values = table.column(index)
+            if pg_type == "jsonb":
+                values = pa.array([None if v is None else json.dumps(v, default=str) for v in values.to_pylist()],
+                                  type=pa.string())
+            elif pa.types.is_timestamp(values.type):
+                values = pc.cast(values, pa.timestamp("us", values.type.tz), safe=False)
+            elif pa.types.is_dictionary(values.type):
+                values = pc.cast(values, values.type.value_type)
+            else:
+                continue
+            table = table.set_column(index, column, values)
+
+        buffer = io.BytesIO()
+        pa_csv.write_csv(table, buffer, pa_csv.WriteOptions(include_header=False, quoting_style="all_valid",
+                                                            null_string=COPY_NULL))
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def copy_chunk(df: pd.DataFrame, types: dict) -> io.StringIO:
+        """
+        Serializes a frame chunk as COPY CSV: nested values as JSON, timestamps in UTC ISO form,
+        missing values as the COPY NULL marker. Text is always quoted, so a literal marker stays a string
+        (COPY reads only an unquoted marker as NULL, which the csv writer cannot tell apart from `na_rep`).
+        """
+        chunk = df.copy()
+        for column, pg_type in types.items():
+            if pg_type == "jsonb":
+                chunk[column] = chunk[column].map(
+                    lambda v: json.dumps(v.tolist() if isinstance(v, np.ndarray) else v, default=str)
+                    if isinstance(v, NESTED_TYPES) else v
+                )
+            elif pg_type == "timestamptz":
+                chunk[column] = chunk[column].dt.tz_convert("UTC").dt.tz_localize(None)
+            elif isinstance(chunk[column].dtype, pd.CategoricalDtype):
+                chunk[column] = chunk[column].astype(object)
+
+        fields = []
+        for column, pg_type in types.items():
+            values = chunk[column]
+            if pg_type in ("text", "jsonb"):
+                field = '"' + values.astype(str).str.replace('"', '""', regex=False) + '"'
+            elif pg_type in ("timestamp", "timestamptz"):
+                field = values.dt.strftime("%Y-%m-%d %H:%M:%S.%f")
+            else:
+                field = values.astype(str)
+            fields.append(field.where(values.notna(), COPY_NULL))
+
+        return io.StringIO("".join(",".join(row) + "\n" for row in zip(*fields)))
+
+    @staticmethod
+    def quote(identifier: str) -> str:
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    def __copy_rows(self, cursor, qualified: str, df, types: dict) -> None:
+        """
+        Streams the frame or Arrow table into an existing table with `COPY FROM STDIN`,
+        `destination.chunk_size` rows at a time.
+        """
+        chunk_size = self.__data["destination"].get("chunk_size", 50000)
+        columns = ", ".join(self.quote(column) for column in types)
+
+        for start in range(0, len(df), chunk_size):
+            if isinstance(df, pa.Table):
+                chunk = self.copy_chunk_arrow(df.slice(start, chunk_size), types)
+            else:
+                chunk = self.copy_chunk(df.iloc[start:start + chunk_size], types)
+            cursor.copy_expert(f"COPY {qualified} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", chunk)
+
+    def __copy_to_postgres(self, engine, df, schema: str, table: str) -> dict:
+        """
+        Recreates `schema.table` with mapped column types and streams the frame in with
+        `COPY FROM STDIN`, all in one transaction.
+        """
+        types = self.column_types(df)
+        qualified = f'{self.quote(schema)}.{self.quote(table)}'
+
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                # naive timestamptz values in the stream are UTC
+                cursor.execute("SET LOCAL TIME ZONE 'UTC'")
+                cursor.execute(f"DROP TABLE IF EXISTS {qualified}")
+                cursor.execute(f"CREATE TABLE {qualified} ("
+                               + ", ".join(f"{self.quote(c)} {t}" for c, t in types.items()) + ")")
+                self.__copy_rows(cursor, qualified, df, types)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        return {"rows": len(df)}
+
+    def __merge_to_postgres(self, engine, df, schema: str, table: str) -> dict:
+        """
+        Upserts the frame into `schema.table` on `destination.key_columns`, in one transaction:
+        - creates the table and its unique key index on first load, adds new frame columns
+          (a table written by another mode gets the index too, duplicate keys keep their latest row;
+          an index over other columns, e.g. after `key_columns` changed, is rebuilt)
+        - bulk loads the frame into a temp table shaped like the target
+        - `INSERT ... ON CONFLICT DO UPDATE`, touching only rows whose values changed
+        - with `destination.delete_missing`, deletes target rows whose key is not in the frame
+        """
+        key_columns = self.__data["destination"]["key_columns"]
+        types = self.column_types(df)
+        missing_keys = [column for column in key_columns if column not in types]
+        if missing_keys:
+            raise KeyError(f"Merge key columns missing from frame: {missing_keys}")
+
+        qualified = f'{self.quote(schema)}.{self.quote(table)}'
+        staging = self.quote(f"_merge_{table}")
+        columns = [self.quote(column) for column in types]
+        keys = ", ".join(self.quote(column) for column in key_columns)
+        updates = [column for column in columns if column not in {self.quote(k) for k in key_columns}]
+
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                # naive timestamptz values in the stream are UTC
+                cursor.execute("SET LOCAL TIME ZONE 'UTC'")
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS {qualified} ("
+                               + ", ".join(f"{self.quote(c)} {t}" for c, t in types.items()) + ")")
+
+                # DDL only for what is missing, so routine merges take no exclusive lock while marts read
+                cursor.execute("SELECT column_name FROM information_schema.columns "
+                               "WHERE table_schema = %s AND table_name = %s", (schema, table))
+                existing = {row[0] for row in cursor.fetchall()}
+                for column, pg_type in types.items():
+                    if column not in existing:
+                        cursor.execute(f"ALTER TABLE {qualified} ADD COLUMN {self.quote(column)} {pg_type}")
+
+                # ON CONFLICT needs a unique index over exactly the key columns
+                index = f"{table}_merge_key"
+                cursor.execute(UNIQUE_INDEX_COLUMNS, (schema, index))
+                indexed = [row[0] for row in cursor.fetchall()]
+                if indexed != list(key_columns):
+                    if indexed:
+                        logger.warning(f"Rebuilding {schema}.{index} on {key_columns} (was {indexed})")
+                    cursor.execute(f"DROP INDEX IF EXISTS {self.quote(schema)}.{self.quote(index)}")
+                    # a table first written by replace / swap can repeat keys, the unique index would reject it
+                    cursor.execute(
+                        f"DELETE FROM {qualified} AS target USING {qualified} AS newer WHERE "
+                        + " AND ".join(f"target.{self.quote(k)} = newer.{self.quote(k)}" for k in key_columns)
+                        + " AND target.ctid < newer.ctid"
+                    )
+                    if cursor.rowcount:
+                        logger.warning(f"Removed {cursor.rowcount} duplicate key rows from {schema}.{table} "
+                                       f"before indexing {key_columns}")
+                    cursor.execute(f"CREATE UNIQUE INDEX {self.quote(index)} ON {qualified} ({keys})")
+
+                # the temp table takes the target's column types, COPY converts the text stream into them
+                cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {qualified}) ON COMMIT DROP")
+                self.__copy_rows(cursor, staging, df, types)
+
+                # a key repeated in the frame keeps its last row, rows without a key never conflict and are skipped
+                upsert = (
+                    f"INSERT INTO {qualified} AS target ({', '.join(columns)}) "
+                    f"SELECT DISTINCT ON ({keys}) {', '.join(columns)} FROM {staging} "
+                    f"WHERE {' AND '.join(f'{self.quote(k)} IS NOT NULL' for k in key_columns)} "
+                    f"ORDER BY {keys}, ctid DESC "
+                    f"ON CONFLICT ({keys}) "
+                )
+                if updates:
+                    upsert += (
+                        f"DO UPDATE SET {', '.join(f'{c} = EXCLUDED.{c}' for c in updates)} "
+                        f"WHERE ({', '.join(f'target.{c}' for c in updates)}) "
+                        f"IS DISTINCT FROM ({', '.join(f'EXCLUDED.{c}' for c in updates)})"
+                    )
+                else:
+                    upsert += "DO NOTHING"
+                cursor.execute(upsert)
+                upserted = cursor.rowcount
+
+                deleted = 0
+                if self.__data["destination"].get("delete_missing", False):
+                    cursor.execute(
+                        f"DELETE FROM {qualified} AS target WHERE NOT EXISTS (SELECT 1 FROM {staging} AS source WHERE "
+                        + " AND ".join(f"source.{self.quote(k)} = target.{self.quote(k)}" for k in key_columns) + ")"
+                    )
+                    deleted = cursor.rowcount
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        return {"rows": len(df), "rows_upserted": upserted, "rows_deleted": deleted}
+
+    def __swap_to_postgres(self, engine, df, schema: str, table: str) -> dict:
+        """
+        Full refresh without a window where the table is missing or half-written:
+        - loads the frame into an UNLOGGED shadow table and builds its indexes there
+          (`destination.indexes`, plus a unique index on `destination.key_columns` when set)
+        - switches the shadow to logged, then rename-swaps it with the live table in one short transaction
+        - drops the previous copy afterwards, a failed drop is logged and left for the next swap
+        Readers see the old table until the swap commits and the new one after it. Views on the live
+        table would be renamed along with it and then block the drop, so they make the swap fail upfront.
+        """
+        types = self.column_types(df)
+        shadow_table = f"{table}__shadow"
+        old_table = f"{table}__old"
+        qualified = f'{self.quote(schema)}.{self.quote(table)}'
+        shadow = f'{self.quote(schema)}.{self.quote(shadow_table)}'
+        old = f'{self.quote(schema)}.{self.quote(old_table)}'
+
+        indexes = {}
+        if self.__data["destination"].get("key_columns"):
+            indexes[f"{table}_merge_key"] = ("UNIQUE ", self.__data["destination"]["key_columns"])
+        for columns in self.__data["destination"].get("indexes") or []:
+            indexes[f"{table}_{'_'.join(columns)}_idx"] = ("", columns)
+
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(DEPENDENT_VIEWS, (qualified,))
+                views = [f"{row[0]}.{row[1]}" for row in cursor.fetchall()]
+            if views:
+                raise ValueError(f"Cannot swap {schema}.{table}, views depend on it: {', '.join(views)}. "
+                                 "Use mode merge or drop the views.")
+
+            with connection.cursor() as cursor:
+                # naive timestamptz values in the stream are UTC
+                cursor.execute("SET LOCAL TIME ZONE 'UTC'")
+                cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+                cursor.execute(f"CREATE UNLOGGED TABLE {shadow} ("
+                               + ", ".join(f"{self.quote(c)} {t}" for c, t in types.items()) + ")")
+                self.__copy_rows(cursor, shadow, df, types)
+
+                for name, (unique, columns) in indexes.items():
+                    cursor.execute(f"CREATE {unique}INDEX {self.quote(f'{name}__shadow')} ON {shadow} "
+                                   f"({', '.join(self.quote(c) for c in columns)})")
+
+                cursor.execute(f"ANALYZE {shadow}")
+                # written to WAL once, in bulk, while no reader uses the table
+                cursor.execute(f"ALTER TABLE {shadow} SET LOGGED")
+            connection.commit()
+
+            with connection.cursor() as cursor:
+                # renames need a brief exclusive lock on the live table, give up rather than queue behind long reads
+                cursor.execute(f"SET LOCAL lock_timeout = '{self.__data['destination'].get('lock_timeout', '30s')}'")
+                cursor.execute(f"DROP TABLE IF EXISTS {old}")
+                cursor.execute(f"ALTER TABLE IF EXISTS {qualified} RENAME TO {self.quote(old_table)}")
+                for name in indexes:
+                    cursor.execute(f"ALTER INDEX IF EXISTS {self.quote(schema)}.{self.quote(name)} "
+                                   f"RENAME TO {self.quote(f'{name}__old')}")
+                cursor.execute(f"ALTER TABLE {shadow} RENAME TO {self.quote(table)}")
+                for name in indexes:
+                    cursor.execute(f"ALTER INDEX {self.quote(schema)}.{self.quote(f'{name}__shadow')} "
+                                   f"RENAME TO {self.quote(name)}")
+            connection.commit()
+
+            # the swap is committed, a leftover copy is dropped by the next swap
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {old}")
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                logger.warning(f"Swapped {schema}.{table} but could not drop {old_table}:\n{traceback.format_exc()}")
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        return {"rows": len(df), "indexes": list(indexes)}
+
     def load_to_postgres(self):
+        """
+        Loads the provided DataFrame to the target PostgreSQL schema.table.
+        Uses SSL with a specified root certificate for encrypted communication.
+
+        Returns:
+            dict: result metadata including table name and status code.
+        """
         print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
 
         database = self.__data["destination"]["database"]
         schema = self.__data["destination"]["schema"]
         table = f'{self.__data["source_method"]}_{self.__data["destination"]["table"]}'
+        method = self.__data["destination"].get("method", "to_sql")
+        mode = self.__data["destination"].get("mode", "replace")
 
         try:
-            # GET THE POSTGRES SECRETS AND BUILD THE DB URI
+            # Build secure connection URI
             user = self.__secrets["POSTGRES_USER"]
             password = self.__secrets["POSTGRES_PASSWORD"]
             uri = self.__secrets["POSTGRES_URI"]
             port = self.__secrets["POSTGRES_PORT"]
-
-            # Path to your custom CA certificate inside the container
             ca_cert_path = os.environ.get('SSL_CERT_FILE', '/prefect/ca.crt')
 
-            # Define the DB URI with SSL mode and custom CA certificate
-            db_uri = f'postgresql://{user}:{password}@{uri}:{port}/{database}?sslmode=verify-full&sslrootcert={ca_cert_path}'
+            db_uri = (
+                f'postgresql://{user}:{password}@{uri}:{port}/{database}'
+                f'?sslmode=verify-full&sslrootcert={ca_cert_path}'
+            )
+
+            # pooled engine shared by every load to this DSN in the worker process
+            engine = ConnectionRegistry().get_engine(db_uri)
 
-            # Define the engine (connection object)
-            engine = create_engine(db_uri, echo=True)
+            # Arrow data path: the COPY loads write CSV straight from the table shared with the MinIO upload,
+            # to_sql (or a column type the Arrow CSV writer cannot encode) views it as pandas instead
+            df = self.__df_input
+            copies = method == "copy" or mode in ("merge", "swap")
+            if isinstance(df, pa.Table) and not (copies and self.column_types(df)):
+                df = df.to_pandas(split_blocks=True)
 
-            # Load the dataframe to PostgreSQL
-            self.__df_input.to_sql(table, con=engine, if_exists='replace', index=False, schema=schema)
+            counts = {"rows": len(df)}
+            if mode == "merge":
+                counts = self.__merge_to_postgres(engine, df, schema, table)
+            elif mode == "swap":
+                counts = self.__swap_to_postgres(engine, df, schema, table)
+            elif method == "copy":
+                counts = self.__copy_to_postgres(engine, df, schema, table)
+            else:
+                # Write DataFrame to the database
+                df.to_sql(
+                    name=table,
+                    con=engine,
+                    if_exists='replace',
+                    index=False,
+                    schema=schema
+                )
 
             return {
                 "result": {
@@ -62,6 +489,9 @@ class PostgresLoad:
                     "database": database,
                     "schema": schema,
                     "table": table,
+                    "method": method,
+                    "mode": mode,
+                    **counts,
                     "content-type": "application/json",
                     "message": "Data loaded successfully",
                 }
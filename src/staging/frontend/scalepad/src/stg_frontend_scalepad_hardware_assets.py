@@ -23,11 +23,27 @@ results_list = []
 
 # API [EXTRACT]
 @task(tags=["extract", "get", "api", "batch"])
-def extract_scalepad_frontend_hardware_assets(config: dict, vault: VaultManager, otp_gen=GenerateOTP):
+def extract_scalepad_frontend_hardware_assets(config: dict, vault: VaultManager, otp_gen=GenerateOTP, dtypes_dir: str = None,
+                                               csv_schema_dir: str = None, scope: dict = None):
     try:
         scalepad = ExtractScalepad(config=config, vault=vault, otp_gen=otp_gen)
 
-        data = scalepad.create_hardware_assets_dataframe()
+        if config["DATA"].get("mode", "spreadsheet") == "console":
+            # paged console API, optionally scoped to one client for a partial refresh
+            data = scalepad.create_hardware_assets_console_dataframe(scope=scope)
+        else:
+            # declared column types let the Arrow reader parse dates and flags while streaming
+            convert_options = None
+            if csv_schema_dir:
+                csv_schema = load_csv_schema(schema_dir=csv_schema_dir)
+                if csv_schema["result"]["status_code"] != 200:
+                    # an unreadable schema fails the flow with its own traceback, not a KeyError on "data"
+                    results_list.append(csv_schema["result"])
+                    print(csv_schema["result"]["status_message"])
+                    sys.exit(1)
+                convert_options = arrow_convert_options(csv_schema["data"])
+
+            data = scalepad.create_hardware_assets_dataframe(convert_options=convert_options)
         result = data["result"]
         results_list.append(result)
         df = data["data"]
@@ -38,6 +54,17 @@ def extract_scalepad_frontend_hardware_assets(config: dict, vault: VaultManager,
         df['_SOURCE_ORIGIN'] = config["DATA"]["origin"]
         df['_UTC_EXTRACTION_DATETIME'] = config["TIMESTAMPS"]["_IN_DATA_TIMESTAMP"]
 
+        # compact dtypes right after modeling, logs memory before / after
+        if dtypes_dir:
+            schema = load_dtype_schema(schema_dir=dtypes_dir)
+            if schema["result"]["status_code"] != 200:
+                results_list.append(schema["result"])
+                print(schema["result"]["status_message"])
+                sys.exit(1)
+            data = optimize_dtypes(df, schema["data"])
+            results_list.append(data["result"])
+            df = data["data"]
+
         return df
 
     except Exception as e:
@@ -75,29 +102,29 @@ def load_minio(df: pd.DataFrame, config: dict, vault: VaultManager) -> None:
         sys.exit(1)
 
 
-# # DataFrame [TRANSFORM]
-# @task(tags=["transform"])
-# def transform_dataframe(df, config: dict):
-#     try:
-#         transform = TransformApiscalepad(df)
-#         data = transform.transform_hardware_assets_dataframe()
-#         result = data["result"]
-#         df = data["data"]
-#         results_list.append(result)
-#
-#         return df
-#
-#     except Exception as e:
-#         t = traceback.format_exc()
-#         result = {
-#             "task_name": inspect.currentframe().f_code.co_name,
-#             "status_code": 500,
-#             "message": f"Error: {e}",
-#         }
-#
-#         results_list.append(result)
-#         print(results_list)
-#         sys.exit(1)
+# DataFrame [TRANSFORM]
+@task(tags=["transform"])
+def transform_dataframe(df, config: dict):
+    try:
+        transform = TransformLifecycleManager(df)
+        data = transform.transform_hardware_assets_dataframe()
+        result = data["result"]
+        df = data["data"]
+        results_list.append(result)
+
+        return df
+
+    except Exception as e:
+        t = traceback.format_exc()
+        result = {
+            "task_name": inspect.currentframe().f_code.co_name,
+            "status_code": 500,
+            "message": f"Error: {e}",
+        }
+
+        results_list.append(result)
+        print(results_list)
+        sys.exit(1)
 
 
 # Postgres [LOAD]
@@ -126,16 +153,20 @@ def load_postgres(df: pd.DataFrame, config: dict, vault: VaultManager) -> None:
 
 # RUN FLOW
 @flow
-def stg_frontend_scalepad_hardware_assets() -> None:
+def stg_frontend_scalepad_hardware_assets(scope: dict = None) -> None:
     print(f"The script is being run from: {os.getcwd()}")
-    tasks = prepare_tasks(config_dir=f"{Path(__file__).parent.resolve()}/config/assets/config.yaml")["data"]
+    config_dir = f"{Path(__file__).parent.resolve()}/config/assets"
+    tasks = prepare_tasks(config_dir=f"{config_dir}/config.yaml")["data"]
 
     vault = VaultManager()
     otp_gen = GenerateOTP()
 
-    df = extract_scalepad_frontend_hardware_assets(config=tasks[0], vault=vault, otp_gen=otp_gen)
+    df = extract_scalepad_frontend_hardware_assets(config=tasks[0], vault=vault, otp_gen=otp_gen,
+                                                   dtypes_dir=f"{config_dir}/{tasks[0]['DATA']['dtypes']}",
+                                                   csv_schema_dir=f"{config_dir}/{tasks[0]['DATA']['csv_schema']}",
+                                                   scope=scope)
     load_minio(df=df, config=tasks[1], vault=vault)  # review if this is needed to be stored for later retrieval
-    # df = transform_dataframe(df, tasks[2])
+    df = transform_dataframe(df, tasks[2])
     load_postgres(df=df, config=tasks[3], vault=vault)
 
     print("#" * 75)
@@ -1,19 +1,191 @@
+"""
+Transform logic for Scalepad Lifecycle Manager hardware asset exports.
+
+This class performs:
+- Normalization of spreadsheet headers into snake_case column names
+- First-tag extraction from the tags list
+- Column-wise parsing of purchase and warranty dates
+- Vectorized warranty-remaining flags and device age
+- Compact dtypes for flags, day counts and low-cardinality labels
+
+All transformations modify `self.__df` in place.
+"""
+
 import traceback  # view stack
 import inspect  # get function name
 import sys
 import re
+import numpy as np
 import pandas as pd  # dataframe manipulation
+from loguru import logger
+
+# snake_case headers parsed as dates: purchased, expires, warranty_expires, last_seen, *_date ...
+DATE_COLUMN_PATTERN = re.compile(r'^(purchased|expires|.*_expires|.*_date|date_.*|last_seen|.*_on)$')
+
+# headers Scalepad uses for the warranty end and purchase dates, first present column wins
+WARRANTY_COLUMNS = ['warranty_expires', 'expires']
+PURCHASE_COLUMNS = ['purchased', 'purchase_date']
+
+# warranty windows flagged ahead of expiry, in days
+WARRANTY_WINDOWS = [30, 90, 365]
+
+# string columns with fewer distinct values than this share of rows become categories
+CATEGORY_RATIO = 0.5
 
 
 class TransformLifecycleManager:
+    """
+    Applies transformation logic to the Scalepad hardware assets dataset.
+    """
+
     def __init__(self, df: pd.DataFrame) -> None:
         self.__df = df
 
+        self.normalize_column_names()
         # keep first index of tags list
         self.transform_tags()
-
+        self.parse_date_columns()
+        self.append_warranty_columns()
+        self.apply_compact_dtypes()
 
     @property
     def df(self) -> pd.DataFrame:
         return self.__df
 
+    def transform_hardware_assets_dataframe(self) -> dict:
+        """
+        Returns the transformed dataframe and status metadata.
+        """
+        return {
+            "data": self.__df,
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 200,
+                "message": "DataFrame created successfully"
+            }
+        }
+
+    @staticmethod
+    def snake_case(column: str) -> str:
+        """
+        "Warranty Expires" -> "warranty_expires", "OS Version (Build)" -> "os_version_build".
+        Marker columns (`_SOURCE_*`, `_UTC_*`) are returned unchanged.
+        """
+        if column.startswith('_'):
+            return column
+
+        column = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', column.strip())
+        return re.sub(r'[^0-9a-zA-Z]+', '_', column).strip('_').lower()
+
+    def normalize_column_names(self) -> None:
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            self.__df.columns = [self.snake_case(str(column)) for column in self.__df.columns]
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
+
+    def transform_tags(self) -> None:
+        """
+        Reduces the 'tags' column (list or comma separated string) to its first tag.
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            if 'tags' not in self.__df.columns:
+                return
+
+            tags = self.__df['tags']
+            is_list = tags.map(lambda v: isinstance(v, (list, tuple, np.ndarray)))
+            first_listed = tags[is_list].map(lambda v: v[0] if len(v) else None)
+            first_split = tags[~is_list].astype(object).where(tags[~is_list].notna(), None) \
+                .str.split(',').str[0].str.strip()
+
+            self.__df['tags'] = pd.concat([first_listed, first_split]).reindex(self.__df.index).astype(object)
+            self.__df['tags'] = self.__df['tags'].where(self.__df['tags'].notna() & (self.__df['tags'] != ''), None)
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
+
+    def parse_date_columns(self) -> None:
+        """
+        Parses purchase, warranty and other date columns that are not already datetimes.
+        Unparseable values become NaT.
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            for column in self.__df.columns:
+                if not DATE_COLUMN_PATTERN.match(column) or pd.api.types.is_datetime64_any_dtype(self.__df[column]):
+                    continue
+
+                self.__df[column] = pd.to_datetime(self.__df[column], errors='coerce', format='mixed')
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
+
+    def append_warranty_columns(self) -> None:
+        """
+        Adds, from the warranty end and purchase dates:
+        - warranty_days_remaining (negative once expired)
+        - is_warranty_expired
+        - warranty_expires_<n>_days for each window in WARRANTY_WINDOWS
+        - device_age_years
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            today = pd.Timestamp.now().normalize()
+
+            warranty_column = next((c for c in WARRANTY_COLUMNS if c in self.__df.columns), None)
+            if warranty_column:
+                expires = pd.to_datetime(self.__df[warranty_column])
+                days_remaining = (expires - today).dt.days
+
+                self.__df['warranty_days_remaining'] = days_remaining.astype('Int32')
+                self.__df['is_warranty_expired'] = (days_remaining < 0).astype('boolean').mask(days_remaining.isna())
+                for window in WARRANTY_WINDOWS:
+                    self.__df[f'warranty_expires_{window}_days'] = \
+                        days_remaining.between(0, window).astype('boolean').mask(days_remaining.isna())
+
+            purchase_column = next((c for c in PURCHASE_COLUMNS if c in self.__df.columns), None)
+            if purchase_column:
+                purchased = pd.to_datetime(self.__df[purchase_column])
+                self.__df['device_age_years'] = ((today - purchased).dt.days / 365.25).round(2).astype('Float32')
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
+
+    def apply_compact_dtypes(self) -> None:
+        """
+        Converts repetitive string columns to categories so joins and loads work on typed data.
+        Marker columns and columns already compacted at extraction are left as they are.
+        """
+        print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+        try:
+            row_count = len(self.__df)
+            for column in self.__df.columns:
+                values = self.__df[column]
+                if column.startswith('_') or not (pd.api.types.is_object_dtype(values)
+                                                  or pd.api.types.is_string_dtype(values)):
+                    continue
+                if isinstance(values.dtype, pd.CategoricalDtype) or values.map(type).eq(list).any():
+                    continue
+
+                if row_count and values.nunique(dropna=True) < row_count * CATEGORY_RATIO:
+                    self.__df[column] = values.where(values.notna(), None).astype('category')
+        except Exception:
+            t = traceback.format_exc()
+            print(t)
+            logger.error(t)
+            sys.exit(t)
@@ -1,4 +1,10 @@
 from .otp_mgr import  GenerateOTP
 from .vault_mgr import VaultManager
 from .flow_deploy import extract_deploy_kwargs_from_yaml
-from .task_prep import prepare_tasks
\ No newline at end of file
+from .task_prep import prepare_tasks
+from .dtype_mgr import load_dtype_schema, optimize_dtypes
+from .csv_schema_mgr import load_csv_schema, arrow_convert_options
+from .connection_mgr import ConnectionRegistry
+from .upload_stream_mgr import stream_upload, write_chunks, UploadStream
+from .parquet_mgr import parquet_settings, sort_rows, write_parquet
+from .dataset_mgr import partition_values, partition_path, file_entry, read_manifest, update_manifest
@@ -0,0 +1,165 @@
+"""
+Dtype Optimization Utility
+
+Shrinks a modeled pandas DataFrame by converting columns to compact dtypes declared in a per-table
+schema YAML (`dtypes.yaml` beside the table's config.yaml):
+
+    COLUMNS:
+      site_name: category         # low-cardinality strings
+      online: boolean             # nullable boolean instead of object True/False/None
+      patches_installed: Int64    # nullable integers (Int8 / Int16 / Int32 / Int64)
+      hostname: string            # Arrow-backed strings
+      udf*: string                # fnmatch patterns, case-insensitive
+
+Columns that no pattern matches, or that fail to convert, are left untouched so a schema can be
+shared across API versions. Arrow tables pass through unchanged; they are already compact.
+"""
+
+import fnmatch
+import inspect
+import traceback
+
+import pandas as pd
+import pyarrow as pa
+import yaml
+from loguru import logger
+
+DTYPES = {
+    "category": "category",
+    "boolean": "boolean",
+    "Int8": "Int8",
+    "Int16": "Int16",
+    "Int32": "Int32",
+    "Int64": "Int64",
+    "Float32": "Float32",
+    "Float64": "Float64",
+    "string": "string[pyarrow]",
+}
+
+
+def load_dtype_schema(schema_dir: str = "./dtypes.yaml") -> dict:
+    """
+    Loads a dtype schema YAML and validates its dtype names.
+
+    Args:
+        schema_dir (str): Full or relative path to the schema YAML file.
+
+    Returns:
+        dict: {"data": {"COLUMNS": {pattern: dtype}}, "result": {...}}
+    """
+    try:
+        with open(schema_dir, "r") as stream:
+            schema = yaml.safe_load(stream)
+
+        for pattern, dtype in schema["COLUMNS"].items():
+            if dtype not in DTYPES:
+                raise ValueError(f'Unsupported dtype "{dtype}" for column pattern "{pattern}"')
+
+        return {
+            "data": schema,
+            "result": {
+                "task_name": inspect.currentframe().f_code.co_name,
+                "status_message": "Success",
+                "status_code": 200,
+            }
+        }
+
+    except Exception:
+        return {
+            "result": {
+                "task_name": inspect.currentframe().f_code.co_name,
+                "status_message": traceback.format_exc(),
+                "status_code": 500,
+            }
+        }
+
+
+def _resolve_dtype(column: str, columns: dict) -> str | None:
+    """Returns the dtype of the first schema pattern matching the column name."""
+    for pattern, dtype in columns.items():
+        if fnmatch.fnmatch(str(column).lower(), str(pattern).lower()):
+            return dtype
+    return None
+
+
+def _convert(values: pd.Series, dtype: str) -> pd.Series:
+    """Converts a single column to a schema dtype."""
+    if dtype.startswith(("Int", "Float")):
+        values = pd.to_numeric(values, errors="raise")
+    elif dtype == "category":
+        # categories over None keep missing values as NaN codes rather than a "None" category
+        values = values.where(values.notna(), None)
+
+    return values.astype(DTYPES[dtype])
+
+
+def optimize_dtypes(df, schema: dict) -> dict:
+    """
+    Converts the columns matched by the schema and reports memory before and after.
+
+    Args:
+        df (pd.DataFrame | pa.Table): Modeled frame.
+        schema (dict): Loaded dtype schema ({"COLUMNS": {pattern: dtype}}).
+
+    Returns:
+        dict: {"data": frame, "result": {..., "memory_before_mb", "memory_after_mb", "skipped"}}
+    """
+    print(f'\n============  [START] - {inspect.currentframe().f_code.co_name}  ============\n')
+
+    try:
+        if isinstance(df, pa.Table):
+            return {
+                "data": df,
+                "result": {
+                    "job_title": inspect.currentframe().f_code.co_name,
+                    "status_code": 200,
+                    "memory_before_mb": round(df.nbytes / 1024 ** 2, 2),
+                    "memory_after_mb": round(df.nbytes / 1024 ** 2, 2),
+                    "message": "Arrow table left unchanged"
+                }
+            }
+
+        memory_before = df.memory_usage(deep=True).sum()
+        skipped = []
+
+        for column in df.columns:
+            dtype = _resolve_dtype(column, schema["COLUMNS"])
+            if dtype is None or str(df[column].dtype) == DTYPES[dtype]:
+                continue
+
+            try:
+                df[column] = _convert(df[column], dtype)
+            except (TypeError, ValueError, pa.ArrowException):
+                # a column that does not fit its declared dtype is kept as-is rather than failing the load
+                skipped.append(column)
+                logger.warning(f'Column "{column}" could not be converted to {dtype}, keeping {df[column].dtype}')
+
+        memory_after = df.memory_usage(deep=True).sum()
+        logger.info(
+            f"Frame memory: {memory_before / 1024 ** 2:.2f} MB -> {memory_after / 1024 ** 2:.2f} MB "
+            f"({len(df)} rows, {len(df.columns)} columns)"
+        )
+
+        return {
+            "data": df,
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 200,
+                "memory_before_mb": round(float(memory_before) / 1024 ** 2, 2),
+                "memory_after_mb": round(float(memory_after) / 1024 ** 2, 2),
+                "skipped": skipped,
+                "message": "DataFrame dtypes optimized"
+            }
+        }
+
+    except Exception:
+        t = traceback.format_exc()
+        logger.error(t)
+        return {
+            "data": df,
+            "result": {
+                "job_title": inspect.currentframe().f_code.co_name,
+                "status_code": 500,
+                "message": t
+            }
+        }
@@ -0,0 +1,116 @@
+"""
+Parquet Layout Utility
+
+Reads the optional `parquet` block of a MinIO destination and writes Parquet files with it:
+
+    destination:
+      file_type: parquet
+      parquet:
+        compression: zstd         # str ["zstd", "snappy", "lz4", "gzip", "brotli", "none"]
+        compression_level: 3      # int | None codec level (zstd, gzip, brotli)
+        row_group_size: 100000    # int | None rows per row group
+        use_dictionary: true      # bool dictionary-encode columns
+        write_statistics: true    # bool min/max page statistics for predicate pushdown
+        sort_by: [site_id, hostname]  # list clustering key, rows sorted before writing
+
+Omitted keys keep pyarrow's defaults, so a destination without the block writes the same file
+as `to_parquet(index=False)`.
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CODECS = ["zstd", "snappy", "lz4", "gzip", "brotli", "none"]
+
+# codecs accepting a compression level
+LEVEL_CODECS = ["zstd", "gzip", "brotli"]
+
+DEFAULT_SETTINGS = {
+    "compression": "snappy",
+    "compression_level": None,
+    "row_group_size": None,
+    "use_dictionary": True,
+    "write_statistics": True,
+    "sort_by": [],
+}
+
+
+def parquet_settings(parquet: dict = None) -> dict:
+    """
+    Validates a destination `parquet` block and fills in defaults.
+
+    Args:
+        parquet (dict): Configured Parquet options, may be None.
+
+    Returns:
+        dict: Complete settings, also reported in the load result.
+    """
+    settings = {**DEFAULT_SETTINGS, **{k: v for k, v in (parquet or {}).items() if v is not None}}
+    unknown = set(settings) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unsupported Parquet options: {sorted(unknown)}")
+
+    settings["compression"] = str(settings["compression"]).lower()
+    if settings["compression"] not in CODECS:
+        raise ValueError(f'Unsupported Parquet compression "{settings["compression"]}"')
+    if settings["compression_level"] is not None and settings["compression"] not in LEVEL_CODECS:
+        raise ValueError(f'Compression "{settings["compression"]}" does not take a level')
+
+    sort_by = settings["sort_by"]
+    settings["sort_by"] = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+    return settings
+
+
+def sort_rows(data, sort_by: list):
+    """
+    Sorts a DataFrame or Arrow table on the clustering key (stable, nulls last).
+    """
+    if not sort_by:
+        return data
+    if isinstance(data, pa.Table):
+        return data.sort_by([(column, "ascending") for column in sort_by])
+    return data.sort_values(sort_by, kind="stable", na_position="last", ignore_index=True)
+
+
+def write_parquet(data, sink, settings: dict, chunk_rows: int = None) -> int:
+    """
+    Writes `data` to `sink` as Parquet, one row group per chunk.
+
+    Args:
+        data (pd.DataFrame | pa.Table): Rows to write.
+        sink: Writable file-like object or Arrow output stream.
+        settings (dict): Output of `parquet_settings`.
+        chunk_rows (int): Rows per row group when `row_group_size` is not configured
+            (None writes one row group, capped by pyarrow's default maximum).
+
+    Returns:
+        int: Number of chunks written.
+    """
+    data = sort_rows(data, settings["sort_by"])
+    is_table = isinstance(data, pa.Table)
+    # schema inferred once over the whole frame so every row group shares it
+    schema = data.schema if is_table else pa.Schema.from_pandas(data, preserve_index=False)
+
+    chunk_rows = settings["row_group_size"] or chunk_rows or max(len(data), 1)
+    starts = range(0, max(len(data), 1), chunk_rows)
+
+    writer_options = {
+        "compression": settings["compression"],
+        "compression_level": settings["compression_level"],
+        "use_dictionary": settings["use_dictionary"],
+        "write_statistics": settings["write_statistics"],
+    }
+    if settings["sort_by"]:
+        # recorded in the row group metadata so readers can rely on the order
+        writer_options["sorting_columns"] = pq.SortingColumn.from_ordering(
+            schema, [(column, "ascending") for column in settings["sort_by"]], null_placement="at_end"
+        )
+
+    with pq.ParquetWriter(sink, schema, **writer_options) as writer:
+        for start in starts:
+            part = data.slice(start, chunk_rows) if is_table else data.iloc[start:start + chunk_rows]
+            if not is_table:
+                part = pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+            writer.write_table(part, row_group_size=chunk_rows)
+
+    return len(starts)
@@ -123,3 +123,7 @@ class VaultManager:
         """Reads a secret from HashiCorp Vault at the specified mount point and path."""
         resp = self.__client.secrets.kv.read_secret(mount_point=mount_point, path=f'/{path}')
         return resp['data']['data']  # Extracts and returns the secret data
+
+    def write_secret(self, mount_point: str, path: str, secret: dict) -> None:
+        """Creates or updates a secret in HashiCorp Vault at the specified mount point and path."""
+        self.__client.secrets.kv.create_or_update_secret(mount_point=mount_point, path=f'/{path}', secret=secret)
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+
+import yaml
+import pytest
+import pandas as pd
+from pyarrow import fs
+
+# test: ["duckdb mart"]
+from src.marts.transforms.src.utilities.duckdb_mgr import DuckDBMart, view_statements
+from src.marts.transforms.src.utilities.staging_mgr import StagingReader
+from src.marts.transforms.src.utilities.object_cache_mgr import ObjectCache
+from src.marts.transforms.src.utilities.dataset_mgr import file_entry, partition_path, manifest_path
+
+SRC_DIR = Path(__file__).parents[4] / "src"
+
+VIEWS = {
+    "staging.datto_rmm.api_devices": {"product": "datto_rmm", "subject": "devices", "source_method": "api"},
+    "staging.datto_rmm.api_activity_logs_patch": {"product": "datto_rmm", "subject": "activity_logs_patch",
+                                                  "source_method": "api", "mode": "history", "key_columns": ["id"]},
+}
+
+
+def staged_datasets() -> dict:
+    """(product, subject, source_method) -> MinIO destination of every Minio [LOAD] task in the staging configs."""
+    datasets = {}
+    for path in (SRC_DIR / "staging").glob("*/*/src/config/*/config.yaml"):
+        for task in yaml.safe_load(path.read_text()).get("TASKS") or []:
+            if (task["DETAILS"].get("task_title") or "").startswith("Minio [LOAD]"):
+                dataset = (task["DETAILS"]["product"], task["DETAILS"]["subject"], task["DATA"]["source_method"])
+                datasets[dataset] = task["DATA"]["destination"]
+    return datasets
+
+
+@pytest.mark.marts
+class TestDuckDBMart:
+
+    @pytest.fixture
+    def reader(self, tmp_path):
+        """Two devices snapshots and two overlapping activity log runs, read through a local object cache."""
+        bucket = tmp_path / "staging"
+        runs = {
+            "devices": [
+                ("01", pd.DataFrame({"uid": ["u1", "u2"], "hostname": ["old-1", "old-2"]})),
+                ("02", pd.DataFrame({"uid": ["u1", "u2"], "hostname": ["host-1", "host-2"]})),
+            ],
+            "activity_logs_patch": [
+                ("01", pd.DataFrame({"id": [1, 2], "device_uid": ["u1", "u2"], "action": ["start", "start"]})),
+                ("02", pd.DataFrame({"id": [2, 3], "device_uid": ["u2", "u1"], "action": ["done", "start"]})),
+            ],
+        }
+
+        for subject, frames in runs.items():
+            files = []
+            for hour, df in frames:
+                partition = {"source_method": "api", "year": "2024", "month": "01", "day": "31"}
+                path = partition_path("datto_rmm", subject, partition, f"api_2024_01_31_{hour}0000.parquet")
+                (bucket / path).parent.mkdir(parents=True, exist_ok=True)
+                df.to_parquet(bucket / path, index=False)
+                files.append(file_entry(path, df, partition, size=(bucket / path).stat().st_size,
+                                        extracted_at=f"2024-01-31 {hour}:00:00", stats_columns=[],
+                                        etag=str((bucket / path).stat().st_mtime_ns)))
+            (bucket / manifest_path("datto_rmm", subject)).write_text(json.dumps({"version": 2, "files": files}))
+
+        cache = ObjectCache(str(tmp_path / "cache"), max_bytes=10**8)
+        return StagingReader(filesystem=fs.LocalFileSystem(), bucket=str(bucket), cache=cache)
+
+    def test_view_statements(self):
+        snapshot = view_statements("staging.datto_rmm.api_devices", ["/c/a's.parquet"])
+        assert snapshot[0] == "ATTACH IF NOT EXISTS ':memory:' AS \"staging\""
+        assert snapshot[1] == 'CREATE SCHEMA IF NOT EXISTS "staging"."datto_rmm"'
+        assert "read_parquet(['/c/a''s.parquet']" in snapshot[2]
+        assert snapshot[2].startswith('CREATE OR REPLACE VIEW "staging"."datto_rmm"."api_devices"')
+
+        history = view_statements("api_logs", ["a", "b"], mode="history", key_columns=["id"])
+        assert len(history) == 1 and 'PARTITION BY "id"' in history[0]
+
+        with pytest.raises(ValueError):
+            view_statements("api_logs", ["a"], mode="history")
+
+    def test_configured_views_are_staged(self):
+        """Every view of the mart config reads a dataset some staging flow writes in hive layout (with a manifest)."""
+        datasets = staged_datasets()
+        config = yaml.safe_load((SRC_DIR / "marts/transforms/src/config/main/config.yaml").read_text())
+
+        for name, view in config["DUCKDB"]["VIEWS"].items():
+            dataset = (view["product"], view["subject"], view.get("source_method"))
+            assert datasets.get(dataset, {}).get("layout") == "hive", name
+
+    def test_uncached_reader_needs_credentials(self, tmp_path):
+        with pytest.raises(ValueError):
+            DuckDBMart(reader=StagingReader(filesystem=fs.LocalFileSystem(), bucket=str(tmp_path)), views=VIEWS)
+
+    def test_referenced_views(self, reader):
+        mart = DuckDBMart(reader=reader, views=VIEWS)
+        assert mart.referenced_views("select * from STAGING.datto_rmm.api_devices") == ["staging.datto_rmm.api_devices"]
+
+    def test_run_mart_sql(self, reader):
+        pytest.importorskip("duckdb")
+        mart = DuckDBMart(reader=reader, views=VIEWS, settings={"threads": 2, "VIEWS": VIEWS})
+
+        data = mart.run(
+            """
+            select dd.hostname, dalp.id, dalp.action
+            from staging.datto_rmm.api_activity_logs_patch dalp
+                     join staging.datto_rmm.api_devices dd on dalp.device_uid = dd.uid
+            order by dalp.id
+            """
+        )
+
+        assert data["result"]["status_code"] == 200
+        assert data["data"].rows() == [("host-1", 1, "start"), ("host-2", 2, "done"), ("host-1", 3, "start")]
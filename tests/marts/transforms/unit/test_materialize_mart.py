@@ -0,0 +1,127 @@
+import pytest
+
+# test: ["server-side mart materialization"]
+from src.marts.transforms.src.utilities.materialize_mgr import MartMaterializer, rewrite_query, COMMENT_PREFIX, \
+    DEPENDENT_VIEWS
+
+QUERY = """
+select dd.id, eoldw.eol_date
+from staging.datto_rmm.api_devices dd
+         left join STAGING.end_of_life_date.api_windows as eoldw on dd.os_build = eoldw.os_build;
+"""
+
+SCHEMAS = {"staging.datto_rmm": "staging_datto_rmm", "staging.end_of_life_date": "staging_end_of_life_date"}
+
+
+class Server:
+    """
+    Records the statements sent over a raw connection; `relations` answers the pg_class lookups,
+    `dependents` the pg_depend one, statements starting with `failing` raise.
+    """
+
+    def __init__(self, relations: dict, dependents: list = None, failing: str = None) -> None:
+        self.relations = relations
+        self.dependents = dependents or []
+        self.failing = failing
+        self.statements = []
+
+    def raw_connection(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        if self.failing and statement.startswith(self.failing):
+            raise RuntimeError(f"cannot run {statement}")
+        self.statements.append(statement)
+        if statement == DEPENDENT_VIEWS:
+            self.rows = self.dependents
+        else:
+            self.row = self.relations.get(params[1]) if params else (42,)
+
+    def fetchone(self):
+        return self.row
+
+    def fetchall(self):
+        return self.rows
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.marts
+class TestMartMaterializer:
+
+    def test_rewrite_query(self):
+        query = rewrite_query(QUERY, SCHEMAS)
+        assert 'from "staging_datto_rmm".api_devices dd' in query
+        assert 'join "staging_end_of_life_date".api_windows' in query
+        assert not query.endswith(";")
+        assert rewrite_query(QUERY) == QUERY.strip().rstrip(";")
+
+    def test_matview_needs_key_columns(self):
+        with pytest.raises(ValueError):
+            MartMaterializer(Server({}), "public", "mart", QUERY, settings={"materialize": "matview"})
+
+    def test_first_run_builds_and_swaps(self):
+        server = Server({"mart": ("r", None)})
+        mart = MartMaterializer(server, "public", "mart", QUERY, key_columns=["id"],
+                                settings={"materialize": "matview", "schemas": SCHEMAS})
+
+        data = mart.materialize()
+        statements = [s for s in server.statements if not s.startswith("SELECT")]
+
+        assert data["result"]["status_code"] == 200 and data["data"] == {"action": "rebuild", "rows": 42}
+        assert statements[0].startswith('CREATE MATERIALIZED VIEW "public"."mart__shadow" AS')
+        assert 'CREATE UNIQUE INDEX "mart_key__shadow" ON "public"."mart__shadow" ("id")' in statements
+        assert 'ALTER TABLE "public"."mart" RENAME TO "mart__old"' in statements
+        assert 'ALTER MATERIALIZED VIEW "public"."mart__shadow" RENAME TO "mart"' in statements
+        assert 'DROP TABLE "public"."mart__old"' in statements
+
+    def test_current_matview_refreshes_concurrently(self):
+        first = Server({})
+        MartMaterializer(first, "public", "mart", QUERY, key_columns=["id"],
+                         settings={"materialize": "matview"}).materialize()
+        comment = next(s for s in first.statements if s.startswith("COMMENT ON")).split("IS ")[1].strip("'")
+        assert comment.startswith(COMMENT_PREFIX)
+
+        server = Server({"mart": ("m", comment)})
+        data = MartMaterializer(server, "public", "mart", QUERY, key_columns=["id"],
+                                settings={"materialize": "matview"}).materialize()
+
+        assert data["data"]["action"] == "refresh"
+        assert 'REFRESH MATERIALIZED VIEW CONCURRENTLY "public"."mart"' in server.statements
+
+        # an edited SQL file no longer matches the stored hash
+        edited = Server({"mart": ("m", comment)})
+        query = QUERY.replace("dd.id,", "dd.id, dd.hostname,")
+        data = MartMaterializer(edited, "public", "mart", query, key_columns=["id"],
+                                settings={"materialize": "matview"}).materialize()
+        assert data["data"]["action"] == "rebuild"
+
+    def test_rebuild_refused_under_dependent_views(self):
+        server = Server({"mart": ("r", None)}, dependents=[("reports", "mart_summary")])
+        data = MartMaterializer(server, "public", "mart", QUERY, settings={"materialize": "table"}).materialize()
+
+        assert data["result"]["status_code"] == 500 and "reports.mart_summary" in data["result"]["message"]
+        assert not any(s.startswith(("CREATE", "ALTER", "DROP")) for s in server.statements)
+
+    def test_failed_cleanup_is_not_a_failed_rebuild(self):
+        server = Server({"mart": ("r", None)}, failing='DROP TABLE "public"."mart__old"')
+        data = MartMaterializer(server, "public", "mart", QUERY, settings={"materialize": "table"}).materialize()
+
+        assert data["result"]["status_code"] == 200 and data["data"]["action"] == "rebuild"
+        assert 'ALTER TABLE "public"."mart__shadow" RENAME TO "mart"' in server.statements
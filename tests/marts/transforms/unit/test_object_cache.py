@@ -0,0 +1,90 @@
+import multiprocessing
+
+import pytest
+
+# test: ["object cache"]
+from src.marts.transforms.src.utilities.object_cache_mgr import ObjectCache
+
+
+def fill_from_process(cache_dir, counter_path):
+    def fetch(target):
+        with open(counter_path, "a") as counter:
+            counter.write("x")
+        target.write(b"parquet-bytes" * 1_000)
+
+    ObjectCache(cache_dir, max_bytes=10**9).get("staging", "devices/run.parquet", "etag-1", fetch)
+
+
+@pytest.mark.marts
+class TestObjectCache:
+
+    def test_fill_hit_and_etag_change(self, tmp_path):
+        cache = ObjectCache(str(tmp_path), max_bytes=10**6)
+        calls = []
+
+        def fetch(target):
+            calls.append(1)
+            target.write(b"v1")
+
+        path = cache.get("staging", "devices/run.parquet", "etag-1", fetch)
+        assert cache.get("staging", "devices/run.parquet", "etag-1", fetch) == path
+        assert len(calls) == 1
+        assert cache.open("staging", "devices/run.parquet", "etag-1", fetch).read() == b"v1"
+
+        assert cache.get("staging", "devices/run.parquet", "etag-2", fetch) != path
+        assert len(calls) == 2
+
+    def test_failed_fill_leaves_no_entry(self, tmp_path):
+        cache = ObjectCache(str(tmp_path), max_bytes=10**6)
+
+        def fetch(target):
+            target.write(b"partial")
+            raise ConnectionError("download interrupted")
+
+        with pytest.raises(ConnectionError):
+            cache.get("staging", "devices/run.parquet", "etag-1", fetch)
+        assert cache.size() == 0
+        assert not list(tmp_path.glob("*/*.tmp"))
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ObjectCache(str(tmp_path), max_bytes=2_500)
+        fetch = lambda target: target.write(b"x" * 1_000)
+
+        first = cache.get("staging", "a.parquet", "1", fetch)
+        cache.get("staging", "b.parquet", "1", fetch)
+        cache.get("staging", "a.parquet", "1", fetch)  # hit: "a" becomes most recently used
+        cache.get("staging", "c.parquet", "1", fetch)  # 3000 bytes > 2500: evicts "b"
+
+        assert cache.size() == 2_000
+        assert cache.path_for("staging", "b.parquet", "1").exists() is False
+        assert cache.get("staging", "a.parquet", "1", lambda target: pytest.fail("refetched")) == first
+
+    def test_deferred_eviction_keeps_entries_in_use(self, tmp_path):
+        cache = ObjectCache(str(tmp_path), max_bytes=1_500)
+        fetch = lambda target: target.write(b"x" * 1_000)
+
+        paths = [cache.get("staging", f"{name}.parquet", "1", fetch, evict=False) for name in "abc"]
+        assert cache.size() == 3_000
+
+        # over the limit, but every entry belongs to the read that is about to open them
+        assert cache.evict(keep=paths) == 0
+        assert cache.size() == 3_000
+
+        cache.get("staging", "d.parquet", "1", fetch)
+        assert cache.path_for("staging", "d.parquet", "1").exists()
+        assert cache.size() == 1_000
+
+    def test_concurrent_fills_across_processes(self, tmp_path):
+        counter_path = tmp_path / "fetches"
+        counter_path.touch()
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=fill_from_process, args=(str(tmp_path / "cache"), str(counter_path)))
+                     for _ in range(4)]
+
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert counter_path.read_text() == "x"
+        assert ObjectCache(str(tmp_path / "cache"), max_bytes=10**9).size() == len(b"parquet-bytes") * 1_000
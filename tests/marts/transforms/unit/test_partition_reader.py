@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+import polars as pl
+
+# test: ["partitioned mart reads"]
+from src.marts.transforms.src.utilities.partition_read_mgr import PartitionedReader, partition_ranges
+
+
+class Pool:
+    """Engine-like factory handing each partition read its own connection to a sqlite file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connections = 0
+
+    def connect(self):
+        self.connections += 1
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+
+@pytest.mark.marts
+class TestPartitionedReader:
+
+    @pytest.fixture
+    def pool(self, tmp_path):
+        path = str(tmp_path / "staging.db")
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE events (id INTEGER, site TEXT, note TEXT)")
+            connection.executemany("INSERT INTO events VALUES (?, ?, ?)",
+                                   [(i, f"site-{i % 3}", None if i < 50 else f"n{i}") for i in range(1, 101)])
+        return Pool(path)
+
+    def test_partition_ranges(self):
+        assert partition_ranges(1, 10, 3) == [(1, 5), (5, 9), (9, 11)]
+        assert partition_ranges(7, 7, 4) == [(7, 8)]
+        assert partition_ranges(None, None, 4) == []
+
+    def test_pooled_partitions(self, pool):
+        reader = PartitionedReader(engine=pool, partitions=4, driver="sqlalchemy")
+        data = reader.read('SELECT id AS "id", site, note FROM events ORDER BY id;', partition_on="id")
+
+        assert data["result"]["status_code"] == 200 and data["result"]["driver"] == "sqlalchemy"
+        assert pool.connections == 5
+        assert isinstance(data["data"], pl.DataFrame)
+        assert data["data"]["id"].to_list() == list(range(1, 101))
+        # the first ranges only hold nulls in note, concatenation still yields one string column
+        assert data["data"]["note"].dtype == pl.String and data["data"]["note"].null_count() == 49
+
+    def test_empty_result(self, pool):
+        reader = PartitionedReader(engine=pool, partitions=4, driver="sqlalchemy")
+        data = reader.read("SELECT id, site FROM events WHERE id < 0", partition_on="id", output="arrow")
+        assert data["result"]["status_code"] == 200 and data["data"].num_rows == 0
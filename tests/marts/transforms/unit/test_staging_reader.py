@@ -0,0 +1,106 @@
+import json
+
+import pytest
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+# test: ["staging reader"]
+from src.marts.transforms.src.utilities.staging_mgr import StagingReader
+from src.marts.transforms.src.utilities.dataset_mgr import file_entry, partition_path, manifest_path
+from src.marts.transforms.src.utilities.object_cache_mgr import ObjectCache
+
+
+@pytest.mark.marts
+class TestStagingReader:
+
+    @pytest.fixture
+    def reader(self, tmp_path):
+        """Three hourly devices runs staged under a local 'staging' bucket, plus their manifest."""
+        bucket = tmp_path / "staging"
+        files = []
+        for hour, sites in [("01", ["a", "b"]), ("02", ["a", "b"]), ("03", ["c", "d"])]:
+            df = pd.DataFrame({"uid": [f"{hour}-{i}" for i in range(4)], "site_uid": sites * 2,
+                               "hostname": [f"host-{i}" for i in range(4)]})
+            partition = {"source_method": "api", "year": "2024", "month": "01", "day": "31"}
+            path = partition_path("datto_rmm", "devices", partition, f"api_2024_01_31_{hour}0000.parquet")
+
+            (bucket / path).parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(bucket / path, index=False)
+            files.append(file_entry(path, df, partition, size=(bucket / path).stat().st_size,
+                                    extracted_at=f"2024-01-31 {hour}:00:00", stats_columns=["site_uid"],
+                                    etag=str((bucket / path).stat().st_mtime_ns)))
+
+        (bucket / manifest_path("datto_rmm", "devices")).write_text(json.dumps({"version": 3, "files": files}))
+        return StagingReader(filesystem=fs.LocalFileSystem(), bucket=str(bucket))
+
+    @pytest.fixture
+    def cached_reader(self, reader, tmp_path):
+        """Same bucket read through a local object cache; the client records HEAD-like ETag lookups."""
+        bucket = str(tmp_path / "staging")
+        heads = []
+
+        class Heads:
+            def stat_object(self, bucket_name, object_name):
+                heads.append(object_name)
+                return type("Stat", (), {"etag": str((tmp_path / "staging" / object_name).stat().st_mtime_ns)})
+
+        cache = ObjectCache(str(tmp_path / "cache"), max_bytes=10**8)
+        return StagingReader(filesystem=fs.LocalFileSystem(), bucket=bucket, cache=cache, client=Heads()), cache, heads
+
+    def test_latest_and_as_of_snapshot(self, reader):
+        latest = reader.read("datto_rmm", "devices", columns=["uid"])
+        assert latest["result"]["files"] == 1
+        assert latest["data"].column_names == ["uid"]
+        assert latest["data"]["uid"].to_pylist() == ["03-0", "03-1", "03-2", "03-3"]
+
+        earlier = reader.read("datto_rmm", "devices", as_of="2024-01-31 02:30:00", output="pandas")
+        assert earlier["data"]["uid"].str.startswith("02").all()
+
+    def test_range_read_with_pushdown(self, reader):
+        filters = [("site_uid", "=", "a")]
+        assert len(reader.resolve("datto_rmm", "devices", start="2024-01-31 00:00:00", filters=filters)) == 2
+
+        data = reader.read("datto_rmm", "devices", start="2024-01-31 00:00:00", filters=filters, output="polars")
+        assert isinstance(data["data"], pl.DataFrame)
+        assert sorted(data["data"]["uid"].to_list()) == ["01-0", "01-2", "02-0", "02-2"]
+
+    def test_unmatched_selection(self, reader):
+        result = reader.read("datto_rmm", "devices", filters=[("site_uid", "=", "z")])["result"]
+        assert result["status_code"] == 500
+
+    def test_cached_reads(self, cached_reader):
+        reader, cache, heads = cached_reader
+
+        first = reader.read("datto_rmm", "devices", start="2024-01-31 00:00:00", columns=["uid"])
+        size = cache.size()
+        second = reader.read("datto_rmm", "devices", start="2024-01-31 00:00:00", columns=["uid"])
+
+        assert first["result"]["cached"] and first["result"]["files"] == 3
+        assert size > 0 and cache.size() == size
+        assert second["data"].sort_by("uid").equals(first["data"].sort_by("uid"))
+        # the manifest carries the ETags, the store is never asked for them
+        assert heads == []
+
+    def test_cached_read_larger_than_cache(self, reader, tmp_path):
+        cache = ObjectCache(str(tmp_path / "small"), max_bytes=1)
+        small = StagingReader(filesystem=fs.LocalFileSystem(), bucket=str(tmp_path / "staging"), cache=cache)
+
+        data = small.read("datto_rmm", "devices", start="2024-01-31 00:00:00", columns=["uid"])
+        assert data["result"]["status_code"] == 200 and data["result"]["rows"] == 12
+
+    def test_cached_reads_without_manifest_etags(self, cached_reader, tmp_path):
+        reader, cache, heads = cached_reader
+        manifest = tmp_path / "staging" / manifest_path("datto_rmm", "devices")
+        staged = json.loads(manifest.read_text())
+        for entry in staged["files"]:
+            del entry["etag"]
+        manifest.write_text(json.dumps(staged))
+
+        data = reader.read("datto_rmm", "devices", start="2024-01-31 00:00:00", columns=["uid"])
+        assert data["result"]["status_code"] == 200 and len(heads) == 3
+
+        clientless = StagingReader(filesystem=fs.LocalFileSystem(), bucket=str(tmp_path / "staging"), cache=cache)
+        assert clientless.read("datto_rmm", "devices", columns=["uid"])["result"]["status_code"] == 500
@@ -0,0 +1,561 @@
+import io
+import sys
+import json
+import importlib
+import threading
+from pathlib import Path
+
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+
+# test: ["streamed upload"]
+from src.staging.api.datto_rmm.src.utilities.upload_stream_mgr import *
+
+# test: ["parquet layout"]
+from src.staging.api.datto_rmm.src.utilities.parquet_mgr import *
+
+# test: ["dataset manifest"]
+import hashlib
+from src.staging.api.datto_rmm.src.utilities.dataset_mgr import *
+
+
+STAGING_DIR = Path(__file__).parents[5] / "src" / "staging"
+
+
+def minio_destinations() -> dict:
+    """(product, subject) -> destination of every Minio [LOAD] task in the staging configs."""
+    destinations = {}
+    for path in STAGING_DIR.glob("*/*/src/config/*/config.yaml"):
+        for task in yaml.safe_load(path.read_text()).get("TASKS") or []:
+            if (task["DETAILS"].get("task_title") or "").startswith("Minio [LOAD]"):
+                destinations[(task["DETAILS"]["product"], task["DETAILS"]["subject"])] = task["DATA"]["destination"]
+    return destinations
+
+
+def read_all(stream, part_size: int = 64 * 1024) -> bytes:
+    """Reads a stream the way a multipart upload does: fixed-size parts until an empty read."""
+    parts = []
+    while True:
+        part = stream.read(part_size)
+        if not part:
+            return b"".join(parts)
+        parts.append(part)
+
+
+class MissingKey(Exception):
+    code = "NoSuchKey"
+
+
+class PreconditionFailed(Exception):
+    code = "PreconditionFailed"
+
+
+class BucketObjects:
+    """In-memory stand-in for the MinIO calls used by the dataset manifest."""
+
+    def __init__(self):
+        self.objects = {}
+        self.lock = threading.Lock()
+
+    def put_object(self, bucket_name, object_name, data, length, content_type=None):
+        body = self.objects[(bucket_name, object_name)] = bytes(data.read(length))
+        return type("Written", (), {"etag": hashlib.md5(body).hexdigest()})
+
+    def remove_object(self, bucket_name, object_name):
+        self.objects.pop((bucket_name, object_name), None)
+
+    def _put_object(self, bucket_name, object_name, data, headers):
+        # the condition check and the write are one step, like on the server
+        with self.lock:
+            current = self.objects.get((bucket_name, object_name))
+            etag = f'"{hashlib.md5(current).hexdigest()}"' if current is not None else None
+            if "If-Match" in headers and headers["If-Match"] != etag:
+                raise PreconditionFailed()
+            if headers.get("If-None-Match") == "*" and current is not None:
+                raise PreconditionFailed()
+            self.objects[(bucket_name, object_name)] = data
+
+    def get_object(self, bucket_name, object_name):
+        if (bucket_name, object_name) not in self.objects:
+            raise MissingKey()
+        body = self.objects[(bucket_name, object_name)]
+        response = io.BytesIO(body)
+        response.headers = {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+        response.release_conn = lambda: None
+        return response
+
+    def stat_object(self, bucket_name, object_name):
+        if (bucket_name, object_name) not in self.objects:
+            raise MissingKey()
+        return type("Stat", (), {"etag": hashlib.md5(self.objects[(bucket_name, object_name)]).hexdigest()})
+
+
+def flow_module(name: str):
+    """Imports a module of the datto_rmm src the way the flow does, with the product src as import root."""
+    roots = ("load", "utilities")
+    shadowed = {module: value for module, value in sys.modules.items() if module.split(".")[0] in roots}
+    for module in shadowed:
+        del sys.modules[module]
+    sys.path.insert(0, str(STAGING_DIR / "api" / "datto_rmm" / "src"))
+    try:
+        yield importlib.import_module(name)
+    finally:
+        sys.path.pop(0)
+        for module in [module for module in sys.modules if module.split(".")[0] in roots]:
+            del sys.modules[module]
+        sys.modules.update(shadowed)
+
+
+@pytest.fixture
+def compact_minio():
+    yield from flow_module("load.compact_minio")
+
+
+@pytest.fixture
+def load_postgres():
+    pytest.importorskip("hvac")
+    yield from flow_module("load.load_postgres")
+
+
+class Database:
+    """
+    Engine and raw connection recording the SQL of a Postgres load. `columns` and `indexed` answer the
+    information_schema / unique index column lookups, `dependents` the pg_depend one, statements starting with
+    `failing` raise from their `failing_from`-th run on.
+    """
+
+    def __init__(self, columns: list = None, indexed: list = None, dependents: list = None,
+                 failing: str = None, failing_from: int = 1, rowcount: int = 0) -> None:
+        self.columns = columns or []
+        self.indexed = indexed or []
+        self.dependents = dependents or []
+        self.failing = failing
+        self.failing_from = failing_from
+        self.rowcount = rowcount
+        self.statements = []
+        self.copies = []
+        self.commits = 0
+
+    def raw_connection(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        if self.failing and statement.startswith(self.failing):
+            self.failing_from -= 1
+            if self.failing_from <= 0:
+                raise RuntimeError(f"cannot run {statement}")
+        self.statements.append(statement)
+        if "information_schema.columns" in statement:
+            self.rows = [(column,) for column in self.columns]
+        elif "pg_index" in statement:
+            self.rows = [(column,) for column in self.indexed]
+        elif "pg_depend" in statement:
+            self.rows = self.dependents
+
+    def fetchall(self):
+        return self.rows
+
+    def copy_expert(self, statement, file):
+        self.statements.append(statement)
+        self.copies.append(file.read())
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.datto_rmm
+class TestLoadDattoRmm:
+
+    def setup_method(self):
+        self.df = pd.DataFrame({
+            "uid": np.arange(2_500),
+            "hostname": ["host-a", None, "host-c", "host-d", "host-e"] * 500,
+        })
+
+    @pytest.mark.parametrize("as_table", [False, True])
+    def test_streamed_parquet_row_groups(self, as_table):
+        data = pa.Table.from_pandas(self.df, preserve_index=False) if as_table else self.df
+        uploaded = {}
+
+        result = stream_upload(data, "parquet", upload=lambda s: uploaded.update(body=read_all(s)), chunk_rows=1_000)
+
+        parquet_file = pq.ParquetFile(io.BytesIO(uploaded["body"]))
+        assert result == {"bytes": len(uploaded["body"]), "chunks": 3}
+        assert parquet_file.num_row_groups == 3
+        assert parquet_file.read().to_pandas().equals(self.df)
+
+    def test_streamed_csv_and_json(self):
+        uploaded = {}
+
+        stream_upload(self.df, "csv", upload=lambda s: uploaded.update(csv=read_all(s)), chunk_rows=1_000)
+        stream_upload(self.df, "json", upload=lambda s: uploaded.update(json=read_all(s)), chunk_rows=1_000)
+
+        assert pd.read_csv(io.BytesIO(uploaded["csv"]))["uid"].tolist() == self.df["uid"].tolist()
+        assert json.loads(uploaded["json"]) == json.loads(self.df.to_json(orient="records"))
+
+    def test_failed_upload_stops_writer(self):
+        def upload(stream):
+            stream.read(10)
+            raise ConnectionError("part upload failed")
+
+        with pytest.raises(ConnectionError):
+            stream_upload(self.df, "csv", upload=upload, chunk_rows=10)
+
+    def test_parquet_layout_settings(self):
+        settings = parquet_settings({"compression": "ZSTD", "compression_level": 5, "row_group_size": 1_000,
+                                     "sort_by": "hostname"})
+        sink = pa.BufferOutputStream()
+
+        assert write_parquet(self.df, sink, settings) == 3
+
+        metadata = pq.ParquetFile(pa.BufferReader(sink.getvalue())).metadata
+        hostnames = pq.read_table(pa.BufferReader(sink.getvalue()))["hostname"].to_pylist()
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+        assert metadata.row_group(0).sorting_columns[0].column_index == 1
+        assert hostnames == sorted(hostnames, key=lambda h: (h is None, h))
+
+    def test_parquet_settings_validation(self):
+        assert parquet_settings(None) == DEFAULT_SETTINGS
+        with pytest.raises(ValueError):
+            parquet_settings({"compression": "lzo"})
+        with pytest.raises(ValueError):
+            parquet_settings({"compression": "snappy", "compression_level": 3})
+
+    def test_hive_manifest_updates(self):
+        client = BucketObjects()
+        timestamps = {"_YEAR_DATA_TIMESTAMP": "2024", "_MONTH_DATA_TIMESTAMP": "01", "_DAY_DATA_TIMESTAMP": "31"}
+        partition = partition_values("api", timestamps)
+        path = partition_path("datto_rmm", "devices", partition, "api_run.parquet")
+        assert path == "datto_rmm/devices/source_method=api/year=2024/month=01/day=31/api_run.parquet"
+
+        first = file_entry(path, self.df, partition, size=100, extracted_at="2024-01-31 00:00:00", stats_columns=["uid"])
+        second = {**first, "path": path.replace("api_run", "api_rerun"), "extracted_at": "2024-01-31 01:00:00"}
+
+        update_manifest(client, "staging", "datto_rmm", "devices", add=[first])
+        manifest = update_manifest(client, "staging", "datto_rmm", "devices", add=[second])
+        assert manifest["version"] == 2
+        assert [entry["path"] for entry in manifest["files"]] == [first["path"], second["path"]]
+        assert manifest["files"][0]["stats"] == {"uid": {"min": 0, "max": 2_499}}
+        assert manifest["schema_hash"] == schema_hash(pa.Table.from_pandas(self.df, preserve_index=False))
+
+        manifest = update_manifest(client, "staging", "datto_rmm", "devices", remove=[first["path"]])
+        stored, _ = read_manifest(client, "staging", "datto_rmm", "devices")
+        assert stored == manifest and [entry["path"] for entry in stored["files"]] == [second["path"]]
+
+    def test_concurrent_manifest_updates(self):
+        """Two loads read the same manifest version, the losing conditional PUT rebuilds on the newer one."""
+        client = BucketObjects()
+        partition = {"source_method": "api", "year": "2024", "month": "01", "day": "31"}
+        entries = [file_entry(f"run_{n}.parquet", self.df, partition, size=100, extracted_at=f"2024-01-31 0{n}:00:00")
+                   for n in range(2)]
+        update_manifest(client, "staging", "datto_rmm", "devices", add=[entries[0]])
+
+        barrier = threading.Barrier(2, timeout=5)
+        get_object = client.get_object
+        reads = []
+
+        def racing_get_object(bucket_name, object_name):
+            response = get_object(bucket_name, object_name)
+            reads.append(object_name)
+            if len(reads) <= 2:
+                # both writers hold version 1 before either writes
+                barrier.wait()
+            return response
+
+        client.get_object = racing_get_object
+        threads = [
+            threading.Thread(target=update_manifest, args=(client, "staging", "datto_rmm", "devices"),
+                             kwargs={"add": [entries[1]]}),
+            threading.Thread(target=update_manifest, args=(client, "staging", "datto_rmm", "devices"),
+                             kwargs={"remove": [entries[0]["path"]]}),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # one writer read once, the one whose PUT failed read again
+        assert len(reads) == 3
+        manifest, _ = read_manifest(client, "staging", "datto_rmm", "devices")
+        assert manifest["version"] == 3
+        assert [entry["path"] for entry in manifest["files"]] == ["run_1.parquet"]
+
+    def test_manifest_write_needs_conditional_put(self):
+        """A minio without the pinned private PutObject call fails the write instead of dropping the condition."""
+        class ChangedClient(BucketObjects):
+            def _put_object(self, bucket_name, object_name, data, length, headers=None):
+                raise AssertionError("unconditional write")
+
+        manifest = {"product": "datto_rmm", "subject": "devices", "version": 1, "files": [], "tombstones": []}
+        for client in (ChangedClient(), type("Bare", (), {})()):
+            with pytest.raises(RuntimeError, match="minio version pinned"):
+                write_manifest(client, "staging", manifest)
+        assert write_manifest(BucketObjects(), "staging", manifest)
+
+    def test_compaction_plan_and_dedupe(self):
+        def entry(day, hour, size=1_000, schema="a"):
+            partition = {"source_method": "api", "year": "2024", "month": "01", "day": day}
+            return {"path": f"day={day}/run_{hour}.parquet", "partition": partition, "bytes": size,
+                    "extracted_at": f"2024-01-{day} {hour}:00:00", "schema_hash": schema}
+
+        manifest = {"files": [entry("30", "02"), entry("30", "01"), entry("30", "03", size=10**9),
+                              entry("30", "04", schema="b"), entry("31", "01"), entry("31", "02")]}
+        groups = plan_compaction(manifest, small_file_bytes=10**6, min_files=2, min_age_days=1,
+                                 today=pd.Timestamp("2024-01-31").date())
+
+        # the large file, the lone schema "b" file and today's partition stay as they are
+        assert [[e["path"] for e in group] for group in groups] == [["day=30/run_01.parquet", "day=30/run_02.parquet"]]
+
+        runs = pa.table({"uid": [1, 2, None, 1, 3], "status": ["old", "old", "x", "new", "new"]})
+        assert keep_latest(runs, ["uid"]).to_pydict() == {"uid": [2, None, 1, 3], "status": ["old", "x", "new", "new"]}
+
+    def test_compacted_datasets_are_hive_layout(self):
+        """Compaction and the mart readers need a manifest, so every compacted dataset is loaded in hive layout."""
+        destinations = minio_destinations()
+        compaction = yaml.safe_load((STAGING_DIR / "api/datto_rmm/src/config/compaction/config.yaml").read_text())
+
+        for task in compaction["TASKS"]:
+            dataset = (task["DETAILS"]["product"], task["DETAILS"]["subject"])
+            assert destinations.get(dataset, {}).get("layout") == "hive", dataset
+
+    @staticmethod
+    def postgres_load(load_postgres, monkeypatch, database: Database, df, **destination):
+        """PostgresLoad of datto_rmm.api_devices writing through the recording database."""
+        monkeypatch.setattr(load_postgres, "ConnectionRegistry",
+                            lambda: type("Registry", (), {"get_engine": lambda self, uri: database})())
+        vault = type("Vault", (), {"read_secret": lambda self, mount_point, path: {
+            "POSTGRES_USER": "prefect_io", "POSTGRES_PASSWORD": "secret", "POSTGRES_URI": "db", "POSTGRES_PORT": 5432}})
+        config = {
+            "DETAILS": {"task_title": "Postgres [LOAD] - datto_rmm - devices"},
+            "DATA": {"source_method": "api", "destination": {"database": "staging", "schema": "datto_rmm",
+                                                             "table": "devices", **destination}},
+            "TIMESTAMPS": {},
+            "SECRETS": {"mount_point": "db", "path": "postgresql/prefect_io"},
+        }
+        return load_postgres.PostgresLoad(df_input=df, config=config, vault=vault()).load_to_postgres()["result"]
+
+    def test_copy_load(self, load_postgres, monkeypatch):
+        database = Database()
+        df = pd.DataFrame({
+            "uid": [1, 2, 3],
+            "hostname": ["host-a", None, "\\N"],
+            "udf": [["a", 1], None, {"b": 2}],
+            "last_seen": pd.to_datetime(["2024-01-31 10:00", "2024-01-31 11:30", None]).tz_localize("UTC"),
+        })
+
+        result = self.postgres_load(load_postgres, monkeypatch, database, df, method="copy", mode="replace",
+                                    chunk_size=2)
+
+        assert result["status_code"] == 200 and result["rows"] == 3
+        assert database.statements[:3] == [
+            "SET LOCAL TIME ZONE 'UTC'",
+            'DROP TABLE IF EXISTS "datto_rmm"."api_devices"',
+            'CREATE TABLE "datto_rmm"."api_devices" ("uid" bigint, "hostname" text, "udf" jsonb, '
+            '"last_seen" timestamptz)',
+        ]
+        assert database.statements[3] == \
+            'COPY "datto_rmm"."api_devices" ("uid", "hostname", "udf", "last_seen") FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+        # chunk_size 2: two COPY chunks, bare NULL marker for missing values (text is quoted, a literal
+        # marker stays a string), JSON for nested values, naive UTC timestamps
+        assert database.copies == [
+            '1,"host-a","[""a"", 1]",2024-01-31 10:00:00.000000\n2,\\N,\\N,2024-01-31 11:30:00.000000\n',
+            '3,"\\N","{""b"": 2}",\\N\n',
+        ]
+
+    def test_copy_load_from_arrow(self, load_postgres, monkeypatch):
+        """An Arrow table is COPY-loaded through the Arrow CSV writer (bytes chunks), not converted to pandas."""
+        database = Database()
+        table = pa.table({
+            "uid": pa.array([1, None, 3]),
+            "hostname": pa.array(["host-a", None, "\\N"]).dictionary_encode(),
+            "udf": pa.array([["a"], None, []]),
+            "last_seen": pa.array([1_706_695_200_000_000_000, None, None], pa.timestamp("ns", tz="UTC")),
+        })
+
+        result = self.postgres_load(load_postgres, monkeypatch, database, table, method="copy", mode="replace")
+
+        assert result["status_code"] == 200 and result["rows"] == 3
+        assert database.statements[2] == 'CREATE TABLE "datto_rmm"."api_devices" ("uid" bigint, "hostname" text, ' \
+                                         '"udf" jsonb, "last_seen" timestamptz)'
+        assert database.copies == [
+            b'"1","host-a","[""a""]","2024-01-31 10:00:00.000000Z"\n\\N,\\N,\\N,\\N\n"3","\\N","[]",\\N\n'
+        ]
+
+    def test_merge_onto_replaced_table(self, load_postgres, monkeypatch):
+        """First merge onto a table written by replace: new columns are added, duplicate keys removed, then indexed."""
+        database = Database(columns=["uid", "hostname"], rowcount=2)
+        df = pd.DataFrame({"uid": [1, 2, 2], "hostname": ["a", "b", "c"], "site_uid": ["s1", "s1", "s2"]})
+
+        result = self.postgres_load(load_postgres, monkeypatch, database, df, method="copy", mode="merge",
+                                    key_columns=["uid"], delete_missing=True)
+
+        assert result["status_code"] == 200 and result["rows_upserted"] == 2 and result["rows_deleted"] == 2
+        statements = [s for s in database.statements if not s.startswith("SELECT")]
+        dedupe = statements.index('DELETE FROM "datto_rmm"."api_devices" AS target USING "datto_rmm"."api_devices" '
+                                  'AS newer WHERE target."uid" = newer."uid" AND target.ctid < newer.ctid')
+        index = statements.index('CREATE UNIQUE INDEX "api_devices_merge_key" ON "datto_rmm"."api_devices" ("uid")')
+        assert 'ALTER TABLE "datto_rmm"."api_devices" ADD COLUMN "site_uid" text' in statements
+        assert dedupe < index
+
+        upsert = next(s for s in statements if s.startswith("INSERT INTO"))
+        assert 'SELECT DISTINCT ON ("uid")' in upsert and 'ORDER BY "uid", ctid DESC' in upsert
+        assert 'ON CONFLICT ("uid") DO UPDATE SET "hostname" = EXCLUDED."hostname", "site_uid" = EXCLUDED."site_uid"' \
+            in upsert
+        assert statements[-1].startswith('DELETE FROM "datto_rmm"."api_devices" AS target WHERE NOT EXISTS')
+        assert database.commits == 1
+
+        # an indexed table is not scanned for duplicates again
+        indexed = Database(columns=["uid", "hostname", "site_uid"], indexed=["uid"])
+        self.postgres_load(load_postgres, monkeypatch, indexed, df, mode="merge", key_columns=["uid"])
+        assert not any(s.startswith(("CREATE UNIQUE", "DROP INDEX", "ALTER TABLE", "DELETE")) for s in indexed.statements)
+
+    def test_merge_after_key_columns_change(self, load_postgres, monkeypatch):
+        """The merge key index still covers the previous key_columns: it is dropped and rebuilt on the new ones."""
+        database = Database(columns=["uid", "site_uid", "hostname"], indexed=["uid"])
+        df = pd.DataFrame({"uid": [1, 1], "site_uid": ["s1", "s2"], "hostname": ["a", "b"]})
+
+        result = self.postgres_load(load_postgres, monkeypatch, database, df, mode="merge",
+                                    key_columns=["uid", "site_uid"])
+
+        assert result["status_code"] == 200
+        statements = [s for s in database.statements if not s.startswith("SELECT")]
+        drop = statements.index('DROP INDEX IF EXISTS "datto_rmm"."api_devices_merge_key"')
+        create = statements.index('CREATE UNIQUE INDEX "api_devices_merge_key" ON "datto_rmm"."api_devices" '
+                                  '("uid", "site_uid")')
+        assert drop < create
+        assert any('ON CONFLICT ("uid", "site_uid")' in s for s in statements)
+
+    def test_swap_load(self, load_postgres, monkeypatch):
+        database = Database()
+        df = pd.DataFrame({"uid": [1, 2], "hostname": ["a", "b"]})
+
+        result = self.postgres_load(load_postgres, monkeypatch, database, df, method="copy", mode="swap",
+                                    key_columns=["uid"], indexes=[["hostname"]], lock_timeout="5s")
+
+        assert result["status_code"] == 200 and result["indexes"] == ["api_devices_merge_key", "api_devices_hostname_idx"]
+        statements = [s for s in database.statements if not s.startswith(("SELECT", "COPY"))]
+        assert statements == [
+            "SET LOCAL TIME ZONE 'UTC'",
+            'DROP TABLE IF EXISTS "datto_rmm"."api_devices__shadow"',
+            'CREATE UNLOGGED TABLE "datto_rmm"."api_devices__shadow" ("uid" bigint, "hostname" text)',
+            'CREATE UNIQUE INDEX "api_devices_merge_key__shadow" ON "datto_rmm"."api_devices__shadow" ("uid")',
+            'CREATE INDEX "api_devices_hostname_idx__shadow" ON "datto_rmm"."api_devices__shadow" ("hostname")',
+            'ANALYZE "datto_rmm"."api_devices__shadow"',
+            'ALTER TABLE "datto_rmm"."api_devices__shadow" SET LOGGED',
+            "SET LOCAL lock_timeout = '5s'",
+            'DROP TABLE IF EXISTS "datto_rmm"."api_devices__old"',
+            'ALTER TABLE IF EXISTS "datto_rmm"."api_devices" RENAME TO "api_devices__old"',
+            'ALTER INDEX IF EXISTS "datto_rmm"."api_devices_merge_key" RENAME TO "api_devices_merge_key__old"',
+            'ALTER INDEX IF EXISTS "datto_rmm"."api_devices_hostname_idx" RENAME TO "api_devices_hostname_idx__old"',
+            'ALTER TABLE "datto_rmm"."api_devices__shadow" RENAME TO "api_devices"',
+            'ALTER INDEX "datto_rmm"."api_devices_merge_key__shadow" RENAME TO "api_devices_merge_key"',
+            'ALTER INDEX "datto_rmm"."api_devices_hostname_idx__shadow" RENAME TO "api_devices_hostname_idx"',
+            'DROP TABLE IF EXISTS "datto_rmm"."api_devices__old"',
+        ]
+        assert database.commits == 3
+
+    def test_swap_under_dependent_views(self, load_postgres, monkeypatch):
+        df = pd.DataFrame({"uid": [1, 2], "hostname": ["a", "b"]})
+
+        refused = Database(dependents=[("marts", "devices_report")])
+        result = self.postgres_load(load_postgres, monkeypatch, refused, df, method="copy", mode="swap")
+        assert result["status_code"] == 500 and "marts.devices_report" in result["message"]
+        assert not any(s.startswith(("CREATE", "ALTER", "DROP")) for s in refused.statements)
+
+        # the swap is committed before the old copy is dropped, a failed drop only warns
+        stuck = Database(failing='DROP TABLE IF EXISTS "datto_rmm"."api_devices__old"', failing_from=2)
+        result = self.postgres_load(load_postgres, monkeypatch, stuck, df, method="copy", mode="swap")
+        assert result["status_code"] == 200
+        assert 'ALTER TABLE "datto_rmm"."api_devices__shadow" RENAME TO "api_devices"' in stuck.statements
+
+    @staticmethod
+    def staged_runs(client, runs: dict) -> list:
+        """Uploads one parquet file per hourly run of 2024-01-30 and lists them in the devices manifest."""
+        partition = {"source_method": "api", "year": "2024", "month": "01", "day": "30"}
+        entries = []
+        for hour, df in runs.items():
+            path = partition_path("datto_rmm", "devices", partition, f"api_2024_01_30_{hour}0000.parquet")
+            body = df.to_parquet(index=False)
+            client.objects[("staging", path)] = body
+            entries.append(file_entry(path, df, partition, size=len(body), extracted_at=f"2024-01-30 {hour}:00:00"))
+        update_manifest(client, "staging", "datto_rmm", "devices", add=entries)
+        return [entry["path"] for entry in entries]
+
+    @staticmethod
+    def compaction(module, client, mode: str, **compaction):
+        config = {
+            "DETAILS": {"task_title": "Minio [COMPACT] - datto_rmm - devices", "product": "datto_rmm",
+                        "subject": "devices"},
+            "DATA": {
+                "destination": {"bucket": "staging", "parquet": {"sort_by": ["uid"]}},
+                "compaction": {"mode": mode, "min_age_days": 1, "small_file_bytes": 10**6, "min_files": 2,
+                               "target_file_bytes": 10**8, "delete_after_hours": 24, **compaction},
+            },
+            "TIMESTAMPS": {"_IN_DATA_TIMESTAMP": "2024-01-31 00:00:00", "_OUT_DATA_TIMESTAMP": "2024_01_31_000000"},
+            "SECRETS": {"mount_point": "db", "path": "minio/prefect_io"},
+        }
+        vault = type("Vault", (), {"read_secret": lambda self, mount_point, path: {}})()
+        compaction = module.MinioCompaction(config=config, vault=vault)
+        compaction.__create_minio_client__ = lambda: client
+        return compaction
+
+    def test_compact_snapshot_subject(self, compact_minio):
+        """Each run is the whole dataset: the day keeps its last run, not every run's rows merged."""
+        client = BucketObjects()
+        paths = self.staged_runs(client, {
+            "01": pd.DataFrame({"uid": [1, 2, 3], "status": "first"}),
+            "02": pd.DataFrame({"uid": [1, 2], "status": "last"}),
+        })
+
+        result = self.compaction(compact_minio, client, "snapshot").compact_dataset()["result"]
+        manifest, _ = read_manifest(client, "staging", "datto_rmm", "devices")
+
+        assert result["status_code"] == 200 and result["rows_out"] == 2 and result["deleted"] == 0
+        assert [entry["path"] for entry in manifest["files"]] == [paths[1]]
+        # the replaced run is tombstoned, its object stays readable for readers of the previous manifest
+        assert [tombstone["path"] for tombstone in manifest["tombstones"]] == [paths[0]]
+        assert ("staging", paths[0]) in client.objects
+
+        result = self.compaction(compact_minio, client, "snapshot", delete_after_hours=0).compact_dataset()["result"]
+        manifest, _ = read_manifest(client, "staging", "datto_rmm", "devices")
+
+        assert result["deleted"] == 1 and manifest["tombstones"] == []
+        assert ("staging", paths[0]) not in client.objects and ("staging", paths[1]) in client.objects
+
+    def test_compact_append_subject(self, compact_minio):
+        client = BucketObjects()
+        paths = self.staged_runs(client, {
+            "01": pd.DataFrame({"uid": [3, 1], "status": ["start", "start"]}),
+            "02": pd.DataFrame({"uid": [1, 2], "status": ["done", "start"]}),
+        })
+
+        result = self.compaction(compact_minio, client, "append", key_columns=["uid"]).compact_dataset()["result"]
+        manifest, _ = read_manifest(client, "staging", "datto_rmm", "devices")
+
+        assert result["status_code"] == 200 and (result["rows_in"], result["rows_out"]) == (4, 3)
+        compacted = manifest["files"][0]
+        assert len(manifest["files"]) == 1 and compacted["path"].endswith("compacted_2024_01_31_000000_0000.parquet")
+        assert compacted["etag"] == hashlib.md5(client.objects[("staging", compacted["path"])]).hexdigest()
+        assert pq.read_table(pa.BufferReader(client.objects[("staging", compacted["path"])])).to_pydict() == \
+            {"uid": [1, 2, 3], "status": ["done", "start", "start"]}
+        assert sorted(tombstone["path"] for tombstone in manifest["tombstones"]) == sorted(paths)
+        assert all(("staging", path) in client.objects for path in paths)
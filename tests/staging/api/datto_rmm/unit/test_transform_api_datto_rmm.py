@@ -0,0 +1,170 @@
+import pytest
+import pandas as pd
+import json
+
+from pathlib import Path
+
+# test: ["field map", "json details"]
+from src.staging.api.datto_rmm.src.transform.transform_json_details import *
+from src.staging.api.datto_rmm.src.transform.transform_api_datto_rmm_activity_logs_patch import TransformApiDattoRMM
+
+# test: ["partitioned transforms"]
+from src.staging.api.datto_rmm.src.utilities.partition_mgr import *
+
+# test: ["polars backend"]
+from src.staging.api.datto_rmm.src.transform import transform_api_datto_rmm_devices as devices
+from src.staging.api.datto_rmm.src.transform import transform_api_datto_rmm_devices_polars as devices_polars
+from src.staging.api.datto_rmm.src.transform import transform_api_datto_rmm_monitors as monitors
+from src.staging.api.datto_rmm.src.transform import transform_api_datto_rmm_monitors_polars as monitors_polars
+from src.staging.api.datto_rmm.src.transform.transform_api_datto_rmm_activity_logs_patch_polars import TransformApiDattoRMMPolars
+
+# test: ["arrow data path"]
+import pyarrow as pa
+from src.staging.api.datto_rmm.src.utilities.arrow_mgr import *
+
+# test: ["dtype schema"]
+from src.staging.api.datto_rmm.src.utilities.dtype_mgr import *
+
+CONFIG_DIR = f"{Path(__file__).parents[5].resolve()}/src/staging/api/datto_rmm/src/config"
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Backends differ in missing-value markers (NaN / None / NaT) only; compare on None."""
+    return df.astype(object).where(df.notna(), None)
+
+
+@pytest.mark.datto_rmm
+class TestTransformDattoRmm:
+
+    def setup_method(self):
+        self.field_map = load_field_map(field_map_dir=f"{CONFIG_DIR}/activity_logs_patch/field_map.yaml")["data"]
+        self.details = {
+            "device.hostname": "ws-01",
+            "device.uid": "u1",
+            "patch_activity.run_date": 1700000000000,
+            "patch_activity.info": "line 1\nline 2",
+            "patch_activity.result": "HResult   : 0x80070643\nUpdate Source  : WSUS\nMessage Text   : Install failed",
+            "patch_update.title": "2024-01 Cumulative Update (KB5034441) for x64",
+        }
+        self.df = pd.DataFrame({
+            "id": [1, 2],
+            "entity": ["device", "device"],
+            "details": pd.Series([json.dumps(self.details), None], dtype=object),
+        })
+
+    # test: ["field map", "json details"]
+    def test_load_field_map(self):
+        fields = self.field_map["FIELDS"]
+        assert isinstance(fields, list)
+        assert all(field["regex"].pattern for field in fields if field.get("regex") is not None)
+
+    def test_explode_patch_details(self):
+        df = TransformApiDattoRMM(self.df, field_map=self.field_map).transform_activity_logs_patch_dataframe()["data"]
+        row = df.iloc[0]
+
+        assert "details" not in df.columns
+        assert row["device_hostname"] == "WS-01"
+        assert row["patch_activity_run_date"] == pd.Timestamp("2023-11-14 22:13:20")
+        assert row["patch_activity_info"] == ["line 1", "line 2"]
+        assert row["patch_activity_hresult"] == "0x80070643"
+        assert row["patch_activity_update_source"] == "WSUS"
+        assert row["patch_activity_message_text"] == "Install failed"
+        assert row["patch_activity_kb_id"] == "KB5034441"
+        assert row["patch_activity_patch_title"] == "2024-01 Cumulative Update"
+
+    def test_explode_missing_details(self):
+        df = TransformApiDattoRMM(self.df, field_map=self.field_map).transform_activity_logs_patch_dataframe()["data"]
+        row = df.iloc[1]
+
+        assert row["device_hostname"] is None
+        assert row["patch_activity_info"] == []
+        assert row["patch_activity_kb_id"] is None
+        assert pd.isna(row["patch_activity_run_date"])
+
+    # test: ["partitioned transforms"]
+    def test_run_partitioned_matches_inline(self):
+        df = pd.concat([self.df] * (MIN_PARTITION_ROWS * 2), ignore_index=True)
+
+        inline = run_partitioned(TransformApiDattoRMM, df.copy(), "transform_activity_logs_patch_dataframe",
+                                 partitions=1, field_map=self.field_map)
+        pooled = run_partitioned(TransformApiDattoRMM, df.copy(), "transform_activity_logs_patch_dataframe",
+                                 partitions=4, field_map=self.field_map)
+
+        assert pooled["result"]["partitions"] == 4
+        pd.testing.assert_frame_equal(inline["data"], pooled["data"], check_dtype=False)
+
+    # test: ["polars backend"]
+    def test_polars_patch_matches_pandas(self):
+        expected = TransformApiDattoRMM(self.df.copy(), field_map=self.field_map).transform_activity_logs_patch_dataframe()
+        actual = TransformApiDattoRMMPolars(self.df.copy(), field_map=self.field_map).transform_activity_logs_patch_dataframe()
+
+        assert actual["result"]["status_code"] == 200
+        pd.testing.assert_frame_equal(normalize(expected["data"]), normalize(actual["data"]), check_dtype=False)
+
+    def test_polars_devices_matches_pandas(self):
+        now = pd.Timestamp.now()
+        df = pd.DataFrame({
+            "hostname": ["EC2AMAZ-01", "WS-01", "SRV-01", "MAC-01"],
+            "operating_system": ["Microsoft Windows 10 Pro 10.0.19045", "Microsoft Windows 11 Enterprise 10.0.22631",
+                                 "Microsoft Windows Server 2019 Standard 10.0.17763", "null"],
+            "patches_approved_pending": [1, 0, 2, 0],
+            "patches_installed": [3, 0, 5, 7],
+            "last_audit_date": [now - pd.Timedelta(days=40), now, pd.NaT, now],
+            "adjusted_last_seen": [now] * 4,
+            "last_reboot": [now - pd.Timedelta(days=90)] * 4,
+            "udf1": ["", None, "x", "null"],
+        })
+
+        expected = devices.TransformApiDattoRMM(df.copy()).transform_devices_dataframe()["data"]
+        actual = devices_polars.TransformApiDattoRMMPolars(df.copy(), streaming=True).transform_devices_dataframe()["data"]
+
+        pd.testing.assert_frame_equal(normalize(expected), normalize(actual), check_dtype=False, check_like=True)
+
+    def test_polars_monitors_matches_pandas(self):
+        df = pd.DataFrame({
+            "alert_uid": ["a1", "a2"],
+            "timestamp": [1700000000000, 1700000500000],
+            "alert_context": [
+                {"@class": "perf_disk_usage_ctx", "diskName": "C", "totalVolume": 100.0, "lastTriggered": 1700000000000},
+                {"@class": "online_offline_status_ctx", "lastTriggered": 1700000001000},
+            ],
+            "response_actions": [None, [{"action_time": 1, "action_type": "EMAIL"}]],
+            "hostname": ["WS-01", "nan"],
+        })
+
+        expected = monitors.TransformApiDattoRMM(df.copy()).transform_monitors_dataframe()["data"]
+        actual = monitors_polars.TransformApiDattoRMMPolars(df.copy()).transform_monitors_dataframe()["data"]
+
+        pd.testing.assert_frame_equal(normalize(expected), normalize(actual), check_dtype=False, check_like=True)
+
+    # test: ["arrow data path"]
+    def test_polars_patch_arrow_round_trip(self):
+        table = append_constant_columns(pa.Table.from_pandas(self.df, preserve_index=False), {"_SOURCE_ORIGIN": "api"})
+
+        expected = TransformApiDattoRMM(self.df.copy(), field_map=self.field_map).transform_activity_logs_patch_dataframe()
+        actual = TransformApiDattoRMMPolars(table, field_map=self.field_map).transform_activity_logs_patch_dataframe()
+
+        assert isinstance(actual["data"], pa.Table)
+        pd.testing.assert_frame_equal(normalize(expected["data"].assign(_SOURCE_ORIGIN="api")),
+                                      normalize(table_to_pandas(actual["data"])), check_dtype=False, check_like=True)
+
+    # test: ["dtype schema"]
+    def test_optimize_device_dtypes(self):
+        schema = load_dtype_schema(schema_dir=f"{CONFIG_DIR}/devices/dtypes.yaml")["data"]
+        df = pd.DataFrame({
+            "site_name": pd.Series(["Site A", "Site B", None] * 100, dtype=object),
+            "online": pd.Series([True, False, None] * 100, dtype=object),
+            "patches_installed": [1.0, None, 3.0] * 100,
+            "udf1": pd.Series([None, None, "value"] * 100, dtype=object),
+            "warranty_date": pd.Series([None] * 300, dtype=object),
+        })
+
+        data = optimize_dtypes(df.copy(), schema)
+        optimized = data["data"]
+
+        assert data["result"]["memory_after_mb"] <= data["result"]["memory_before_mb"]
+        assert str(optimized["site_name"].dtype) == "category"
+        assert str(optimized["online"].dtype) == "boolean"
+        assert str(optimized["patches_installed"].dtype) == "Int32"
+        assert optimized["warranty_date"].dtype == object
+        pd.testing.assert_frame_equal(normalize(df), normalize(optimized), check_dtype=False, check_categorical=False)
@@ -0,0 +1,128 @@
+import sys
+import json
+import datetime as dt
+
+import pytest
+import pandas as pd
+
+pytest.importorskip("hvac")
+requests = pytest.importorskip("requests")
+
+# test: ["products extraction", "conditional requests"]
+from src.staging.api.end_of_life_date.src.extract.extract_api_end_of_life_date import ExtractApiEndOfLifeDate
+
+BASE_URI = "https://endoflife.date"
+
+
+class Response:
+    """Minimal `requests.Response` for the conditional GET."""
+
+    def __init__(self, status_code: int, body=None, headers: dict = None) -> None:
+        self.status_code = status_code
+        self.content = json.dumps(body).encode() if body is not None else b""
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class Api:
+    """Serves product bodies by URL and records the request headers, `not_modified` answers 304 to revalidations."""
+
+    def __init__(self, products: dict, not_modified: bool = False) -> None:
+        self.products = products
+        self.not_modified = not_modified
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        product = url.rsplit("/", 1)[-1].removesuffix(".json")
+        if product not in self.products:
+            return Response(500)
+        if self.not_modified and "If-None-Match" in (headers or {}):
+            return Response(304)
+        return Response(200, self.products[product], headers={"ETag": f'"{product}-1"'})
+
+
+@pytest.mark.end_of_life_date
+class TestExtractProducts:
+
+    @staticmethod
+    def extractor(tmp_path, products: list) -> ExtractApiEndOfLifeDate:
+        vault = type("Vault", (), {"read_secret": lambda self, mount_point, path: {"base_uri": BASE_URI}})
+        config = {
+            "DETAILS": {"task_title": "API [EXTRACT] - end_of_life_date - products"},
+            # ttl 0: every run revalidates with the stored ETag
+            "DATA": {"products": products, "cache_dir": str(tmp_path), "cache_ttl": 0, "max_workers": 2},
+            "TIMESTAMPS": {},
+            "SECRETS": {"mount_point": "api", "path": "end_of_life_date"},
+        }
+        return ExtractApiEndOfLifeDate(config=config, vault=vault())
+
+    def test_not_modified_reuses_cached_frame(self, tmp_path, monkeypatch):
+        api = Api({"rhel": [{"cycle": "9", "releaseDate": "2022-05-17", "eol": "2032-05-31", "lts": True}]})
+        monkeypatch.setattr(requests, "get", api.get)
+
+        first = self.extractor(tmp_path, ["rhel"]).create_products_dataframe()
+        assert first["result"]["status_code"] == 200 and first["result"]["products_downloaded"] == 1
+
+        api.not_modified = True
+        api.products["rhel"] = [{"cycle": "changed"}]
+        second = self.extractor(tmp_path, ["rhel"]).create_products_dataframe()
+
+        assert api.requests[-1][1]["If-None-Match"] == '"rhel-1"'
+        assert second["result"]["products_downloaded"] == 0 and second["result"]["products_cached"] == 1
+        # served from the stored frame, not re-normalized from the changed body (text columns may read back as str)
+        pd.testing.assert_frame_equal(second["data"], first["data"], check_dtype=False)
+
+    def test_eol_flag_or_date(self, tmp_path, monkeypatch):
+        past = (dt.date.today() - dt.timedelta(days=30)).isoformat()
+        future = (dt.date.today() + dt.timedelta(days=30)).isoformat()
+        api = Api({"ubuntu": [
+            {"cycle": "flag", "releaseDate": "2020-01-01", "eol": True},
+            {"cycle": "past", "releaseDate": "2021-01-01", "eol": past},
+            {"cycle": "future", "releaseDate": "2022-01-01", "eol": future},
+            {"cycle": "open", "releaseDate": "2023-01-01", "eol": False},
+        ]})
+        monkeypatch.setattr(requests, "get", api.get)
+
+        df = self.extractor(tmp_path, ["ubuntu"]).create_products_dataframe()["data"].set_index("cycle")
+
+        assert df["is_eol"].to_dict() == {"open": False, "future": False, "past": True, "flag": True}
+        assert df.loc["past", "eol_date"] == pd.Timestamp(past)
+        assert pd.isna(df.loc["flag", "eol_date"]) and pd.isna(df.loc["open", "eol_date"])
+
+    def test_cached_frame_turns_eol_when_its_date_passes(self, tmp_path, monkeypatch):
+        eol = dt.date.today() + dt.timedelta(days=10)
+        api = Api({"rhel": [
+            {"cycle": "dated", "releaseDate": "2022-05-17", "eol": eol.isoformat()},
+            {"cycle": "flag", "releaseDate": "2012-05-17", "eol": True},
+        ]})
+        monkeypatch.setattr(requests, "get", api.get)
+
+        first = self.extractor(tmp_path, ["rhel"]).create_products_dataframe()["data"].set_index("cycle")
+        assert first["is_eol"].to_dict() == {"dated": False, "flag": True}
+
+        class Later(dt.date):
+            @classmethod
+            def today(cls):
+                return eol + dt.timedelta(days=1)
+
+        module = sys.modules[ExtractApiEndOfLifeDate.__module__]
+        monkeypatch.setattr(module, "dt", type("datetime", (), {"date": Later}))
+        api.not_modified = True
+
+        second = self.extractor(tmp_path, ["rhel"]).create_products_dataframe()
+        assert second["result"]["products_cached"] == 1
+        assert second["data"].set_index("cycle")["is_eol"].to_dict() == {"dated": True, "flag": True}
+
+    def test_failed_product_is_partial_success(self, tmp_path, monkeypatch):
+        api = Api({"rhel": [{"cycle": "9", "releaseDate": "2022-05-17", "eol": "2032-05-31"}]})
+        monkeypatch.setattr(requests, "get", api.get)
+
+        data = self.extractor(tmp_path, ["rhel", "missing"]).create_products_dataframe()
+
+        assert data["result"]["status_code"] == 207
+        assert data["result"]["products_failed"] == ["missing"]
+        assert data["data"]["product"].unique().tolist() == ["rhel"]
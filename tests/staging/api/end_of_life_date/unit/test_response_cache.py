@@ -0,0 +1,47 @@
+import time
+
+import pytest
+import pandas as pd
+
+# test: ["response cache"]
+from src.staging.api.end_of_life_date.src.extract.response_cache import ResponseCache
+
+
+@pytest.mark.end_of_life_date
+class TestResponseCache:
+
+    def setup_method(self):
+        self.body = b'[{"cycle": "8", "eol": "2029-05-31"}]'
+
+    def test_store_and_revalidate(self, tmp_path):
+        cache = ResponseCache(cache_dir=str(tmp_path), ttl_seconds=3600)
+        assert cache.load("rhel") is None
+
+        cache.store("rhel", self.body, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        entry = cache.load("rhel")
+
+        assert entry["body"] == self.body
+        assert cache.is_fresh(entry["meta"])
+        assert cache.conditional_headers(entry["meta"]) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+
+    def test_expired_entry_refresh(self, tmp_path):
+        cache = ResponseCache(cache_dir=str(tmp_path), ttl_seconds=60)
+        cache.store("rhel", self.body, etag='"abc"')
+        meta = {**cache.load("rhel")["meta"], "fetched_at": time.time() - 120}
+
+        assert not cache.is_fresh(meta)
+        cache.refresh("rhel", meta)
+        assert cache.is_fresh(cache.load("rhel")["meta"])
+
+    def test_new_body_drops_frame(self, tmp_path):
+        cache = ResponseCache(cache_dir=str(tmp_path), ttl_seconds=3600)
+        cache.store("windows-server", self.body)
+        cache.store_frame("windows-server", pd.DataFrame({"product": ["windows-server"], "cycle": ["2019"]}))
+
+        assert cache.load_frame("windows-server")["cycle"].tolist() == ["2019"]
+        cache.store("windows-server", self.body, etag='"def"')
+        assert cache.load_frame("windows-server") is None
+        assert not [p for p in tmp_path.iterdir() if p.suffix == ".tmp"]
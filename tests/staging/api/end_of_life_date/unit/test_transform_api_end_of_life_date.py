@@ -0,0 +1,77 @@
+import pytest
+import pandas as pd
+
+# test: ["polars backend"]
+from src.staging.api.end_of_life_date.src.transform.transform_api_end_of_life_date_microsoft_windows import *
+from src.staging.api.end_of_life_date.src.transform.transform_api_end_of_life_date_microsoft_windows_polars import *
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Backends differ in missing-value markers (NaN / None / NaT) only; compare on None."""
+    return df.astype(object).where(df.notna(), None)
+
+
+@pytest.mark.end_of_life_date
+class TestTransformEndOfLifeDate:
+
+    def setup_method(self):
+        rows = [
+            ("11-24h2-e", "11 24H2 (E)", False, False),
+            ("11-24h2-w", "11 24H2 (W)", False, False),
+            ("10-22h2", "10 22H2", False, False),
+            ("10-21h2-iot-lts", "10 21H2 (IoT LTSC)", False, True),
+            ("2008-r2-sp1", "2008 R2 SP1", True, False),
+            ("2019", "2019", True, True),
+            ("7-sp1", "7 SP1", False, False),
+        ]
+        self.df = pd.DataFrame([{
+            "cycle": cycle,
+            "release_label": label,
+            "is_server": is_server,
+            "release_date": pd.Timestamp("2020-01-01"),
+            "eol_date": pd.NaT,
+            "os_build": "10.0.17763",
+            "link": None,
+            "os_is_lts": is_lts,
+        } for cycle, label, is_server, is_lts in rows])
+
+    # test: ["polars backend"]
+    def test_polars_matches_pandas(self):
+        expected = TransformApiEndOfLifeDate(self.df.copy()).transform_microsoft_windows_dataframe()["data"]
+        actual = TransformApiEndOfLifeDatePolars(self.df.copy()).transform_microsoft_windows_dataframe()["data"]
+
+        pd.testing.assert_frame_equal(normalize(expected), normalize(actual), check_dtype=False)
+
+    def test_polars_server_ltsc_rows(self):
+        df = TransformApiEndOfLifeDatePolars(self.df.copy(), streaming=True).df
+
+        assert df["cycle"].tolist()[:2] == ["2019-w-ltsc", "2019-w"]
+        assert df["os_is_lts"].tolist()[:2] == [True, False]
+
+    # test: ["vectorized cycle parsing"]
+    def test_cycle_column_parsing(self):
+        df = self.df.copy()
+        df["cycle"] = ["11-24h2-e", "11-24h2-w", "10-22h2", "10-21h2-iot-lts", "2008-R2-SP1", "2019", "7-sp1"]
+        df = normalize(TransformApiEndOfLifeDate(df).df)
+        rows = df.set_index("cycle")
+
+        assert rows.loc["2008-R2-SP1-s", "release_info"] == "2008 R2"
+        assert rows.loc["2008-R2-SP1-s", "service_pack"] == "SP1"
+        assert rows.loc["11-24h2-e", "os_release_edition"] == "Enterprise"
+        assert rows.loc["10-21h2-iot-lts", "os_release_edition"] == "IoT"
+        assert rows.loc["10-22h2-w", "release_info"] == "10"
+        assert rows.loc["7-sp1-s", "service_pack"] is None
+
+    # test: ["configurable edition fan-out"]
+    def test_configured_editions(self):
+        editions = [
+            {"edition": "Workstation", "suffix": "-w"},
+            {"edition": "IoT", "suffix": "-iot"},
+        ]
+        expected = TransformApiEndOfLifeDate(self.df.copy(), editions=editions).df
+        actual = TransformApiEndOfLifeDatePolars(self.df.copy(), editions=editions).df
+
+        pd.testing.assert_frame_equal(normalize(expected), normalize(actual), check_dtype=False)
+        assert expected["cycle"].tolist()[:4] == ["2019-w-ltsc", "2019-w", "2019-iot-ltsc", "2019-iot"]
+        assert "10-22h2-iot" in expected["cycle"].tolist()
+        assert not expected["cycle"].str.endswith("-s").any()
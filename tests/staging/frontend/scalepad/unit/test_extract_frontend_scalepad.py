@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+pytest.importorskip("hvac")
+requests = pytest.importorskip("requests")
+
+# test: ["console extraction"]
+from src.staging.frontend.scalepad.src.extract import extract_frontend_scalepad
+from src.staging.frontend.scalepad.src.extract.extract_frontend_scalepad import ExtractScalepad
+
+
+class Response:
+
+    def __init__(self, status_code: int, body: dict = None) -> None:
+        self.status_code = status_code
+        self.body = body
+
+    def json(self) -> dict:
+        return self.body
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class Console:
+    """
+    Paged asset console: `total` assets served `Size` per page. Records the cookie and session of every
+    request; `rejected` cookies answer 401, `total_key` None leaves the count out of the response.
+    """
+
+    def __init__(self, total: int, total_key: str = "TotalCount", rejected: tuple = ()) -> None:
+        self.total = total
+        self.total_key = total_key
+        self.rejected = rejected
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def session(self, auth: str = None):
+        console = self
+
+        class Session:
+            def __init__(self):
+                self.cookies = requests.cookies.RequestsCookieJar()
+                if auth:
+                    self.cookies.set("auth", auth)
+
+            def post(self, url, headers=None, json=None):
+                pagination = json["Query"]["Pagination"]
+                with console.lock:
+                    console.requests.append((pagination["PageNumber"], self.cookies.get("auth"), id(self)))
+                if self.cookies.get("auth") in console.rejected:
+                    return Response(401)
+                start = pagination["PageNumber"] * pagination["Size"]
+                body = {"Items": [{"Name": f"PC{i}", "Client": {"Name": "Acme"}}
+                                  for i in range(start, min(start + pagination["Size"], console.total))]}
+                if console.total_key:
+                    body[console.total_key] = console.total
+                return Response(200, body)
+
+        return Session
+
+
+@pytest.mark.scalepad
+class TestExtractScalepadConsole:
+
+    @staticmethod
+    def extractor(monkeypatch, console: Console, signins: list) -> ExtractScalepad:
+        def create_session(self, force_signin: bool = False):
+            signins.append(force_signin)
+            return console.session("fresh" if force_signin else "cached")()
+
+        monkeypatch.setattr(ExtractScalepad, "_ExtractScalepad__create_session", create_session)
+        # worker sessions start empty and take the cookies of the authenticated one
+        monkeypatch.setattr(extract_frontend_scalepad.requests, "Session", console.session())
+
+        vault = type("Vault", (), {"read_secret": lambda self, mount_point, path: {"base_uri": "https://app"}})
+        config = {
+            "DETAILS": {"task_title": "Frontend [EXTRACT] - scalepad - hardware_assets"},
+            "DATA": {"mode": "console", "page_size": 2, "max_workers": 2, "console": {}},
+            "TIMESTAMPS": {},
+            "SECRETS": {"mount_point": "frontend", "path": "scalepad"},
+        }
+        return ExtractScalepad(config=config, vault=vault(), otp_gen=None)
+
+    def test_pages_through_console(self, monkeypatch):
+        console, signins = Console(total=5), []
+        data = self.extractor(monkeypatch, console, signins).create_hardware_assets_console_dataframe()
+
+        assert data["result"]["status_code"] == 200 and data["result"]["pages"] == 3
+        assert data["data"]["Name"].tolist() == [f"PC{i}" for i in range(5)]
+        assert data["data"]["Client.Name"].unique().tolist() == ["Acme"]
+        assert sorted(page for page, _, _ in console.requests) == [0, 1, 2]
+        # the worker pages run on their own sessions, all carrying the authenticated cookie
+        first_session = console.requests[0][2]
+        assert all(auth == "cached" and session != first_session for _, auth, session in console.requests[1:])
+        assert signins == [False]
+
+    def test_rejected_session_signs_in_again(self, monkeypatch):
+        console, signins = Console(total=3, rejected=("cached",)), []
+        data = self.extractor(monkeypatch, console, signins).create_hardware_assets_console_dataframe()
+
+        assert data["result"]["status_code"] == 200 and len(data["data"]) == 3
+        assert signins == [False, True]
+        assert all(auth == "fresh" for _, auth, _ in console.requests[1:])
+
+    def test_missing_total_fails(self, monkeypatch):
+        console, signins = Console(total=5, total_key=None), []
+        data = self.extractor(monkeypatch, console, signins).create_hardware_assets_console_dataframe()
+
+        assert data["result"]["status_code"] == 500 and "TotalCount" in data["result"]["message"]
+        assert len(console.requests) == 1
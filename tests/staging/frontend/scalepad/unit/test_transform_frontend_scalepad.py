@@ -0,0 +1,49 @@
+import pytest
+import pandas as pd
+
+# test: ["lifecycle manager transform"]
+from src.staging.frontend.scalepad.src.transform.transform_frontend_lifecycle_manager import *
+
+
+@pytest.mark.scalepad
+class TestTransformLifecycleManager:
+
+    def setup_method(self):
+        today = pd.Timestamp.now().normalize()
+        self.df = pd.DataFrame({
+            "Name": ["PC1", "PC2", "PC3", "PC4"],
+            "Client": ["Acme", "Acme", "Acme", "Beta"],
+            "Purchased": ["2021-03-15", None, "03/01/2020", ""],
+            "Expires": [today + pd.Timedelta(days=10), today - pd.Timedelta(days=5), pd.NaT,
+                        today + pd.Timedelta(days=200)],
+            "Renewal Available": pd.array([True, False, None, True], dtype="boolean"),
+            "Tags": [["laptop", "vip"], "desktop, lab", None, []],
+            "_SOURCE_PRODUCT": "scalepad",
+        })
+
+    # test: ["snake_case columns"]
+    def test_column_names(self):
+        df = TransformLifecycleManager(self.df).df
+
+        assert {"name", "client", "purchased", "expires", "renewal_available", "tags", "_SOURCE_PRODUCT"} <= set(df.columns)
+        assert TransformLifecycleManager.snake_case("Warranty Expires") == "warranty_expires"
+        assert TransformLifecycleManager.snake_case("AssignedTo") == "assigned_to"
+
+    # test: ["dates and warranty flags"]
+    def test_warranty_columns(self):
+        df = TransformLifecycleManager(self.df).df
+
+        assert pd.api.types.is_datetime64_any_dtype(df["purchased"])
+        assert df["purchased"].isna().tolist() == [False, True, False, True]
+        assert df["warranty_days_remaining"].tolist()[:2] == [10, -5]
+        assert df["is_warranty_expired"].tolist()[:2] == [False, True]
+        assert df["warranty_expires_30_days"].tolist()[:2] == [True, False]
+        assert df["warranty_expires_365_days"][3]
+        assert df["is_warranty_expired"].isna()[2]
+        assert str(df["warranty_days_remaining"].dtype) == "Int32"
+
+    # test: ["first tag"]
+    def test_tags(self):
+        df = TransformLifecycleManager(self.df).df
+
+        assert df["tags"].tolist() == ["laptop", "desktop", None, None]